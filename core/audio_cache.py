@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Audio Cache - Efectos de sonido horneados en disco
+Todos los tonos conocidos se guardan como PCM int16 en un único archivo con
+un manifiesto indexado por hash de los parámetros de síntesis. Cada proceso
+(shell o juego) los carga con un solo memory-map.
+
+El PCM se nombra por el hash de su contenido y el manifiesto dice qué
+archivo usar: reemplazar el manifiesto publica ambos de una vez, así un
+proceso que lee mientras otro hornea nunca mezcla offsets y muestras.
+
+Uso: python -m core.audio_cache   (hornea todos los efectos del catálogo)
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from core.synth import render_tone, DEFAULT_RATE, DEFAULT_CHANNELS
+from core.sound_catalog import SOUND_SETS
+
+BAKE_DIR = Path("assets/sounds/baked")
+MANIFEST_PATH = BAKE_DIR / "manifest.json"
+PCM_PREFIX = "effects-"
+
+# Incrementar cuando cambie el algoritmo de síntesis para invalidar la caché
+SYNTH_VERSION = 2
+
+
+def tone_params(entry):
+    """Parámetros que determinan las muestras de un tono (incluido su volumen)"""
+    adsr = entry.get("adsr")
+    return {
+        "waveform": entry.get("waveform", "sine"),
+        "frequency": entry["frequency"],
+        "duration": entry["duration"],
+        "decay": entry.get("decay", 0),
+        "volume": entry.get("volume", 1.0),
+        "adsr": list(adsr) if adsr else None
+    }
+
+
+def tone_hash(params, rate, channels):
+    """Hash de contenido de un tono para un formato de mixer concreto"""
+    payload = json.dumps({"params": params, "rate": rate, "channels": channels,
+                          "version": SYNTH_VERSION}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def read_cache():
+    """Leer manifiesto y mapear el PCM horneado; devuelve (entradas, datos)"""
+    try:
+        with open(MANIFEST_PATH, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != SYNTH_VERSION:
+            return {}, None
+        data = np.memmap(BAKE_DIR / manifest["pcm"], dtype=np.int16, mode="r")
+    except (OSError, ValueError, KeyError):
+        return {}, None
+
+    # Descartar entradas que no caben en el archivo (caché truncada)
+    entries = {h: e for h, e in manifest.get("entries", {}).items()
+               if e["offset"] + e["length"] <= data.size}
+    return entries, data
+
+
+def entry_samples(entry, data):
+    """Vista (frames, canales) de una entrada dentro del PCM mapeado"""
+    samples = data[entry["offset"]:entry["offset"] + entry["length"]]
+    if entry["channels"] > 1:
+        samples = samples.reshape(-1, entry["channels"])
+    return samples
+
+
+def write_cache(tones):
+    """Escribir el PCM y el manifiesto; tones es {hash: (entrada, muestras)}"""
+    BAKE_DIR.mkdir(parents=True, exist_ok=True)
+
+    entries = {}
+    chunks = []
+    offset = 0
+    for tone_id, (entry, samples) in tones.items():
+        flat = np.ascontiguousarray(samples, dtype=np.int16).reshape(-1)
+        entries[tone_id] = dict(entry, offset=offset, length=int(flat.size))
+        chunks.append(flat)
+        offset += flat.size
+
+    pcm = np.concatenate(chunks) if chunks else np.zeros(0, np.int16)
+    pcm_name = f"{PCM_PREFIX}{hashlib.sha1(pcm.tobytes()).hexdigest()[:16]}.pcm"
+    pcm_path = BAKE_DIR / pcm_name
+    pcm_tmp = pcm_path.with_suffix(".tmp")
+    manifest_tmp = MANIFEST_PATH.with_suffix(".tmp")
+    pcm.tofile(pcm_tmp)
+    os.replace(pcm_tmp, pcm_path)
+    with open(manifest_tmp, "w") as f:
+        json.dump({"version": SYNTH_VERSION, "pcm": pcm_name, "entries": entries}, f, indent=2)
+    os.replace(manifest_tmp, MANIFEST_PATH)
+
+    # Borrar los PCM anteriores. Un lector que leyó el manifiesto viejo y aún
+    # no lo abrió recibe OSError y hornea; si está mapeado (Windows) se queda
+    for old in BAKE_DIR.glob(f"{PCM_PREFIX}*.pcm"):
+        if old.name != pcm_name:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def load_tones(params_list, rate, channels, prune=False):
+    """Obtener las muestras de varios tonos, horneando solo los que falten
+
+    Devuelve una lista de arrays alineada con params_list. Con prune=True se
+    descartan del disco las entradas que no estén en params_list.
+    """
+    entries, data = read_cache()
+    wanted = [tone_hash(params, rate, channels) for params in params_list]
+
+    results = []
+    missing = {}
+    for tone_id, params in zip(wanted, params_list):
+        entry = entries.get(tone_id)
+        if entry is not None:
+            results.append(entry_samples(entry, data))
+        else:
+            samples = render_tone(params["frequency"], params["duration"], params["waveform"],
+                                  params["volume"], decay=params["decay"], adsr=params["adsr"],
+                                  rate=rate, channels=channels)
+            missing[tone_id] = ({"rate": rate, "channels": channels, "params": params}, samples)
+            results.append(samples)
+
+    stale = prune and set(entries) - set(wanted)
+    if missing or stale:
+        keep = set(wanted) if prune else set(entries)
+        tones = {tone_id: (entry, np.array(entry_samples(entry, data)))
+                 for tone_id, entry in entries.items() if tone_id in keep}
+        tones.update(missing)
+        # Soltar el memory-map antes de reemplazar el archivo
+        results = [np.array(samples) for samples in results]
+        data = None
+        try:
+            write_cache(tones)
+        except OSError as e:
+            print(f"⚠️ No se pudo escribir la caché de audio: {e}")
+
+    return results
+
+
+def bake_all(rate=DEFAULT_RATE, channels=DEFAULT_CHANNELS):
+    """Hornear todos los efectos del catálogo y eliminar entradas obsoletas"""
+    unique = {}
+    for effects in SOUND_SETS.values():
+        for entry in effects.values():
+            params = tone_params(entry)
+            unique[tone_hash(params, rate, channels)] = params
+
+    load_tones(list(unique.values()), rate, channels, prune=True)
+    return len(unique)
+
+
+if __name__ == "__main__":
+    count = bake_all()
+    print(f"✓ {count} efectos horneados en {BAKE_DIR}")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Audio Device - Inicialización del mixer en segundo plano
+Abrir el dispositivo de audio puede tardar cientos de milisegundos; se hace
+en un hilo mientras arranca la pantalla y solo se espera cuando hace falta
+el primer sonido. Sin dispositivo (o con SDL_AUDIODRIVER=dummy) el sistema
+sigue funcionando en silencio.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import pygame
+
+# Drivers de SDL sin salida real: no merece la pena abrir el mixer
+SILENT_DRIVERS = ("dummy",)
+
+CONFIG_PATH = "config/settings.json"
+
+# Perfiles de latencia: buffer pequeño = menos retraso pero más riesgo de cortes
+LATENCY_PROFILES = {
+    "low": {"frequency": 48000, "size": -16, "channels": 2, "buffer": 256},
+    "balanced": {"frequency": 44100, "size": -16, "channels": 2, "buffer": 512},
+    "safe": {"frequency": 22050, "size": -16, "channels": 1, "buffer": 1024}
+}
+DEFAULT_PROFILE = "balanced"
+
+
+def buffer_ms(profile):
+    """Duración de un buffer del mixer en milisegundos"""
+    return profile["buffer"] * 1000 / profile["frequency"]
+
+
+def load_saved_config():
+    """Leer la configuración guardada del sistema (vacía si no existe)"""
+    try:
+        with open(CONFIG_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def configured_profile():
+    """Leer el perfil de latencia de la configuración guardada"""
+    name = load_saved_config().get("audio_latency", DEFAULT_PROFILE)
+    return name if name in LATENCY_PROFILES else DEFAULT_PROFILE
+
+
+class AudioDevice:
+    """Mixer abierto en segundo plano con fallback silencioso"""
+
+    def __init__(self):
+        self.thread = None
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.available = False
+        self.callbacks = []
+        self.profile_name = DEFAULT_PROFILE
+
+    @property
+    def profile(self):
+        """Parámetros del perfil de latencia activo"""
+        return LATENCY_PROFILES[self.profile_name]
+
+    def start(self, profile_name=None):
+        """Lanzar la inicialización del mixer sin bloquear"""
+        with self.lock:
+            if self.thread or self.ready.is_set():
+                return
+            if profile_name in LATENCY_PROFILES:
+                self.profile_name = profile_name
+
+            if pygame.mixer.get_init():
+                self.available = True
+                self.ready.set()
+                return
+
+            if os.environ.get("SDL_AUDIODRIVER", "").lower() in SILENT_DRIVERS:
+                print("🔇 Audio deshabilitado (sin dispositivo de salida)")
+                self.ready.set()
+                return
+
+            self.thread = threading.Thread(target=self.initialize, daemon=True)
+            self.thread.start()
+
+    def initialize(self):
+        """Hilo de apertura del dispositivo de audio"""
+        try:
+            pygame.mixer.init(**self.profile)
+            self.available = True
+            print(f"🔊 Audio listo: perfil {self.profile_name} "
+                  f"({self.profile['buffer']} muestras, {buffer_ms(self.profile):.1f} ms)")
+        except pygame.error as e:
+            print(f"🔇 Audio no disponible, continuando en silencio: {e}")
+
+        # Las tareas pendientes (p.ej. precargar efectos) cuentan como parte
+        # de la inicialización: quien espera el audio las encuentra hechas
+        while True:
+            with self.lock:
+                callbacks, self.callbacks = self.callbacks, []
+                if not callbacks:
+                    self.ready.set()
+                    return
+            self.run_callbacks(callbacks)
+
+    def run_callbacks(self, callbacks):
+        """Ejecutar las tareas pendientes si hay audio"""
+        if not self.available:
+            return
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠️ Error en tarea de audio: {e}")
+
+    def when_ready(self, callback):
+        """Ejecutar callback cuando el mixer esté abierto (en el hilo de audio)"""
+        with self.lock:
+            if not self.ready.is_set():
+                self.callbacks.append(callback)
+                return
+        self.run_callbacks([callback])
+
+    def wait(self, timeout=None):
+        """Esperar a que termine la inicialización; True si hay audio"""
+        if not self.ready.is_set():
+            self.start()
+            self.ready.wait(timeout)
+        return self.available and self.ready.is_set()
+
+
+_reserved_channels = 0
+
+
+def reserve_channels(count):
+    """Reservar los primeros canales del mixer sin reducir reservas previas"""
+    global _reserved_channels
+    if pygame.mixer.get_num_channels() < count:
+        pygame.mixer.set_num_channels(count)
+    if count > _reserved_channels:
+        _reserved_channels = count
+        pygame.mixer.set_reserved(count)
+
+
+_audio_device = None
+
+
+def get_audio_device():
+    """Obtener el dispositivo de audio compartido del proceso"""
+    global _audio_device
+    if _audio_device is None:
+        _audio_device = AudioDevice()
+    return _audio_device
+
+
+def init_pygame():
+    """Inicializar Pygame sin esperar al audio
+
+    pygame.init() abriría también el mixer de forma síncrona, así que solo se
+    inician vídeo y fuentes y el mixer arranca en segundo plano.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    get_audio_device().start(configured_profile())
+
+
+def measure_latency(trials=40, profile=None):
+    """Medir la latencia cola→reproducción del mixer abierto
+
+    SDL no expone el instante en que suena cada muestra, así que se mide
+    desde el callback del mixer: se reproduce un bloque de silencio de
+    duración conocida y se cronometra hasta que el canal queda libre. El
+    exceso sobre su duración es la espera medida hasta el callback; el
+    buffer que retiene el dispositivo no se puede medir y se devuelve
+    aparte como latencia nominal (buffer_ms). estimate_ms suma ambos y es
+    solo una estimación. Una espera mayor de dos buffers significa que el
+    callback llegó tarde (underrun).
+    """
+    frequency, _size, channels = pygame.mixer.get_init()
+    period = buffer_ms(profile or get_audio_device().profile)
+
+    frames = int(frequency * 0.02)
+    sound = pygame.mixer.Sound(buffer=bytes(frames * channels * 2))
+    length = sound.get_length() * 1000
+
+    channel = pygame.mixer.Channel(pygame.mixer.get_num_channels() - 1)
+    delays = []
+    underruns = 0
+    for i in range(trials):
+        # Desfasar cada intento respecto al ciclo del callback
+        time.sleep(period * (i % 4) / 4000)
+        start = time.perf_counter()
+        channel.play(sound)
+        while channel.get_busy():
+            time.sleep(0.0002)
+        delay = (time.perf_counter() - start) * 1000 - length
+        delays.append(max(0.0, delay))
+        if delay > 2 * period:
+            underruns += 1
+
+    delays.sort()
+    p95 = delays[int(len(delays) * 0.95) - 1]
+    return {
+        "buffer_ms": period,
+        "mean_ms": sum(delays) / len(delays),
+        "p95_ms": p95,
+        "max_ms": delays[-1],
+        "estimate_ms": p95 + period,
+        "underruns": underruns,
+        "trials": trials
+    }
+
+
+def measure_profiles(names=None, trials=40):
+    """Abrir el mixer con cada perfil y medir su latencia real"""
+    results = {}
+    for name in names or LATENCY_PROFILES:
+        profile = LATENCY_PROFILES[name]
+        pygame.mixer.quit()
+        try:
+            pygame.mixer.init(**profile)
+        except pygame.error as e:
+            print(f"❌ {name}: no se pudo abrir el audio ({e})")
+            continue
+        results[name] = measure_latency(trials, profile)
+    pygame.mixer.quit()
+    return results
+
+
+if __name__ == "__main__":
+    # Modo medición: python -m core.audio_device [perfil ...]
+    names = [name for name in sys.argv[1:] if name in LATENCY_PROFILES]
+    print("🔊 Midiendo latencia de audio...")
+    for name, result in measure_profiles(names).items():
+        print(f"  {name:<9} buffer (nominal) {result['buffer_ms']:5.1f} ms | "
+              f"espera media {result['mean_ms']:5.1f} ms | p95 {result['p95_ms']:5.1f} ms | "
+              f"máx {result['max_ms']:5.1f} ms | total estimado ~{result['estimate_ms']:5.1f} ms | "
+              f"underruns {result['underruns']}/{result['trials']}")
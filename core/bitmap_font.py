@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Bitmap Font - Fuentes de mapa de bits con atlas de glifos horneado
+Cada tamaño se rasteriza una sola vez en un atlas (glifos blancos con
+alfa) que se guarda en disco; dibujar texto es un lote de blits de
+glifos teñidos, sin llamar a FreeType en cada frame.
+
+Uso: python -m core.bitmap_font   (hornea los atlas de todos los tamaños)
+"""
+
+import json
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+import pygame
+
+BAKE_DIR = Path("assets/fonts/baked")
+
+# Incrementar cuando cambie el formato del atlas para invalidar la caché
+ATLAS_VERSION = 1
+
+# ASCII imprimible más los acentos y símbolos que usa la interfaz
+CHARSET = "".join(chr(c) for c in range(32, 127)) + "áéíóúÁÉÍÓÚñÑüÜ¡¿°•●★☆←→↑↓"
+
+# Tamaños usados por el shell y los juegos (los demás se hornean al pedirlos)
+DEFAULT_SIZES = (12, 14, 16, 18, 22, 24, 28, 32, 36, 42, 48, 72)
+
+ATLAS_WIDTH = 512
+
+# Colores teñidos que se conservan por tamaño
+MAX_TINTS = 16
+
+
+def atlas_paths(size):
+    """Rutas del atlas PNG y sus métricas para un tamaño"""
+    return BAKE_DIR / f"default_{size}.png", BAKE_DIR / f"default_{size}.json"
+
+
+def bake_atlas(size):
+    """Rasterizar CHARSET con la fuente por defecto; devuelve (atlas, métricas)"""
+    font = pygame.font.Font(None, size)
+    glyphs = [(char, font.render(char, True, (255, 255, 255))) for char in CHARSET]
+
+    height = font.get_height()
+    x = y = 0
+    rects = {}
+    for char, glyph in glyphs:
+        if x + glyph.get_width() > ATLAS_WIDTH:
+            x = 0
+            y += height
+        rects[char] = [x, y, glyph.get_width(), glyph.get_height()]
+        x += glyph.get_width()
+
+    atlas = pygame.Surface((ATLAS_WIDTH, y + height), pygame.SRCALPHA)
+    atlas.fill((255, 255, 255, 0))
+    for char, glyph in glyphs:
+        atlas.blit(glyph, rects[char][:2], special_flags=pygame.BLEND_RGBA_MAX)
+
+    metrics = {
+        "version": ATLAS_VERSION,
+        "size": size,
+        "height": height,
+        "linesize": font.get_linesize(),
+        "ascent": font.get_ascent(),
+        "descent": font.get_descent(),
+        "glyphs": rects
+    }
+    return atlas, metrics
+
+
+def write_atlas(size, atlas, metrics):
+    """Guardar atlas y métricas (escritura atómica)"""
+    BAKE_DIR.mkdir(parents=True, exist_ok=True)
+    image_path, metrics_path = atlas_paths(size)
+    image_tmp = image_path.with_name(image_path.stem + ".tmp.png")
+    metrics_tmp = metrics_path.with_suffix(".tmp")
+
+    pygame.image.save(atlas, str(image_tmp))
+    with open(metrics_tmp, "w") as f:
+        json.dump(metrics, f)
+
+    os.replace(image_tmp, image_path)
+    os.replace(metrics_tmp, metrics_path)
+
+
+def read_atlas(size):
+    """Cargar un atlas horneado; (None, None) si falta o está desfasado"""
+    image_path, metrics_path = atlas_paths(size)
+    try:
+        with open(metrics_path, "r") as f:
+            metrics = json.load(f)
+        if metrics.get("version") != ATLAS_VERSION or metrics.get("size") != size:
+            return None, None
+        atlas = pygame.image.load(str(image_path))
+    except (OSError, ValueError, pygame.error):
+        return None, None
+    return atlas, metrics
+
+
+def load_atlas(size):
+    """Atlas de un tamaño: del disco o horneado (y guardado) si falta"""
+    atlas, metrics = read_atlas(size)
+    if atlas is None:
+        atlas, metrics = bake_atlas(size)
+        try:
+            write_atlas(size, atlas, metrics)
+        except (OSError, pygame.error) as e:
+            print(f"⚠️ No se pudo guardar el atlas de fuente {size}: {e}")
+    if pygame.display.get_surface():
+        atlas = atlas.convert_alpha()
+    return atlas, metrics
+
+
+class BitmapFont:
+    """Fuente de atlas con la interfaz de pygame.font.Font que usa la UI
+
+    render() y size() funcionan igual que en Font; draw() dibuja
+    directamente sobre una Surface en un único blits(). Los textos con
+    caracteres fuera del atlas (emojis) pasan por FreeType.
+    """
+
+    def __init__(self, size):
+        self.point_size = size
+        self.atlas, metrics = load_atlas(size)
+        self.height = metrics["height"]
+        self.linesize = metrics["linesize"]
+        self.ascent = metrics["ascent"]
+        self.descent = metrics["descent"]
+        self.glyphs = {char: pygame.Rect(rect) for char, rect in metrics["glyphs"].items()}
+        self.tints = OrderedDict()
+        self.font = None
+
+    def freetype(self):
+        """Font real para el texto que no está en el atlas"""
+        if self.font is None:
+            self.font = pygame.font.Font(None, self.point_size)
+        return self.font
+
+    def covers(self, text):
+        """Todos los caracteres de text están en el atlas"""
+        glyphs = self.glyphs
+        return all(char in glyphs for char in text)
+
+    def tinted(self, color):
+        """Copia del atlas teñida de color (cacheada por color)"""
+        key = tuple(color)[:3]
+        atlas = self.tints.get(key)
+        if atlas is not None:
+            self.tints.move_to_end(key)
+            return atlas
+
+        atlas = self.atlas.copy()
+        atlas.fill((*key, 255), special_flags=pygame.BLEND_RGBA_MULT)
+        self.tints[key] = atlas
+        if len(self.tints) > MAX_TINTS:
+            self.tints.popitem(last=False)
+        return atlas
+
+    def glyph_run(self, atlas, text, x, y, flags=0):
+        """Lista de blits (atlas, destino, área) para una línea de texto"""
+        run = []
+        for char in text:
+            area = self.glyphs[char]
+            run.append((atlas, (x, y), area, flags))
+            x += area.width
+        return run
+
+    def size(self, text):
+        """Ancho y alto de text, como Font.size()"""
+        if not self.covers(text):
+            return self.freetype().size(text)
+        glyphs = self.glyphs
+        return sum(glyphs[char].width for char in text), self.height
+
+    def render(self, text, antialias, color, background=None):
+        """Surface con text, como Font.render() (siempre con antialias)"""
+        if not self.covers(text):
+            return self.freetype().render(text, antialias, color, background)
+
+        width, height = self.size(text)
+        atlas = self.tinted(color)
+        if background is None:
+            # Fondo transparente del mismo color: MAX conserva la cobertura del glifo
+            surface = pygame.Surface((max(width, 1), height), pygame.SRCALPHA)
+            surface.fill((*tuple(color)[:3], 0))
+            surface.blits(self.glyph_run(atlas, text, 0, 0, pygame.BLEND_RGBA_MAX),
+                          doreturn=False)
+        else:
+            surface = pygame.Surface((max(width, 1), height))
+            surface.fill(background)
+            surface.blits(self.glyph_run(atlas, text, 0, 0), doreturn=False)
+        return surface
+
+    def draw(self, surface, text, pos, color):
+        """Dibujar text en surface con un solo lote de blits"""
+        if not self.covers(text):
+            surface.blit(self.freetype().render(text, True, color), pos)
+            return
+        surface.blits(self.glyph_run(self.tinted(color), text, pos[0], pos[1]), doreturn=False)
+
+    def get_height(self):
+        return self.height
+
+    def get_linesize(self):
+        return self.linesize
+
+    def get_ascent(self):
+        return self.ascent
+
+    def get_descent(self):
+        return self.descent
+
+
+_fonts = {}
+
+
+def get_font(size):
+    """Fuente de mapa de bits compartida para un tamaño"""
+    font = _fonts.get(size)
+    if font is None:
+        font = BitmapFont(size)
+        _fonts[size] = font
+    return font
+
+
+if __name__ == "__main__":
+    # Hornear atlas: python -m core.bitmap_font [tamaño ...]
+    pygame.font.init()
+    sizes = [int(arg) for arg in sys.argv[1:] if arg.isdigit()] or DEFAULT_SIZES
+    for size in sizes:
+        atlas, metrics = bake_atlas(size)
+        write_atlas(size, atlas, metrics)
+        print(f"✓ Atlas {size}px: {len(metrics['glyphs'])} glifos, "
+              f"{atlas.get_width()}x{atlas.get_height()}")
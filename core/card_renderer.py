@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Card Renderer - Cards con sombra compartidas por shell, launcher, settings y juegos
+Las sombras (y velos semitransparentes) se pintan una vez por
+(ancho, alto, radio, color) y se guardan en una cache LRU: en régimen
+estable dibujar una card no crea ninguna Surface.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+# Tamaños de card distintos que se conservan a la vez
+MAX_SHADOWS = 64
+
+
+class CardRenderer:
+    """Dibuja cards y reutiliza sus sombras con expulsión LRU"""
+
+    def __init__(self, max_entries=MAX_SHADOWS):
+        self.max_entries = max_entries
+        self.shadows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def shadow(self, size, radius, color):
+        """Surface translúcida de size con esquinas de radio radius"""
+        key = (size[0], size[1], radius, tuple(color))
+        surface = self.shadows.get(key)
+        if surface is not None:
+            self.shadows.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, color, (0, 0, size[0], size[1]), border_radius=radius)
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha()
+        self.shadows[key] = surface
+        if len(self.shadows) > self.max_entries:
+            self.shadows.popitem(last=False)
+        return surface
+
+    def draw_shadow(self, surface, rect, radius, color, offset):
+        """Blitear la sombra de rect desplazada offset píxeles"""
+        shadow = self.shadow(rect.size, radius, color)
+        surface.blit(shadow, (rect.x + offset, rect.y + offset))
+
+    def draw_card(self, surface, rect, color, radius=12, shadow_color=None, shadow_offset=4,
+                  border_color=None, border_width=2):
+        """Card completa: sombra opcional, cuerpo y borde opcional"""
+        rect = pygame.Rect(rect)
+        if shadow_color is not None:
+            self.draw_shadow(surface, rect, radius, shadow_color, shadow_offset)
+
+        pygame.draw.rect(surface, color, rect, border_radius=radius)
+
+        if border_color is not None:
+            pygame.draw.rect(surface, border_color, rect, width=border_width, border_radius=radius)
+
+    def draw_veil(self, surface, color, rect=None):
+        """Velo semitransparente sobre rect (toda la superficie por defecto)"""
+        rect = pygame.Rect(rect) if rect else surface.get_rect()
+        surface.blit(self.shadow(rect.size, 0, color), rect.topleft)
+
+    def clear(self):
+        """Vaciar la cache (p.ej. al cambiar de resolución)"""
+        self.shadows.clear()
+
+
+_card_renderer = None
+
+
+def get_card_renderer():
+    """Obtener el renderizador de cards compartido del proceso"""
+    global _card_renderer
+    if _card_renderer is None:
+        _card_renderer = CardRenderer()
+    return _card_renderer
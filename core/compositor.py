@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compositor - Composición de frames por capas con nombre
+Las capas estáticas (fondo, tablero, marcos de HUD...) se hornean una sola
+vez en una Surface convertida y cada frame empieza con un único blit de
+esa base; solo se vuelven a hornear al cambiar el tema o la resolución.
+"""
+
+import pygame
+
+# Orden de composición de abajo hacia arriba
+LAYER_ORDER = ("background", "board", "entities", "hud", "overlay")
+
+
+class Compositor:
+    """Pila de capas con base estática cacheada
+
+    Las capas estáticas reciben la Surface donde hornearse; las dinámicas
+    se llaman sin argumentos cada frame y dibujan directamente en pantalla,
+    encima de la base y en el orden de LAYER_ORDER.
+    """
+
+    def __init__(self, size):
+        self.size = tuple(size)
+        self.layers = {}
+        self.base = None
+
+    def add_layer(self, name, painter, static=False):
+        """Registrar (o reemplazar) la capa name"""
+        if name not in LAYER_ORDER:
+            raise ValueError(f"Capa desconocida: {name}")
+        self.layers[name] = {"painter": painter, "static": static}
+        if static:
+            self.base = None
+
+    def invalidate(self):
+        """Forzar el re-horneado de las capas estáticas (p.ej. cambio de tema)"""
+        self.base = None
+
+    def resize(self, size):
+        """Adaptar la base a una nueva resolución"""
+        self.size = tuple(size)
+        self.base = None
+
+    def bake(self):
+        """Hornear todas las capas estáticas en la base"""
+        base = pygame.Surface(self.size)
+        for name in LAYER_ORDER:
+            layer = self.layers.get(name)
+            if layer and layer["static"]:
+                layer["painter"](base)
+        # convert() iguala el formato de la pantalla: el blit diario es una copia
+        self.base = base.convert() if pygame.display.get_surface() else base
+
+    def render(self, screen, offset=(0, 0)):
+        """Componer el frame: base cacheada y después las capas dinámicas
+
+        offset desplaza la base (screen shake); el hueco que deja se rellena
+        con el color de la esquina del fondo.
+        """
+        if self.base is None:
+            self.bake()
+
+        if offset != (0, 0):
+            screen.fill(self.base.get_at((0, 0)))
+        screen.blit(self.base, offset)
+
+        for name in LAYER_ORDER:
+            layer = self.layers.get(name)
+            if layer and not layer["static"]:
+                layer["painter"]()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Dirty Rects - Presentación parcial de pantallas casi estáticas
+Los widgets informan de las zonas que cambiaron (o de valores que, al
+cambiar, invalidan una zona) y el bucle solo envía esas regiones con
+pygame.display.update(rects). Si no cambió nada no se presenta el frame.
+"""
+
+import pygame
+
+# Por encima de esta fracción de pantalla sale más a cuenta un flip() completo
+FULL_FLIP_RATIO = 0.5
+
+_MISSING = object()
+
+
+class DirtyRects:
+    """Regiones de pantalla pendientes de presentar"""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.rects = []
+        self.full = True
+        self.values = {}
+        self.presented_pixels = 0
+
+    def set_screen(self, screen):
+        """Cambiar la Surface de pantalla (p.ej. al cambiar resolución)"""
+        self.screen = screen
+        self.mark_all()
+
+    def mark(self, rect):
+        """Marcar rect como modificado en este frame"""
+        if not self.full:
+            self.rects.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        """Presentar la pantalla completa en el próximo frame"""
+        self.full = True
+        self.rects.clear()
+
+    def track(self, key, value, rect):
+        """Marcar rect si value cambió desde el último frame; True si cambió
+
+        También se marca la zona anterior de key, por si el contenido nuevo
+        es más pequeño que el que sustituye.
+        """
+        previous = self.values.get(key, _MISSING)
+        rect = pygame.Rect(rect)
+        if previous is not _MISSING and previous[0] == value and previous[1] == rect:
+            return False
+
+        if previous is not _MISSING:
+            self.mark(previous[1])
+        self.mark(rect)
+        self.values[key] = (value, rect)
+        return True
+
+    def present(self):
+        """Enviar a la pantalla solo lo modificado; devuelve los píxeles presentados"""
+        screen_rect = self.screen.get_rect()
+        if self.full:
+            pygame.display.flip()
+            pixels = screen_rect.width * screen_rect.height
+        elif self.rects:
+            rects = self.merged(screen_rect)
+            pixels = sum(rect.width * rect.height for rect in rects)
+            if pixels > screen_rect.width * screen_rect.height * FULL_FLIP_RATIO:
+                pygame.display.flip()
+                pixels = screen_rect.width * screen_rect.height
+            else:
+                pygame.display.update(rects)
+        else:
+            pixels = 0
+
+        self.full = False
+        self.rects.clear()
+        self.presented_pixels = pixels
+        return pixels
+
+    def merged(self, bounds):
+        """Rects recortados a la pantalla, uniendo los que se solapan"""
+        merged = []
+        for rect in self.rects:
+            rect = rect.clip(bounds)
+            if not rect.width or not rect.height:
+                continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
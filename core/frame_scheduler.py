@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Frame Scheduler - Ritmo del bucle del shell según la actividad
+Con entrada reciente o animaciones el bucle va a fps_limit; sin entrada
+pasa a bloquearse en pygame.event.wait con timeout (pocos frames por
+segundo) y aún menos si la ventana pierde el foco. Cualquier entrada
+devuelve el ritmo completo al instante.
+"""
+
+import time
+
+import pygame
+
+# Segundos sin entrada antes de pasar a reposo
+IDLE_AFTER = 3.0
+
+# Espera máxima por frame (ms) en reposo y con la ventana sin foco
+IDLE_WAIT_MS = 100
+UNFOCUSED_WAIT_MS = 500
+
+# Ventana de medición del uso de CPU (segundos)
+CPU_WINDOW = 2.0
+
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN,
+                pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL, pygame.JOYBUTTONDOWN,
+                pygame.JOYAXISMOTION, pygame.JOYHATMOTION)
+
+
+class FrameScheduler:
+    """Decide cuánto esperar entre frames y mide la CPU en cada modo"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.focused = True
+        self.last_input = time.monotonic()
+        self.mode = "active"
+
+        # CPU del proceso (todos los hilos) por modo, en ventanas de CPU_WINDOW
+        self.cpu_usage = {"active": None, "idle": None, "unfocused": None}
+        self.window_start = time.monotonic()
+        self.window_cpu = time.process_time()
+        self.windows = 0  # Ventanas cerradas (sirve para refrescar estadísticas a su ritmo)
+
+        # Evento que despertó a pygame.event.wait, pendiente de procesar
+        self.woken_by = None
+
+    def handle_event(self, event):
+        """Registrar entrada y cambios de foco"""
+        if event.type in INPUT_EVENTS:
+            self.last_input = time.monotonic()
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+            self.last_input = time.monotonic()
+
+    def get_events(self):
+        """Eventos del frame: primero el que despertó la espera, luego la cola"""
+        events = pygame.event.get()
+        if self.woken_by is not None:
+            events.insert(0, self.woken_by)
+            self.woken_by = None
+        return events
+
+    def wake(self):
+        """Volver al ritmo completo (p.ej. al volver de un juego)"""
+        self.last_input = time.monotonic()
+
+    def current_mode(self, animating):
+        """active, idle o unfocused"""
+        if not self.focused:
+            return "unfocused"
+        if animating or time.monotonic() - self.last_input < IDLE_AFTER:
+            return "active"
+        return "idle"
+
+    def tick(self, fps_limit, animating=False):
+        """Esperar hasta el siguiente frame según el modo actual"""
+        mode = self.current_mode(animating)
+        if mode != self.mode:
+            self.reset_window()
+            self.mode = mode
+
+        if mode == "active":
+            if fps_limit > 0:
+                self.clock.tick(fps_limit)
+            else:
+                self.clock.tick()  # Sin límite
+        else:
+            # Bloquear hasta la siguiente entrada o el timeout; el evento se
+            # guarda para get_events (re-publicarlo lo pondría tras la cola)
+            timeout = IDLE_WAIT_MS if mode == "idle" else UNFOCUSED_WAIT_MS
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                self.woken_by = event
+            self.clock.tick()
+
+        self.sample_cpu()
+
+    def reset_window(self):
+        """Empezar una nueva ventana de medición"""
+        self.window_start = time.monotonic()
+        self.window_cpu = time.process_time()
+
+    def sample_cpu(self):
+        """Cerrar la ventana de medición si ya duró CPU_WINDOW"""
+        elapsed = time.monotonic() - self.window_start
+        if elapsed >= CPU_WINDOW:
+            cpu = time.process_time() - self.window_cpu
+            self.cpu_usage[self.mode] = cpu / elapsed * 100
+            self.windows += 1
+            self.reset_window()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Game Loop - Simulación a paso fijo con render interpolado
+La lógica de los juegos avanza en pasos de duración fija (acumulador de
+tiempo real) y el render va al ritmo de la pantalla: la entrada se lee
+en cada frame dibujado y el dibujo interpola entre el estado anterior y
+el actual con alpha, así la física no depende de la velocidad de la
+máquina ni la fluidez del ritmo de la simulación.
+"""
+
+import time
+
+import pygame
+
+# Pasos de simulación por segundo por defecto (el ritmo al que se diseñaron los juegos)
+TICK_RATE = 60
+
+# Tiempo máximo que se recupera de golpe tras un frame lento (evita la espiral de la muerte)
+MAX_FRAME_TIME = 0.25
+
+# Ritmo de render si no se puede consultar la pantalla
+DEFAULT_REFRESH_RATE = 60
+
+
+def display_refresh_rate():
+    """Frecuencia de refresco del escritorio (o DEFAULT_REFRESH_RATE)"""
+    # get_desktop_refresh_rates solo existe en pygame-ce y pygame recientes
+    get_rates = getattr(pygame.display, "get_desktop_refresh_rates", None)
+    try:
+        rates = get_rates() if get_rates else []
+    except pygame.error:
+        rates = []
+    rate = rates[0] if rates else 0
+    return rate if rate > 0 else DEFAULT_REFRESH_RATE
+
+
+def lerp(previous, current, alpha):
+    """Interpolar entre el valor del paso anterior y el actual"""
+    return previous + (current - previous) * alpha
+
+
+class FixedTimestep:
+    """Acumulador de tiempo real que decide cuántos pasos simular por frame"""
+
+    def __init__(self, tick_rate=TICK_RATE, render_fps=None):
+        self.clock = pygame.time.Clock()
+        self.render_fps = render_fps if render_fps is not None else display_refresh_rate()
+        self.set_tick_rate(tick_rate)
+        self.accumulator = 0.0
+        self.last_time = None
+        self.alpha = 0.0
+
+    def set_tick_rate(self, tick_rate):
+        """Cambiar los pasos por segundo (p.ej. cuando Snake acelera)"""
+        self.tick_rate = tick_rate
+        self.step = 1.0 / tick_rate
+
+    def advance(self):
+        """Sumar el tiempo real transcurrido; devuelve cuántos pasos simular"""
+        now = time.perf_counter()
+        if self.last_time is None:
+            elapsed = self.step  # Primer frame: un paso, como antes
+        else:
+            elapsed = min(now - self.last_time, MAX_FRAME_TIME)
+        self.last_time = now
+
+        self.accumulator += elapsed
+        steps = 0
+        while self.accumulator >= self.step:
+            self.accumulator -= self.step
+            steps += 1
+
+        # Fracción del siguiente paso ya transcurrida, para interpolar el render
+        self.alpha = self.accumulator / self.step
+        return steps
+
+    def wait(self):
+        """Esperar al siguiente frame de render"""
+        if self.render_fps > 0:
+            self.clock.tick(self.render_fps)
+        else:
+            self.clock.tick()  # Sin límite
+
+    def reset(self):
+        """Olvidar el tiempo acumulado (p.ej. tras una pausa larga)"""
+        self.accumulator = 0.0
+        self.last_time = None
+        self.alpha = 0.0
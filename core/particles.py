@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Particles - Sistema de partículas en arrays de NumPy
+Posición, velocidad, vida, tamaño y color viven en arrays preasignados
+(structure of arrays): la gravedad y el desgaste se integran en un solo
+paso vectorizado, las partículas muertas se compactan con una máscara y
+el dibujo es un único blits() de sprites circulares pre-renderizados,
+agrupados por color, radio y nivel de alfa.
+"""
+
+import numpy as np
+import pygame
+
+from core.sprite_cache import SpriteCache
+
+# Partículas vivas como máximo; las emisiones que no caben se descartan
+MAX_PARTICLES = 4096
+
+# Niveles de alfa de los sprites (la vida se cuantiza a estos pasos)
+ALPHA_LEVELS = 16
+
+
+class ParticleSystem:
+    """Partículas con gravedad que encogen y se desvanecen al agotar su vida"""
+
+    def __init__(self, capacity=MAX_PARTICLES, gravity=0.3, shrink=0.98, min_size=0.5):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.shrink = shrink
+        self.min_size = min_size
+        self.count = 0
+
+        self.position = np.zeros((capacity, 2), np.float32)
+        self.velocity = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.size = np.zeros(capacity, np.float32)
+        self.color = np.zeros(capacity, np.int32)  # Índice en self.palette
+
+        self.palette = []
+        self.palette_index = {}
+        self.sprites = SpriteCache()
+        self.rng = np.random.default_rng()
+
+    def __len__(self):
+        return self.count
+
+    def color_id(self, color):
+        """Índice de color en la paleta (se añade si es nuevo)"""
+        color = tuple(color)[:3]
+        index = self.palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.palette_index[color] = index
+        return index
+
+    def emit(self, x, y, count, color, speed=6.0, life=40, size=(2.0, 5.0)):
+        """Emitir count partículas desde (x, y) con velocidad aleatoria en ±speed"""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return 0
+
+        start, end = self.count, self.count + count
+        self.position[start:end] = (x, y)
+        self.velocity[start:end] = self.rng.uniform(-speed, speed, (count, 2))
+        self.life[start:end] = life
+        self.max_life[start:end] = life
+        self.size[start:end] = self.rng.uniform(size[0], size[1], count)
+        self.color[start:end] = self.color_id(color)
+        self.count = end
+        return count
+
+    def update(self):
+        """Avanzar un paso: mover, aplicar gravedad, envejecer y compactar"""
+        n = self.count
+        if not n:
+            return
+
+        self.position[:n] += self.velocity[:n]
+        self.velocity[:n, 1] += self.gravity
+        self.life[:n] -= 1
+        self.size[:n] *= self.shrink
+
+        alive = (self.life[:n] > 0) & (self.size[:n] >= self.min_size)
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count == n:
+            return
+
+        # Compactar las vivas al principio de los arrays, conservando el orden
+        for array in (self.position, self.velocity, self.life, self.max_life, self.size, self.color):
+            array[:alive_count] = array[:n][alive]
+        self.count = alive_count
+
+    def clear(self):
+        """Eliminar todas las partículas"""
+        self.count = 0
+
+    def sprite(self, color_index, radius, level):
+        """Círculo de color con el alfa de level, pintado una sola vez"""
+        color = self.palette[color_index]
+        alpha = 255 * level // ALPHA_LEVELS
+
+        def paint(surface):
+            pygame.draw.circle(surface, (*color, alpha), (radius, radius), radius)
+
+        return self.sprites.get((color, radius, level), (radius * 2, radius * 2), paint)
+
+    def draw(self, surface):
+        """Dibujar todas las partículas vivas con un único blits()"""
+        n = self.count
+        if not n:
+            return
+
+        fade = self.life[:n] / self.max_life[:n]
+        radius = np.maximum(self.min_size, self.size[:n] * fade)
+        visible = radius > self.min_size
+        if not visible.any():
+            return
+
+        radius = np.rint(radius[visible]).astype(np.int64)
+        levels = np.clip(np.ceil(fade[visible] * ALPHA_LEVELS), 1, ALPHA_LEVELS).astype(np.int64)
+        colors = self.color[:n][visible].astype(np.int64)
+        left = (self.position[:n, 0][visible] - radius).astype(np.int32)
+        top = (self.position[:n, 1][visible] - radius).astype(np.int32)
+
+        # Un sprite por combinación distinta de (color, radio, alfa), no por partícula
+        max_radius = int(radius.max()) + 1
+        keys = (colors * max_radius + radius) * (ALPHA_LEVELS + 1) + levels
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        sprites = []
+        for key in unique_keys.tolist():
+            key, level = divmod(key, ALPHA_LEVELS + 1)
+            color_index, r = divmod(key, max_radius)
+            sprites.append(self.sprite(color_index, r, level) if r > 0 else None)
+
+        blits = [
+            (sprites[index], (x, y))
+            for index, x, y in zip(inverse.tolist(), left.tolist(), top.tolist())
+            if sprites[index] is not None
+        ]
+        surface.blits(blits, doreturn=False)
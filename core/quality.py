@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Quality - Niveles de calidad de efectos según performance_mode
+El shell pasa el modo elegido (y fps_limit) a cada juego que lanza por
+variables de entorno; el juego obtiene un dict con la escala de cada
+efecto (partículas, estelas, sombras, respiración de ladrillos, pulsos,
+screen shake y grids de fondo) y lo consulta al dibujar.
+
+QualityGovernor ajusta ese dict en marcha: si los percentiles del tiempo
+de frame superan el presupuesto de fps_limit baja efectos paso a paso y
+los recupera tras un periodo estable.
+"""
+
+import os
+import time
+from collections import deque
+
+import pygame
+
+from core.audio_device import load_saved_config
+
+# Variables de entorno con las que el shell pasa la configuración a los juegos
+PERFORMANCE_ENV = "GAMING_OS_PERFORMANCE_MODE"
+FPS_LIMIT_ENV = "GAMING_OS_FPS_LIMIT"
+
+DEFAULT_TIER = "balanced"
+DEFAULT_FPS_LIMIT = 60
+
+# particles y trail escalan las cantidades base de cada juego; screen_shake
+# escala la amplitud; pulse_animations activa los pulsos de power-ups y de
+# la comida. "balanced" es el aspecto con el que se diseñaron los juegos
+QUALITY_TIERS = {
+    "low": {
+        "particles": 0.25,
+        "trail": 0.0,
+        "shadows": False,
+        "brick_breathing": False,
+        "pulse_animations": False,
+        "screen_shake": 0.0,
+        "background_grid": False
+    },
+    "balanced": {
+        "particles": 1.0,
+        "trail": 1.0,
+        "shadows": True,
+        "brick_breathing": True,
+        "pulse_animations": True,
+        "screen_shake": 1.0,
+        "background_grid": True
+    },
+    "high": {
+        "particles": 1.5,
+        "trail": 1.5,
+        "shadows": True,
+        "brick_breathing": True,
+        "pulse_animations": True,
+        "screen_shake": 1.0,
+        "background_grid": True
+    },
+    "ultra": {
+        "particles": 3.0,
+        "trail": 2.0,
+        "shadows": True,
+        "brick_breathing": True,
+        "pulse_animations": True,
+        "screen_shake": 1.5,
+        "background_grid": True
+    }
+}
+
+
+def configured_tier():
+    """Modo de rendimiento: el que pasó el shell o el de la configuración guardada"""
+    tier = os.environ.get(PERFORMANCE_ENV) or load_saved_config().get("performance_mode", DEFAULT_TIER)
+    return tier if tier in QUALITY_TIERS else DEFAULT_TIER
+
+
+def configured_fps_limit():
+    """Límite de FPS: el que pasó el shell o el de la configuración guardada (0 = sin límite)"""
+    value = os.environ.get(FPS_LIMIT_ENV)
+    if value is None:
+        value = load_saved_config().get("fps_limit", DEFAULT_FPS_LIMIT)
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return DEFAULT_FPS_LIMIT
+
+
+def get_quality(tier=None):
+    """Ajustes de efectos de un nivel (por defecto, el configurado)"""
+    tier = tier if tier in QUALITY_TIERS else configured_tier()
+    return dict(QUALITY_TIERS[tier], tier=tier)
+
+
+def scaled(base, factor):
+    """Cantidad base escalada por un factor de calidad (nunca negativa)"""
+    return max(0, int(round(base * factor)))
+
+
+def game_environment(config=None):
+    """Entorno para lanzar un juego con el modo de rendimiento y el límite de FPS"""
+    if config is None:
+        config = load_saved_config()
+    env = dict(os.environ)
+    env[PERFORMANCE_ENV] = str(config.get("performance_mode", DEFAULT_TIER))
+    env[FPS_LIMIT_ENV] = str(config.get("fps_limit", DEFAULT_FPS_LIMIT))
+    return env
+
+
+# Pasos del governor, en el orden en que se sacrifican los efectos
+GOVERNOR_STEPS = (
+    ("trails", {"trail": 0.0}),
+    ("particles", {"particles": 0.25}),
+    ("shadows", {"shadows": False}),
+    ("pulse", {"brick_breathing": False, "pulse_animations": False})
+)
+
+# Frames de la ventana móvil y percentil que se compara con el presupuesto
+GOVERNOR_WINDOW = 120
+GOVERNOR_PERCENTILE = 0.95
+
+# Histéresis: se baja por encima del presupuesto y solo se sube cuando el
+# percentil lleva GOVERNOR_STABLE_SECONDS por debajo de GOVERNOR_RAISE_RATIO.
+# Si una subida obliga a bajar enseguida, la espera se duplica (hasta el máximo);
+# cuando una subida aguanta toda esa espera, vuelve a GOVERNOR_STABLE_SECONDS
+GOVERNOR_RAISE_RATIO = 0.7
+GOVERNOR_STABLE_SECONDS = 5.0
+GOVERNOR_MAX_STABLE_SECONDS = 60.0
+
+# Evento de pygame que se publica al cambiar de nivel (level, step, percentile, budget)
+QUALITY_CHANGED = pygame.event.custom_type()
+
+
+class QualityGovernor:
+    """Baja y sube efectos para mantener el tiempo de frame dentro del presupuesto
+
+    quality es el dict de get_quality() que usa el juego: se modifica en
+    el sitio, así que el juego no tiene que volver a leerlo. level 0 es
+    el nivel configurado; cada nivel aplica un paso más de GOVERNOR_STEPS.
+    """
+
+    def __init__(self, quality, fps_limit):
+        self.quality = quality
+        self.base = dict(quality)
+        self.budget = 1000 / (fps_limit if fps_limit > 0 else DEFAULT_FPS_LIMIT)
+        self.level = 0
+        self.samples = deque(maxlen=GOVERNOR_WINDOW)
+        self.stable_since = None
+        self.stable_seconds = GOVERNOR_STABLE_SECONDS
+        self.last_raise = None
+
+    def percentile(self):
+        """Percentil GOVERNOR_PERCENTILE de la ventana (ms)"""
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * GOVERNOR_PERCENTILE))]
+
+    def record(self, frame_ms):
+        """Registrar el tiempo de trabajo de un frame; True si cambió el nivel"""
+        self.samples.append(frame_ms)
+        if len(self.samples) < GOVERNOR_WINDOW:
+            return False
+
+        percentile = self.percentile()
+        if percentile > self.budget:
+            self.stable_since = None
+            # Saltar los pasos que no cambian nada (p.ej. estelas ya apagadas en "low")
+            level = self.level + 1
+            while level < len(GOVERNOR_STEPS) and self.quality_for(level) == self.quality:
+                level += 1
+            if level <= len(GOVERNOR_STEPS) and self.quality_for(level) != self.quality:
+                return self.set_level(level, percentile)
+            return False
+
+        now = time.monotonic()
+        if self.last_raise is not None and now - self.last_raise >= self.stable_seconds:
+            # La última subida se sostuvo: restablecer la espera
+            self.stable_seconds = GOVERNOR_STABLE_SECONDS
+            self.last_raise = None
+
+        if percentile < self.budget * GOVERNOR_RAISE_RATIO and self.level > 0:
+            if self.stable_since is None:
+                self.stable_since = now
+            elif now - self.stable_since >= self.stable_seconds:
+                level = self.level - 1
+                while level > 0 and self.quality_for(level) == self.quality:
+                    level -= 1
+                return self.set_level(level, percentile)
+        else:
+            self.stable_since = None
+        return False
+
+    def quality_for(self, level):
+        """Calidad configurada con los primeros level pasos aplicados"""
+        quality = dict(self.base)
+        for _name, overrides in GOVERNOR_STEPS[:level]:
+            for key, value in overrides.items():
+                quality[key] = min(quality[key], value)
+        return quality
+
+    def set_level(self, level, percentile=0.0):
+        """Aplicar los primeros level pasos sobre la calidad configurada"""
+        raised = level < self.level
+        step = GOVERNOR_STEPS[(level if raised else level - 1)][0]
+        self.level = level
+
+        now = time.monotonic()
+        if raised:
+            self.last_raise = now
+        elif self.last_raise is not None and now - self.last_raise < self.stable_seconds:
+            # La subida anterior no se sostuvo: esperar más antes de la próxima
+            self.stable_seconds = min(self.stable_seconds * 2, GOVERNOR_MAX_STABLE_SECONDS)
+            self.last_raise = None  # Una subida fallida solo duplica la espera una vez
+
+        quality = self.quality_for(level)
+        self.quality.clear()
+        self.quality.update(quality)
+
+        # Empezar una ventana nueva para medir el efecto del cambio
+        self.samples.clear()
+        self.stable_since = None
+
+        action = "recupera" if raised else "reduce"
+        print(f"⚡ Calidad: {action} {step} (nivel {level}/{len(GOVERNOR_STEPS)}, "
+              f"p{int(GOVERNOR_PERCENTILE * 100)} {percentile:.1f}ms, "
+              f"presupuesto {self.budget:.1f}ms)")
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(QUALITY_CHANGED, level=level, step=step,
+                                                 percentile=percentile, budget=self.budget))
+        return True
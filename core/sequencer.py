@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Sequencer - Secuenciador chiptune tipo tracker
+Convierte patrones de notas en bloques PCM en un hilo de trabajo, unos
+cientos de milisegundos por delante, y los encola en un canal del mixer.
+La música no cuesta nada al cargar y nunca compite con el render.
+
+Formato de patrón: tokens separados por espacios, uno por fila.
+  "C4", "F#5" -> nota nueva     "." -> mantener     "-" -> silencio
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+import pygame
+
+from core.audio_device import get_audio_device, reserve_channels
+from core.synth import oscillator, make_sound, mixer_format
+
+NOTE_OFFSETS = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+
+
+def note_frequency(token):
+    """Frecuencia en Hz de una nota tipo 'C#4'"""
+    name = token[:-1]
+    octave = int(token[-1])
+    semitone = NOTE_OFFSETS[name[0].upper()] + name.count("#") - name.count("b")
+    midi = 12 * (octave + 1) + semitone
+    return 440.0 * 2 ** ((midi - 69) / 12)
+
+
+def parse_pattern(pattern):
+    """Convertir un patrón en filas: frecuencia, None (silencio) o '.' (mantener)"""
+    rows = []
+    for token in pattern.split():
+        if token == ".":
+            rows.append(".")
+        elif token == "-":
+            rows.append(None)
+        else:
+            rows.append(note_frequency(token))
+    return rows
+
+
+class SongRenderer:
+    """Renderiza una canción fila a fila manteniendo fase y envolventes"""
+
+    def __init__(self, song, rate, channels):
+        self.song = song
+        self.rate = rate
+        self.channels = channels
+        self.row_frames = rate * 60 / (song["bpm"] * song.get("rows_per_beat", 4))
+        self.tracks = [{"spec": track, "rows": parse_pattern(track["pattern"]),
+                        "frequency": None, "start": 0, "phase": 0.0}
+                       for track in song["tracks"]]
+        self.length = max(len(track["rows"]) for track in self.tracks)
+        self.loop = song.get("loop", True)
+        self.row = 0
+        self.next_row_at = 0
+        self.position = 0
+        self.finished = False
+
+    def trigger_row(self, frame):
+        """Aplicar las notas de la fila actual a cada pista"""
+        if self.row >= self.length and not self.loop:
+            self.finished = True
+            for track in self.tracks:
+                track["frequency"] = None
+            return
+
+        step = self.row % self.length
+        for track in self.tracks:
+            value = track["rows"][step % len(track["rows"])]
+            if value == ".":
+                continue
+            track["frequency"] = value
+            track["start"] = frame
+
+    def render_segment(self, track, out, frame):
+        """Sumar a out el trozo de una pista que empieza en frame"""
+        frequency = track["frequency"]
+        if frequency is None:
+            return
+        spec = track["spec"]
+        frames = out.size
+        wave = oscillator(spec.get("waveform", "square"), frequency, frames, self.rate,
+                          seed=frame, phase=track["phase"])
+        track["phase"] = (track["phase"] + frequency * frames / self.rate) % 1.0
+
+        decay = spec.get("decay", 0)
+        if decay:
+            elapsed = np.arange(frame - track["start"], frame - track["start"] + frames)
+            wave *= np.exp(-elapsed / self.rate * decay)
+        out += wave * spec.get("volume", 0.1)
+
+    def render(self, frames):
+        """Renderizar el siguiente bloque como array int16 del mixer"""
+        mix = np.zeros(frames)
+        end = self.position + frames
+        frame = self.position
+
+        while frame < end:
+            if frame >= self.next_row_at:
+                self.trigger_row(frame)
+                self.row += 1
+                self.next_row_at = int(round(self.row * self.row_frames))
+            segment_end = min(end, self.next_row_at)
+            out = mix[frame - self.position:segment_end - self.position]
+            for track in self.tracks:
+                self.render_segment(track, out, frame)
+            frame = segment_end
+
+        self.position = end
+        mono = np.clip(mix * 32767, -32768, 32767).astype(np.int16)
+        if self.channels == 1:
+            return mono
+        return np.ascontiguousarray(np.repeat(mono[:, None], self.channels, axis=1))
+
+
+class ChiptunePlayer:
+    """Reproduce canciones del secuenciador en un canal dedicado del mixer
+
+    Un hilo de trabajo mantiene un buffer circular de bloques ya
+    renderizados y alimenta la cola del canal (Channel.queue) a medida
+    que el mixer los consume.
+    """
+
+    def __init__(self, channel_index, chunk_ms=100, ahead_ms=300):
+        self.channel_index = channel_index
+        self.chunk_ms = chunk_ms
+        self.ahead_chunks = max(1, ahead_ms // chunk_ms)
+        self.channel = None
+        self.thread = None
+        self.stop_event = None
+        self.paused = False
+        self.volume = 1.0
+
+    def play(self, song):
+        """Empezar una canción (sin bloquear aunque el audio no esté listo)"""
+        self.stop()
+        self.paused = False
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.worker, args=(song, self.stop_event),
+                                       daemon=True)
+        self.thread.start()
+
+    def worker(self, song, stop_event):
+        """Hilo que renderiza por delante y alimenta el canal"""
+        if not get_audio_device().wait() or stop_event.is_set():
+            return
+
+        reserve_channels(self.channel_index + 1)
+        self.channel = pygame.mixer.Channel(self.channel_index)
+        self.channel.set_volume(self.volume)
+
+        rate, channels = mixer_format()
+        renderer = SongRenderer(song, rate, channels)
+        chunk_frames = int(rate * self.chunk_ms / 1000)
+        ring = deque()
+
+        try:
+            while not stop_event.is_set():
+                while len(ring) < self.ahead_chunks and not renderer.finished:
+                    ring.append(make_sound(renderer.render(chunk_frames)))
+
+                if ring and self.channel.get_queue() is None:
+                    if self.channel.get_busy():
+                        self.channel.queue(ring.popleft())
+                    elif not self.paused:
+                        self.channel.play(ring.popleft())
+
+                if renderer.finished and not ring and not self.channel.get_busy():
+                    break
+                stop_event.wait(self.chunk_ms / 4000)
+        except pygame.error:
+            # El mixer se cerró mientras sonaba (p.ej. al salir del juego)
+            pass
+
+    def pause(self):
+        """Pausar la canción"""
+        self.paused = True
+        if self.channel:
+            self.channel.pause()
+
+    def resume(self):
+        """Reanudar la canción"""
+        self.paused = False
+        if self.channel:
+            self.channel.unpause()
+
+    def stop(self):
+        """Detener la canción y esperar al hilo"""
+        if self.stop_event:
+            self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+        self.thread = None
+        self.stop_event = None
+        if self.channel and pygame.mixer.get_init():
+            self.channel.stop()
+
+    def set_volume(self, volume):
+        """Cambiar el volumen de la música en vivo"""
+        self.volume = volume
+        if self.channel:
+            self.channel.set_volume(volume)
+
+    @property
+    def playing(self):
+        """Hay una canción en curso"""
+        return bool(self.thread and self.thread.is_alive() and not self.paused)
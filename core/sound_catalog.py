@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Sound Catalog - Tabla de efectos de sonido del sistema y de los juegos
+Fuente única para reproducir y para hornear la caché de audio en disco
+"""
+
+
+def effect(frequency, duration, waveform="sine", decay=6.0, volume=0.08, priority=1, adsr=None):
+    """Describir un efecto de sonido sintetizado"""
+    return {
+        "frequency": frequency,
+        "duration": duration,
+        "waveform": waveform,
+        "decay": decay,
+        "volume": volume,
+        "priority": priority,
+        "adsr": adsr
+    }
+
+
+SOUND_SETS = {
+    # Sonidos de UI del shell (main.py)
+    "shell": {
+        "click": effect(1200, 60, decay=8, volume=0.1),
+        "hover": effect(800, 60, decay=8, volume=0.1),
+        "success": effect(1600, 60, decay=8, volume=0.1),
+        "error": effect(400, 60, decay=8, volume=0.1),
+        "navigate": effect(1000, 60, decay=8, volume=0.1),
+        "default": effect(800, 60, decay=8, volume=0.1)
+    },
+    "settings": {
+        "click": effect(1000, 60, decay=8),
+        "select": effect(1200, 60, decay=8),
+        "toggle": effect(800, 60, decay=8),
+        "save": effect(1500, 60, decay=8),
+        "error": effect(400, 60, decay=8),
+        "navigate": effect(600, 60, decay=8),
+        "default": effect(800, 60, decay=8)
+    },
+    "pong": {
+        "paddle_hit": effect(800, 80),
+        "wall_hit": effect(600, 80),
+        "score": effect(1000, 200, priority=5),
+        "menu": effect(400, 80),
+        "ai_toggle": effect(1200, 80),
+        "default": effect(800, 80)
+    },
+    "snake": {
+        "move": effect(800, 80),
+        "eat": effect(1200, 80),
+        "game_over": effect(300, 400, priority=5),
+        "pause": effect(600, 80),
+        "theme": effect(1000, 80),
+        "default": effect(800, 80)
+    },
+    "tetris": {
+        "move": effect(800, 100),
+        "rotate": effect(1000, 100),
+        "drop": effect(600, 100),
+        "line_clear": effect(1200, 100),
+        "tetris": effect(1500, 100),
+        "game_over": effect(300, 500, priority=5),
+        "theme": effect(900, 100),
+        "default": effect(800, 100)
+    },
+    # Breakout usa diente de sierra sin envolvente; los avisos importantes
+    # tienen más prioridad para robar canales a los impactos
+    "breakout": {
+        "paddle_hit": effect(400, 80, "saw", decay=0, volume=0.025, priority=2),
+        "brick_break": effect(600, 80, "saw", decay=0, volume=0.025, priority=1),
+        "wall_hit": effect(300, 80, "saw", decay=0, volume=0.025, priority=0),
+        "powerup": effect(800, 80, "saw", decay=0, volume=0.025, priority=3),
+        "life_lost": effect(150, 300, "saw", decay=0, volume=0.025, priority=5),
+        "level_complete": effect(1000, 80, "saw", decay=0, volume=0.025, priority=5),
+        "menu": effect(500, 80, "saw", decay=0, volume=0.025, priority=2),
+        "default": effect(500, 80, "saw", decay=0, volume=0.025)
+    }
+}
+
+
+def song(bpm, tracks, rows_per_beat=2, loop=True):
+    """Describir una canción para el secuenciador chiptune"""
+    return {"bpm": bpm, "rows_per_beat": rows_per_beat, "loop": loop, "tracks": tracks}
+
+
+def track(pattern, waveform="square", volume=0.05, decay=3.0):
+    """Describir una pista del secuenciador (un token por fila)"""
+    return {"pattern": pattern, "waveform": waveform, "volume": volume, "decay": decay}
+
+
+SONGS = {
+    # Korobeiniki (tradicional), una corchea por fila
+    "tetris": song(150, [
+        track("E5 . B4 C5 D5 . C5 B4  A4 . A4 C5 E5 . D5 C5  B4 . . C5 D5 . E5 .  C5 . A4 . A4 . - . "
+              "- D5 . F5 A5 . G5 F5  E5 . . C5 E5 . D5 C5  B4 . B4 C5 D5 . E5 .  C5 . A4 . A4 . - .",
+              volume=0.05, decay=2.0),
+        track("E2 E3 E2 E3 E2 E3 E2 E3  A2 A3 A2 A3 A2 A3 A2 A3  G#2 G#3 G#2 G#3 E2 E3 E2 E3  "
+              "A2 A3 A2 A3 A2 A3 A2 A3  D2 D3 D2 D3 D2 D3 D2 D3  C2 C3 C2 C3 C2 C3 C2 C3  "
+              "B1 B2 B1 B2 E2 E3 E2 E3  A2 A3 A2 A3 A2 . - .",
+              waveform="triangle", volume=0.07, decay=6.0)
+    ]),
+    "snake": song(120, [
+        track("A3 C4 E4 C4 A3 C4 E4 C4  F3 A3 C4 A3 F3 A3 C4 A3  "
+              "G3 B3 D4 B3 G3 B3 D4 B3  E3 G#3 B3 G#3 E3 G#3 B3 G#3",
+              volume=0.04, decay=8.0),
+        track("A1 . . . . . . .  F1 . . . . . . .  G1 . . . . . . .  E1 . . . . . . .",
+              waveform="triangle", volume=0.07, decay=1.0)
+    ]),
+    "pong": song(100, [
+        track("C5 - G4 - C5 - G4 -  D5 - A4 - D5 - A4 -  E5 - B4 - E5 - B4 -  D5 - G4 - B4 - G4 -",
+              volume=0.03, decay=12.0),
+        track("C2 . C2 . G1 . G1 .  D2 . D2 . A1 . A1 .  E2 . E2 . B1 . B1 .  G1 . G1 . G1 . G1 .",
+              waveform="triangle", volume=0.06, decay=4.0)
+    ]),
+    "breakout": song(140, [
+        track("E4 G4 B4 E5 B4 G4 E4 G4  C4 E4 G4 C5 G4 E4 C4 E4  "
+              "D4 F#4 A4 D5 A4 F#4 D4 F#4  B3 D#4 F#4 B4 F#4 D#4 B3 D#4",
+              waveform="saw", volume=0.02, decay=10.0),
+        track("E2 . E2 E2 . E2 E2 .  C2 . C2 C2 . C2 C2 .  D2 . D2 D2 . D2 D2 .  B1 . B1 B1 . B1 B1 .",
+              waveform="square", volume=0.03, decay=8.0)
+    ])
+}
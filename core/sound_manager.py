@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Sound Manager - Banco de tonos compartido para Gaming Modern OS
+Cada tono se sintetiza una sola vez con el volumen del catálogo incluido en
+las muestras y se reutiliza en todas las llamadas; los canales solo aplican
+la ganancia del usuario (master × efectos), que se puede cambiar en vivo
+"""
+
+import threading
+
+import pygame
+
+from core.sound_catalog import SOUND_SETS, SONGS
+from core.audio_device import get_audio_device, reserve_channels
+
+try:
+    from core.synth import render_tone, make_sound, mixer_format
+    from core.audio_cache import load_tones, tone_params
+    from core.sequencer import ChiptunePlayer
+except ImportError:
+    render_tone = None
+    ChiptunePlayer = None
+    print("⚠️ Advertencia: NumPy no encontrado. Efectos de sonido deshabilitados.")
+
+
+class VoiceManager:
+    """Pool fijo de canales del mixer con prioridades y robo de voces"""
+
+    def __init__(self, num_voices=8, coalesce_ms=15):
+        self.num_voices = num_voices
+        self.coalesce_ms = coalesce_ms
+        self.channels = []
+        self.voices = []
+        self.last_played = {}
+        self.gain = 1.0
+
+    def ensure_channels(self):
+        """Reservar los canales del pool la primera vez que se usan"""
+        if self.channels:
+            return True
+        # Primer sonido: esperar a que el mixer termine de abrirse
+        if not get_audio_device().wait():
+            return False
+
+        # Reservados: Sound.play() sin canal explícito no puede pisarlos
+        reserve_channels(self.num_voices)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.num_voices)]
+        self.voices = [None] * self.num_voices
+        return True
+
+    def find_voice(self, priority):
+        """Buscar un canal libre o la voz menos importante que se pueda robar"""
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+
+        candidates = [i for i, voice in enumerate(self.voices)
+                      if voice and voice["priority"] <= priority]
+        if not candidates:
+            return None
+
+        # Menor prioridad primero, luego la más silenciosa y la más antigua
+        return min(candidates, key=lambda i: (self.voices[i]["priority"],
+                                              self.voices[i]["volume"],
+                                              self.voices[i]["started"]))
+
+    def play(self, sound, key=None, priority=1, volume=1.0):
+        """Reproducir un Sound en el pool; devuelve el canal o None si se descarta
+
+        volume es el nivel ya incluido en las muestras: solo sirve para
+        elegir qué voz robar. El canal recibe únicamente la ganancia global
+        (SDL cuantiza el volumen del canal a 1/128 y los efectos más bajos
+        perderían precisión o quedarían en silencio).
+        """
+        if sound is None or not self.ensure_channels():
+            return None
+
+        now = pygame.time.get_ticks()
+
+        # Sonidos idénticos disparados en el mismo frame se fusionan
+        if key is not None:
+            last = self.last_played.get(key)
+            if last is not None and now - last < self.coalesce_ms:
+                return None
+
+        index = self.find_voice(priority)
+        if index is None:
+            return None
+
+        channel = self.channels[index]
+        channel.set_volume(self.gain)
+        channel.play(sound)
+        self.voices[index] = {
+            "key": key,
+            "priority": priority,
+            "started": now,
+            "volume": volume
+        }
+        if key is not None:
+            self.last_played[key] = now
+        return channel
+
+    def set_gain(self, gain):
+        """Cambiar la ganancia global de efectos, incluidas las voces activas"""
+        self.gain = gain
+        for channel, voice in zip(self.channels, self.voices):
+            if voice and channel.get_busy():
+                channel.set_volume(gain)
+
+    def stop_all(self):
+        """Detener todas las voces del pool"""
+        for channel in self.channels:
+            channel.stop()
+        self.voices = [None] * len(self.channels)
+
+
+class ToneBank:
+    """Banco de tonos precalculados indexado por parámetros de síntesis"""
+
+    def __init__(self, voices=None):
+        self.sounds = {}
+        self.voices = voices or VoiceManager()
+
+    def tone_key(self, frequency, duration, waveform, decay, volume, adsr):
+        """Clave única de un tono dentro del banco (el volumen va en las muestras)"""
+        return (waveform, frequency, duration, decay, volume, adsr)
+
+    def get_sound(self, frequency, duration, waveform="sine", decay=8.0, volume=0.08, adsr=None):
+        """Obtener el Sound de un tono, sintetizándolo solo la primera vez"""
+        key = self.tone_key(frequency, duration, waveform, decay, volume, adsr)
+        sound = self.sounds.get(key)
+        if sound is None:
+            sound = self.synthesize(frequency, duration, waveform, decay, volume, adsr)
+            self.sounds[key] = sound
+        return sound
+
+    def synthesize(self, frequency, duration, waveform, decay, volume, adsr):
+        """Sintetizar un tono con su volumen en el formato real del mixer"""
+        if render_tone is None:
+            return None
+        samples = render_tone(frequency, duration, waveform, volume, decay=decay, adsr=adsr)
+        return make_sound(samples)
+
+    def play(self, frequency, duration, waveform="sine", decay=8.0, volume=0.08, adsr=None,
+             priority=1):
+        """Reproducir un tono del banco; el canal solo aplica la ganancia global"""
+        try:
+            if not self.voices.ensure_channels():
+                return None
+            sound = self.get_sound(frequency, duration, waveform, decay, volume, adsr)
+            key = self.tone_key(frequency, duration, waveform, decay, volume, adsr)
+            return self.voices.play(sound, key=key, priority=priority, volume=volume)
+        except Exception:
+            return None
+
+    def load_sets(self, set_names):
+        """Precargar efectos del catálogo desde la caché horneada en disco"""
+        if render_tone is None:
+            return
+
+        # Con el mixer aún abriéndose, la precarga se hace en el hilo de audio
+        get_audio_device().when_ready(lambda: self.load_baked(set_names))
+
+    def load_baked(self, set_names):
+        """Crear los Sound de los efectos que falten a partir de la caché"""
+        pending = {}
+        for set_name in set_names:
+            for entry in SOUND_SETS.get(set_name, {}).values():
+                key = self.tone_key(entry["frequency"], entry["duration"], entry["waveform"],
+                                    entry["decay"], entry["volume"], entry["adsr"])
+                if key not in self.sounds:
+                    pending[key] = tone_params(entry)
+        if not pending:
+            return
+
+        rate, channels = mixer_format()
+        try:
+            baked = load_tones(list(pending.values()), rate, channels)
+        except Exception as e:
+            print(f"⚠️ Caché de audio no disponible: {e}")
+            return
+        for key, samples in zip(pending, baked):
+            self.sounds[key] = make_sound(samples)
+
+    def play_effect(self, set_name, name):
+        """Reproducir un efecto del catálogo por nombre"""
+        effects = SOUND_SETS[set_name]
+        entry = effects.get(name, effects["default"])
+        return self.play(entry["frequency"], entry["duration"], entry["waveform"],
+                         entry["decay"], entry["volume"], entry["adsr"], entry["priority"])
+
+    def clear(self):
+        """Vaciar el banco (p.ej. tras reinicializar el mixer)"""
+        self.sounds.clear()
+
+
+class MusicService:
+    """Música de fondo decodificada en memoria con pausa, reanudación y crossfade
+
+    Las pistas se decodifican en un hilo de fondo; la reproducción usa dos
+    canales dedicados para poder fundir una pista con la siguiente sin
+    volver a abrir el archivo.
+    """
+
+    def __init__(self, first_channel=8, crossfade_ms=800):
+        self.first_channel = first_channel
+        self.crossfade_ms = crossfade_ms
+        self.tracks = {}
+        self.lock = threading.Lock()
+        self.channels = []
+        self.active = 0
+        self.current = None
+        self.pending = None
+        self.paused = False
+        self.volume = 1.0
+
+    def ensure_channels(self):
+        """Reservar los dos canales de música la primera vez"""
+        if self.channels:
+            return True
+        if not get_audio_device().wait():
+            return False
+        reserve_channels(self.first_channel + 2)
+        self.channels = [pygame.mixer.Channel(self.first_channel),
+                         pygame.mixer.Channel(self.first_channel + 1)]
+        return True
+
+    def preload(self, name, path):
+        """Decodificar una pista en segundo plano"""
+        with self.lock:
+            if name in self.tracks:
+                return
+            self.tracks[name] = {"path": path, "sound": None, "error": None}
+
+        thread = threading.Thread(target=self.decode_track, args=(name,), daemon=True)
+        thread.start()
+
+    def decode_track(self, name):
+        """Hilo de decodificación de una pista"""
+        track = self.tracks[name]
+        if not get_audio_device().wait():
+            track["error"] = "audio no disponible"
+            return
+        try:
+            sound = pygame.mixer.Sound(track["path"])
+        except Exception as e:
+            print(f"❌ Error decodificando música '{name}': {e}")
+            track["error"] = str(e)
+            return
+        with self.lock:
+            track["sound"] = sound
+
+    def is_ready(self, name):
+        """Indicar si la pista ya está decodificada"""
+        track = self.tracks.get(name)
+        return bool(track and track["sound"])
+
+    def has_failed(self, name):
+        """Indicar si la pista no pudo decodificarse"""
+        track = self.tracks.get(name)
+        return bool(track and track["error"])
+
+    def play(self, name, fade_ms=None):
+        """Reproducir una pista en bucle con crossfade desde la actual"""
+        if fade_ms is None:
+            fade_ms = self.crossfade_ms
+
+        if name == self.current:
+            self.pending = None
+            self.resume()
+            return
+        if not self.is_ready(name):
+            # Se arrancará desde update() cuando termine la decodificación
+            self.pending = (name, fade_ms)
+            return
+        if not self.ensure_channels():
+            return
+
+        self.pending = None
+        crossfade = self.current is not None and not self.paused
+        if self.current is not None:
+            old_channel = self.channels[self.active]
+            if crossfade:
+                old_channel.fadeout(fade_ms)
+            else:
+                old_channel.stop()
+            self.active = 1 - self.active
+
+        channel = self.channels[self.active]
+        channel.set_volume(self.volume)
+        channel.play(self.tracks[name]["sound"], loops=-1, fade_ms=fade_ms if crossfade else 0)
+        self.current = name
+        self.paused = False
+
+    def pause(self):
+        """Pausar la pista actual conservando la posición"""
+        self.pending = None
+        if self.channels and self.current and not self.paused:
+            for channel in self.channels:
+                channel.pause()
+            self.paused = True
+
+    def resume(self):
+        """Reanudar la pista pausada"""
+        if self.channels and self.paused:
+            for channel in self.channels:
+                channel.unpause()
+            self.paused = False
+
+    def stop(self, fade_ms=0):
+        """Detener la música"""
+        self.pending = None
+        for channel in self.channels:
+            if fade_ms:
+                channel.fadeout(fade_ms)
+            else:
+                channel.stop()
+        self.current = None
+        self.paused = False
+
+    def set_volume(self, volume):
+        """Cambiar el volumen de la música en vivo"""
+        self.volume = volume
+        if self.channels:
+            self.channels[self.active].set_volume(volume)
+
+    def update(self):
+        """Arrancar la pista pendiente cuando esté decodificada"""
+        if self.pending:
+            name, fade_ms = self.pending
+            if self.has_failed(name):
+                self.pending = None
+            elif self.is_ready(name):
+                self.play(name, fade_ms)
+
+    @property
+    def playing(self):
+        """Hay música sonando (o esperando su decodificación)"""
+        return bool((self.current and not self.paused) or self.pending)
+
+
+_tone_bank = None
+_music_service = None
+_chiptune_player = None
+
+
+def get_tone_bank():
+    """Obtener el banco de tonos compartido del proceso"""
+    global _tone_bank
+    if _tone_bank is None:
+        _tone_bank = ToneBank()
+    return _tone_bank
+
+
+def get_music_service():
+    """Obtener el servicio de música compartido del proceso"""
+    global _music_service
+    if _music_service is None:
+        _music_service = MusicService(first_channel=get_tone_bank().voices.num_voices)
+    return _music_service
+
+
+def get_chiptune_player():
+    """Obtener el secuenciador chiptune del proceso (None sin NumPy)"""
+    global _chiptune_player
+    if _chiptune_player is None and ChiptunePlayer is not None:
+        # Canal siguiente a los dos de la música de fondo
+        _chiptune_player = ChiptunePlayer(get_music_service().first_channel + 2)
+    return _chiptune_player
+
+
+def play_song(name):
+    """Reproducir una canción del catálogo en el secuenciador"""
+    player = get_chiptune_player()
+    if player is not None:
+        player.play(SONGS[name])
+    return player
+
+
+def apply_volume_levels(config):
+    """Aplicar volúmenes master, música y efectos como ganancia de canal"""
+    master = config.get("master_volume", 80) / 100
+    effects = config.get("effects_volume", 100) / 100
+    music = config.get("music_volume", 60) / 100
+
+    get_tone_bank().voices.set_gain(master * effects)
+    get_music_service().set_volume(master * music)
+    if get_chiptune_player() is not None:
+        get_chiptune_player().set_volume(master * music)
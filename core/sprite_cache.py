@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Sprite Cache - Tiles pre-renderizados para celdas, segmentos y objetos
+Cada tile se pinta una sola vez por (rol, tema, tamaño) en una Surface
+convertida; en el bucle de juego dibujar una celda es un simple blit.
+"""
+
+import pygame
+
+
+class SpriteCache:
+    """Cache de sprites indexada por clave; se vacía al cambiar de tema"""
+
+    def __init__(self):
+        self.sprites = {}
+
+    def get(self, key, size, painter):
+        """Obtener el sprite de key, pintándolo con painter(surface) la primera vez"""
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface(size, pygame.SRCALPHA)
+            painter(sprite)
+            if pygame.display.get_surface():
+                sprite = sprite.convert_alpha()
+            self.sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        """Descartar todos los sprites (p.ej. en toggle_theme)"""
+        self.sprites.clear()
+
+    def __len__(self):
+        return len(self.sprites)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Synth - Síntesis vectorizada de formas de onda con NumPy
+Genera buffers int16 listos para pygame.mixer.Sound sin listas intermedias
+"""
+
+import numpy as np
+import pygame
+
+WAVEFORMS = ("sine", "square", "saw", "triangle", "noise")
+
+DEFAULT_RATE = 44100
+DEFAULT_CHANNELS = 2
+
+
+def mixer_format():
+    """Obtener (frecuencia, canales) reales del mixer"""
+    init = pygame.mixer.get_init()
+    if not init:
+        return DEFAULT_RATE, DEFAULT_CHANNELS
+    frequency, _size, channels = init
+    return frequency, channels
+
+
+def oscillator(waveform, frequency, frames, rate, seed=0, phase=0.0):
+    """Generar una forma de onda en el rango [-1, 1]
+
+    phase (en ciclos) permite continuar una onda entre bloques sin clics.
+    """
+    if waveform == "noise":
+        rng = np.random.default_rng(seed)
+        return rng.uniform(-1.0, 1.0, frames)
+
+    phase = (phase + frequency * np.arange(frames) / rate) % 1.0
+    if waveform == "square":
+        return np.where(phase < 0.5, 1.0, -1.0)
+    if waveform == "saw":
+        return 2.0 * phase - 1.0
+    if waveform == "triangle":
+        return 4.0 * np.abs(phase - 0.5) - 1.0
+    return np.sin(2 * np.pi * phase)
+
+
+def adsr_envelope(frames, rate, attack=0, decay=0, sustain=1.0, release=0):
+    """Envolvente ADSR lineal; tiempos en milisegundos"""
+    total_ms = frames * 1000 / rate
+    attack_end = min(attack, total_ms)
+    decay_end = min(attack_end + decay, total_ms)
+    release_start = max(decay_end, total_ms - release)
+
+    times = np.arange(frames) * 1000 / rate
+    return np.interp(times,
+                     [0, attack_end, decay_end, release_start, total_ms],
+                     [0.0 if attack else 1.0, 1.0, sustain, sustain, 0.0 if release else sustain])
+
+
+def render_tone(frequency, duration, waveform="sine", volume=0.08, decay=0.0,
+                adsr=None, rate=None, channels=None):
+    """Renderizar un tono como array int16 (frames, canales)
+
+    decay aplica un decaimiento exponencial exp(-t * decay); adsr es una
+    tupla (attack_ms, decay_ms, sustain, release_ms) opcional.
+    """
+    if rate is None or channels is None:
+        mixer_rate, mixer_channels = mixer_format()
+        rate = rate or mixer_rate
+        channels = channels or mixer_channels
+
+    frames = max(1, int(duration * rate / 1000))
+    wave = oscillator(waveform, frequency, frames, rate)
+
+    if decay:
+        wave *= np.exp(-np.arange(frames) / rate * decay)
+    if adsr:
+        wave *= adsr_envelope(frames, rate, *adsr)
+
+    mono = np.clip(wave * (32767 * volume), -32768, 32767).astype(np.int16)
+    if channels == 1:
+        return mono
+    return np.ascontiguousarray(np.repeat(mono[:, None], channels, axis=1))
+
+
+def make_sound(samples):
+    """Crear un Sound directamente desde el buffer NumPy"""
+    return pygame.mixer.Sound(buffer=samples)
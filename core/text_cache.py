@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Text Cache - Cache LRU de textos renderizados
+font.render() es lo más caro de las pantallas de UI y casi todo el texto
+es igual de un frame al siguiente: cada (fuente, texto, color, antialias)
+se renderiza una vez y se reutiliza, con memoria acotada.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+# Presupuesto de memoria de la cache (píxeles ya convertidos)
+MAX_TEXT_BYTES = 8 * 1024 * 1024
+
+
+class TextCache:
+    """Surfaces de texto convertidas, expulsadas por LRU al pasar de max_bytes"""
+
+    def __init__(self, max_bytes=MAX_TEXT_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """Equivalente cacheado de font.render()"""
+        key = (font, text, tuple(color), antialias,
+               tuple(background) if background is not None else None)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        if pygame.display.get_surface():
+            if surface.get_flags() & pygame.SRCALPHA:
+                surface = surface.convert_alpha()
+            else:
+                # Texto sin antialias: convert() conserva el colorkey
+                surface = surface.convert()
+
+        self.entries[key] = surface
+        self.bytes += self.surface_bytes(surface)
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _key, old = self.entries.popitem(last=False)
+            self.bytes -= self.surface_bytes(old)
+        return surface
+
+    @staticmethod
+    def surface_bytes(surface):
+        """Memoria aproximada de una Surface"""
+        return surface.get_pitch() * surface.get_height()
+
+    def clear(self):
+        """Vaciar la cache (p.ej. al recargar fuentes)"""
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """Aciertos, fallos, entradas y memoria usada"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.bytes
+        }
+
+
+_text_cache = None
+
+
+def get_text_cache():
+    """Obtener la cache de texto compartida del proceso"""
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextCache()
+    return _text_cache
+
+
+def render_text(font, text, antialias, color, background=None):
+    """Renderizar texto a través de la cache compartida"""
+    return get_text_cache().render(font, text, antialias, color, background)
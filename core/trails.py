@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Trails - Estelas de movimiento con sprites pre-renderizados
+Trail guarda las últimas posiciones en un ring buffer de tamaño fijo y
+TrailRenderer las dibuja con una pila precalculada de círculos que se
+desvanecen (una por color, radio y longitud), enviada en un solo blits().
+"""
+
+import pygame
+
+from core.sprite_cache import SpriteCache
+
+
+class Trail:
+    """Últimas posiciones de un objeto, de la más antigua a la más reciente"""
+
+    def __init__(self, length):
+        self.length = length
+        self.points = [None] * length
+        self.head = 0  # Próxima posición a escribir
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        if not self.count:
+            return
+        start = (self.head - self.count) % self.length
+        for i in range(self.count):
+            yield self.points[(start + i) % self.length]
+
+    def push(self, x, y):
+        """Añadir una posición (sobrescribe la más antigua si está lleno)"""
+        if not self.length:
+            return  # Estelas desactivadas
+        self.points[self.head] = (x, y)
+        self.head = (self.head + 1) % self.length
+        self.count = min(self.count + 1, self.length)
+
+    def clear(self):
+        """Vaciar la estela"""
+        self.head = 0
+        self.count = 0
+
+
+class TrailRenderer:
+    """Dibuja estelas que crecen y ganan opacidad hacia el punto más reciente
+
+    El punto i de n tiene alfa (i + lead) / n * max_alpha y un radio
+    proporcional; lead=0 omite el punto más antiguo.
+    """
+
+    def __init__(self, max_alpha=0.6, lead=0):
+        self.max_alpha = max_alpha
+        self.lead = lead
+        self.sprites = SpriteCache()
+        self.stacks = {}
+
+    def stack(self, color, radius, count):
+        """Sprites y radios de cada punto de una estela de count puntos"""
+        color = tuple(color)[:3]
+        key = (color, radius, count)
+        stack = self.stacks.get(key)
+        if stack is None:
+            stack = []
+            for i in range(count):
+                alpha = (i + self.lead) / count * self.max_alpha
+                size = int(radius * 2 * alpha) // 2
+                stack.append((self.circle(color, size, int(255 * alpha)) if size > 0 else None, size))
+            self.stacks[key] = stack
+        return stack
+
+    def circle(self, color, radius, alpha):
+        """Círculo translúcido cacheado"""
+        def paint(surface):
+            pygame.draw.circle(surface, (*color, alpha), (radius, radius), radius)
+
+        return self.sprites.get((color, radius, alpha), (radius * 2, radius * 2), paint)
+
+    def draw(self, surface, trail, color, radius, offset=(0, 0), anchor="center", head=None):
+        """Dibujar trail; anchor "center" centra cada círculo en su punto, "topleft" no
+
+        head sustituye al punto más reciente: con render interpolado es la
+        posición dibujada del objeto, así la estela termina justo en él.
+        """
+        count = len(trail)
+        if not count:
+            return
+
+        points = trail
+        if head is not None:
+            points = list(trail)
+            points[-1] = head
+
+        offset_x, offset_y = offset
+        centered = anchor == "center"
+        blits = []
+        for (sprite, size), (x, y) in zip(self.stack(color, radius, count), points):
+            if sprite is not None:
+                if centered:
+                    blits.append((sprite, (int(x - size + offset_x), int(y - size + offset_y))))
+                else:
+                    blits.append((sprite, (int(x + offset_x), int(y + offset_y))))
+        surface.blits(blits, doreturn=False)
+
+    def clear(self):
+        """Descartar sprites (p.ej. al cambiar de tema)"""
+        self.sprites.clear()
+        self.stacks.clear()
@@ -8,11 +8,35 @@ import pygame
 import random
 import math
 import sys
+from pathlib import Path
+
+# Permitir importar los módulos del sistema al ejecutarse como script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.audio_device import init_pygame, load_saved_config
+from core.sound_manager import get_tone_bank, apply_volume_levels, play_song
+from core.compositor import Compositor
+from core.card_renderer import get_card_renderer
+from core.text_cache import render_text
+from core.bitmap_font import get_font
+from core.sprite_cache import SpriteCache
+from core.particles import ParticleSystem
+from core.trails import Trail, TrailRenderer
+from core.game_loop import FixedTimestep, lerp
+from core.quality import get_quality, configured_fps_limit, scaled, QualityGovernor
 
 class BreakoutModern:
     def __init__(self):
-        pygame.init()
-        pygame.mixer.init()
+        # El mixer se abre en segundo plano; el primer sonido lo espera
+        init_pygame()
+        self.tone_bank = get_tone_bank()
+        self.tone_bank.load_sets(["breakout"])
+        apply_volume_levels(load_saved_config())
+        # Calidad de efectos según el performance_mode elegido en Settings
+        self.quality = get_quality()
+        self.trail_length = scaled(12, self.quality['trail'])
+        # Música del juego generada por el secuenciador (sin archivos)
+        self.music = play_song("breakout")
         
         # Configuración de pantalla
         self.width = 900
@@ -82,30 +106,43 @@ class BreakoutModern:
         
         # Fuentes modernas
         self.fonts = {
-            'title': pygame.font.Font(None, 42),
-            'large': pygame.font.Font(None, 32),
-            'medium': pygame.font.Font(None, 24),
-            'small': pygame.font.Font(None, 18),
-            'tiny': pygame.font.Font(None, 14)
+            'title': get_font(42),
+            'large': get_font(32),
+            'medium': get_font(24),
+            'small': get_font(18),
+            'tiny': get_font(14)
         }
         
         # Estado del juego
         self.game_state = "menu"  # menu, playing, paused, game_over, level_complete
         self.reset_game()
         
-        # Clock
-        self.clock = pygame.time.Clock()
+        # Simulación a paso fijo, render al ritmo de la pantalla
+        self.loop = FixedTimestep(render_fps=configured_fps_limit())
+        # Governor: baja efectos si el tiempo de frame supera el presupuesto
+        self.governor = QualityGovernor(self.quality, self.loop.render_fps)
         
         # Efectos
-        self.particles = []
+        self.particles = ParticleSystem(gravity=0.3, shrink=0.98)
+        self.trail_renderer = TrailRenderer(max_alpha=0.6, lead=0)
         self.screen_shake = 0
         self.powerups = []
         self.animation_time = 0
         
-        # Control de teclas repetidas
-        self.key_repeat_timer = {}
-        self.key_repeat_delay = 100
-        self.key_repeat_interval = 50
+        # Atlas de ladrillos: color, tamaño del pulso, power-up y daño
+        self.brick_atlas = SpriteCache()
+        
+        # Capas: fondo con grid y menú se hornean una vez por tema
+        self.menu_layers = Compositor((self.width, self.height))
+        self.menu_layers.add_layer("background", self.draw_background, static=True)
+        self.menu_layers.add_layer("board", self.draw_menu, static=True)
+        self.menu_layers.add_layer("overlay", self.draw_menu_prompt)
+        
+        self.game_layers = Compositor((self.width, self.height))
+        self.game_layers.add_layer("background", self.draw_background, static=True)
+        self.game_layers.add_layer("entities", self.draw_entities)
+        self.game_layers.add_layer("hud", self.draw_hud)
+        self.game_layers.add_layer("overlay", self.draw_overlays)
         
     def reset_game(self):
         """Reiniciar estado del juego"""
@@ -128,7 +165,7 @@ class BreakoutModern:
             'speed_x': 0,
             'speed_y': 0,
             'stuck_to_paddle': True,
-            'trail': []
+            'trail': Trail(self.trail_length)
         }]
         
         # Ladrillos
@@ -174,6 +211,9 @@ class BreakoutModern:
         self.dark_mode = not self.dark_mode
         theme_name = 'dark' if self.dark_mode else 'light'
         self.colors = self.themes[theme_name].copy()
+        self.menu_layers.invalidate()
+        self.game_layers.invalidate()
+        self.brick_atlas.clear()
         self.play_sound('menu')
     
     def create_bricks(self):
@@ -210,63 +250,30 @@ class BreakoutModern:
     
     def play_sound(self, sound_type):
         """Reproducir sonidos modernos del juego"""
-        frequencies = {
-            'paddle_hit': 400,
-            'brick_break': 600,
-            'wall_hit': 300,
-            'powerup': 800,
-            'life_lost': 150,
-            'level_complete': 1000,
-            'menu': 500
-        }
-        
-        try:
-            frequency = frequencies.get(sound_type, 500)
-            duration = 80 if sound_type != 'life_lost' else 300
-            
-            sample_rate = 22050
-            frames = int(duration * sample_rate / 1000)
-            arr = []
-            for i in range(frames):
-                wave = 2048 * (frequency * 2 * 3.14159 * i / sample_rate) % (2 * 3.14159)
-                arr.append([int(16383 * 0.05 * (wave - 3.14159) / 3.14159)] * 2)
-            
-            sound = pygame.sndarray.make_sound(pygame.array.array('h', arr))
-            sound.play()
-        except:
-            pass
+        self.tone_bank.play_effect("breakout", sound_type)
     
     def handle_continuous_input(self):
-        """Manejar input continuo para movimiento suave"""
+        """Manejar input continuo: la paleta avanza su velocidad en cada paso"""
         if self.game_state != "playing":
             return
             
         keys = pygame.key.get_pressed()
-        current_time = pygame.time.get_ticks()
         
         # Movimiento izquierda con A
-        if keys[pygame.K_a]:
-            if (pygame.K_a not in self.key_repeat_timer or 
-                current_time - self.key_repeat_timer[pygame.K_a] > 16):  # ~60fps
-                
-                if self.paddle['x'] > 0:
-                    self.paddle['x'] -= self.paddle['speed']
-                    self.paddle['x'] = max(0, self.paddle['x'])
-                    self.key_repeat_timer[pygame.K_a] = current_time
-        else:
-            self.key_repeat_timer.pop(pygame.K_a, None)
+        if keys[pygame.K_a] and self.paddle['x'] > 0:
+            self.paddle['x'] -= self.paddle['speed']
+            self.paddle['x'] = max(0, self.paddle['x'])
             
         # Movimiento derecha con D
-        if keys[pygame.K_d]:
-            if (pygame.K_d not in self.key_repeat_timer or 
-                current_time - self.key_repeat_timer[pygame.K_d] > 16):
-                
-                if self.paddle['x'] < self.width - self.paddle['width']:
-                    self.paddle['x'] += self.paddle['speed']
-                    self.paddle['x'] = min(self.width - self.paddle['width'], self.paddle['x'])
-                    self.key_repeat_timer[pygame.K_d] = current_time
-        else:
-            self.key_repeat_timer.pop(pygame.K_d, None)
+        if keys[pygame.K_d] and self.paddle['x'] < self.width - self.paddle['width']:
+            self.paddle['x'] += self.paddle['speed']
+            self.paddle['x'] = min(self.width - self.paddle['width'], self.paddle['x'])
+    
+    def store_previous_positions(self):
+        """Guardar las posiciones del paso actual para interpolar el render"""
+        self.paddle['previous_x'] = self.paddle['x']
+        for ball in self.balls:
+            ball['previous'] = (ball['x'], ball['y'])
     
     def handle_events(self):
         """Manejar eventos"""
@@ -359,9 +366,7 @@ class BreakoutModern:
                 ball['y'] = self.paddle['y'] - ball['radius'] - 5
             else:
                 # Actualizar trail
-                ball['trail'].append((ball['x'], ball['y']))
-                if len(ball['trail']) > 12:
-                    ball['trail'].pop(0)
+                ball['trail'].push(ball['x'], ball['y'])
                 
                 # Mover pelota
                 ball['x'] += ball['speed_x']
@@ -544,7 +549,7 @@ class BreakoutModern:
                 if not ball['stuck_to_paddle']:
                     for i in range(2):
                         new_ball = ball.copy()
-                        new_ball['trail'] = []
+                        new_ball['trail'] = Trail(self.trail_length)
                         angle = random.uniform(-math.pi/3, math.pi/3)
                         speed = math.sqrt(ball['speed_x']**2 + ball['speed_y']**2)
                         new_ball['speed_x'] = speed * math.sin(angle)
@@ -569,31 +574,14 @@ class BreakoutModern:
     
     def create_brick_particles(self, brick):
         """Crear partículas al romper ladrillo"""
-        for _ in range(12):
-            particle = {
-                'x': brick['x'] + brick['width'] // 2,
-                'y': brick['y'] + brick['height'] // 2,
-                'dx': random.uniform(-6, 6),
-                'dy': random.uniform(-6, 6),
-                'life': 40,
-                'max_life': 40,
-                'color': brick['color'],
-                'size': random.uniform(2, 5)
-            }
-            self.particles.append(particle)
+        self.particles.emit(brick['x'] + brick['width'] // 2, brick['y'] + brick['height'] // 2,
+                            scaled(12, self.quality['particles']), brick['color'],
+                            speed=6, life=40, size=(2, 5))
     
     def update_effects(self):
         """Actualizar efectos visuales"""
         # Actualizar partículas
-        for particle in self.particles[:]:
-            particle['x'] += particle['dx']
-            particle['y'] += particle['dy']
-            particle['dy'] += 0.3  # Gravedad
-            particle['life'] -= 1
-            particle['size'] *= 0.98  # Reducir tamaño
-            
-            if particle['life'] <= 0 or particle['size'] < 0.5:
-                self.particles.remove(particle)
+        self.particles.update()
         
         # Reducir screen shake
         self.screen_shake = max(0, self.screen_shake - 1)
@@ -619,7 +607,7 @@ class BreakoutModern:
                     'speed_x': 0,
                     'speed_y': 0,
                     'stuck_to_paddle': True,
-                    'trail': []
+                    'trail': Trail(self.trail_length)
                 }]
         
         # Sin ladrillos = nivel completado
@@ -635,30 +623,39 @@ class BreakoutModern:
     
     def draw_shadow_rect(self, surface, rect, radius=8, shadow_offset=3):
         """Dibujar rectángulo con sombra sutil"""
-        shadow_rect = rect.copy()
-        shadow_rect.x += shadow_offset
-        shadow_rect.y += shadow_offset
-        shadow_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(shadow_surface, self.colors['shadow'], (0, 0, rect.width, rect.height), border_radius=radius)
-        surface.blit(shadow_surface, (shadow_rect.x, shadow_rect.y))
+        if not self.quality['shadows']:
+            return
+        get_card_renderer().draw_shadow(surface, rect, radius, self.colors['shadow'], shadow_offset)
     
-    def draw_background(self):
-        """Dibujar fondo moderno"""
-        self.screen.fill(self.colors['bg'])
+    def draw_background(self, surface):
+        """Dibujar fondo moderno (capa estática)"""
+        surface.fill(self.colors['bg'])
         
         # Grid sutil
-        for x in range(0, self.width, 50):
-            pygame.draw.line(self.screen, self.colors['grid'], (x, 0), (x, self.height), 1)
-        for y in range(0, self.height, 50):
-            pygame.draw.line(self.screen, self.colors['grid'], (0, y), (self.width, y), 1)
+        if self.quality['background_grid']:
+            for x in range(0, self.width, 50):
+                pygame.draw.line(surface, self.colors['grid'], (x, 0), (x, self.height), 1)
+            for y in range(0, self.height, 50):
+                pygame.draw.line(surface, self.colors['grid'], (0, y), (self.width, y), 1)
+    
+    def draw_entities(self):
+        """Dibujar ladrillos, paleta, pelotas y efectos (capa dinámica)"""
+        if self.game_state == "level_complete":
+            return
+        self.draw_bricks()
+        self.draw_paddle()
+        self.draw_balls()
+        self.draw_powerups()
+        self.draw_particles()
     
     def draw_paddle(self):
         """Dibujar paleta moderna"""
-        # Aplicar screen shake
-        shake_x = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
-        shake_y = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
+        # Aplicar screen shake (amplitud según la calidad)
+        shake = scaled(self.screen_shake, self.quality['screen_shake'])
+        shake_x = random.randint(-shake, shake) if shake > 0 else 0
+        shake_y = random.randint(-shake, shake) if shake > 0 else 0
         
-        x = self.paddle['x'] + shake_x
+        x = lerp(self.paddle.get('previous_x', self.paddle['x']), self.paddle['x'], self.loop.alpha) + shake_x
         y = self.paddle['y'] + shake_y
         
         paddle_rect = pygame.Rect(x, y, self.paddle['width'], self.paddle['height'])
@@ -687,95 +684,105 @@ class BreakoutModern:
     def draw_balls(self):
         """Dibujar pelotas modernas"""
         for ball in self.balls:
+            # Posición interpolada entre el paso anterior y el actual
+            previous_x, previous_y = ball.get('previous', (ball['x'], ball['y']))
+            ball_x = lerp(previous_x, ball['x'], self.loop.alpha)
+            ball_y = lerp(previous_y, ball['y'], self.loop.alpha)
+            
             # Dibujar trail moderno
-            for i, (tx, ty) in enumerate(ball['trail']):
-                if i > 0:
-                    alpha = (i / len(ball['trail'])) * 0.6
-                    size = int(ball['radius'] * alpha)
-                    if size > 0:
-                        trail_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                        color_with_alpha = (*self.colors['ball'], int(255 * alpha))
-                        pygame.draw.circle(trail_surface, color_with_alpha, (size, size), size)
-                        self.screen.blit(trail_surface, (tx - size, ty - size))
+            if self.quality['trail']:
+                self.trail_renderer.draw(self.screen, ball['trail'], self.colors['ball'], ball['radius'],
+                                         head=(ball_x, ball_y))
             
-            # Sombra de la pelota
-            shadow_x = int(ball['x'] + 2)
-            shadow_y = int(ball['y'] + 2)
-            shadow_surface = pygame.Surface((ball['radius'] * 2, ball['radius'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(shadow_surface, self.colors['shadow'], (ball['radius'], ball['radius']), ball['radius'])
-            self.screen.blit(shadow_surface, (shadow_x - ball['radius'], shadow_y - ball['radius']))
+            # Sombra de la pelota (circular: esquinas de radio igual al de la pelota)
+            shadow_rect = pygame.Rect(int(ball_x) - ball['radius'], int(ball_y) - ball['radius'],
+                                      ball['radius'] * 2, ball['radius'] * 2)
+            self.draw_shadow_rect(self.screen, shadow_rect, radius=ball['radius'], shadow_offset=2)
             
             # Dibujar pelota principal
             pygame.draw.circle(self.screen, self.colors['ball'], 
-                             (int(ball['x']), int(ball['y'])), ball['radius'])
+                             (int(ball_x), int(ball_y)), ball['radius'])
             
             # Borde
             pygame.draw.circle(self.screen, self.colors['border'], 
-                             (int(ball['x']), int(ball['y'])), ball['radius'], 2)
+                             (int(ball_x), int(ball_y)), ball['radius'], 2)
             
             # Highlight para efecto 3D
-            highlight_x = int(ball['x'] - ball['radius'] // 3)
-            highlight_y = int(ball['y'] - ball['radius'] // 3)
+            highlight_x = int(ball_x - ball['radius'] // 3)
+            highlight_y = int(ball_y - ball['radius'] // 3)
             pygame.draw.circle(self.screen, self.colors['text_primary'], 
                              (highlight_x, highlight_y), max(1, ball['radius'] // 4))
     
-    def draw_bricks(self):
-        """Dibujar ladrillos modernos"""
-        for brick in self.bricks:
-            # Animación sutil de respiración
-            pulse = math.sin((self.animation_time + brick['animation_offset']) * 0.05) * 0.02 + 1
-            
-            # Calcular posición con animación
-            brick_rect = pygame.Rect(
-                brick['x'], 
-                brick['y'], 
-                int(brick['width'] * pulse), 
-                int(brick['height'] * pulse)
-            )
+    def brick_sprite(self, color, width, height, powerup_size, damaged):
+        """Sprite de un ladrillo (sombra incluida) para un estado concreto"""
+        theme = 'dark' if self.dark_mode else 'light'
+        key = (theme, color, width, height, powerup_size, damaged, self.quality['shadows'])
+        
+        def paint(surface):
+            brick_rect = pygame.Rect(0, 0, width, height)
             
             # Sombra
-            self.draw_shadow_rect(self.screen, brick_rect, radius=8, shadow_offset=2)
-            
-            # Color base
-            color = brick['color']
+            self.draw_shadow_rect(surface, brick_rect, radius=8, shadow_offset=2)
             
             # Dibujar ladrillo principal
-            self.draw_rounded_rect(self.screen, color, brick_rect, 8)
+            self.draw_rounded_rect(surface, color, brick_rect, 8)
             
             # Borde
-            pygame.draw.rect(self.screen, self.colors['border'], brick_rect, 1, border_radius=8)
+            pygame.draw.rect(surface, self.colors['border'], brick_rect, 1, border_radius=8)
             
             # Highlight superior para efecto 3D
-            highlight_rect = pygame.Rect(brick_rect.x, brick_rect.y, brick_rect.width, brick_rect.height // 3)
+            highlight_rect = pygame.Rect(0, 0, width, height // 3)
             highlight_color = tuple(min(255, c + 40) for c in color)
-            self.draw_rounded_rect(self.screen, highlight_color, highlight_rect, 8)
+            self.draw_rounded_rect(surface, highlight_color, highlight_rect, 8)
             
             # Indicador de power-up
-            if brick['powerup']:
-                center_x = brick_rect.centerx
-                center_y = brick_rect.centery
-                
-                # Animación de pulso para power-ups
-                powerup_pulse = math.sin(self.animation_time * 0.2) * 0.3 + 0.7
-                powerup_size = int(6 * powerup_pulse)
-                
-                pygame.draw.circle(self.screen, self.colors['accent'], (center_x, center_y), powerup_size + 2)
-                pygame.draw.circle(self.screen, self.colors['text_primary'], (center_x, center_y), powerup_size)
+            if powerup_size is not None:
+                center = brick_rect.center
+                pygame.draw.circle(surface, self.colors['accent'], center, powerup_size + 2)
+                pygame.draw.circle(surface, self.colors['text_primary'], center, powerup_size)
             
-            # Indicador de daño (cracks)
-            if brick['current_hits'] > 0:
-                crack_surface = pygame.Surface((brick_rect.width, brick_rect.height), pygame.SRCALPHA)
+            # Indicador de daño (cracks), mezclado sobre el ladrillo
+            if damaged:
+                crack_surface = pygame.Surface((width, height), pygame.SRCALPHA)
                 crack_color = (*self.colors['text_secondary'], 120)
                 
                 # Líneas de crack
                 pygame.draw.line(crack_surface, crack_color,
-                               (brick_rect.width * 0.2, brick_rect.height * 0.3),
-                               (brick_rect.width * 0.8, brick_rect.height * 0.7), 2)
+                               (width * 0.2, height * 0.3),
+                               (width * 0.8, height * 0.7), 2)
                 pygame.draw.line(crack_surface, crack_color,
-                               (brick_rect.width * 0.3, brick_rect.height * 0.7),
-                               (brick_rect.width * 0.7, brick_rect.height * 0.3), 2)
+                               (width * 0.3, height * 0.7),
+                               (width * 0.7, height * 0.3), 2)
                 
-                self.screen.blit(crack_surface, (brick_rect.x, brick_rect.y))
+                surface.blit(crack_surface, (0, 0))
+        
+        return self.brick_atlas.get(key, (width + 2, height + 2), paint)
+    
+    def draw_bricks(self):
+        """Dibujar ladrillos modernos: un único blits() con sprites del atlas"""
+        # Animación de pulso de power-ups (común a todos los ladrillos)
+        if self.quality['pulse_animations']:
+            powerup_pulse = math.sin(self.animation_time * 0.2) * 0.3 + 0.7
+        else:
+            powerup_pulse = 1
+        powerup_size = int(6 * powerup_pulse)
+        
+        sprites = []
+        for brick in self.bricks:
+            # Animación sutil de respiración: int() la reduce a unos pocos tamaños
+            if self.quality['brick_breathing']:
+                pulse = math.sin((self.animation_time + brick['animation_offset']) * 0.05) * 0.02 + 1
+            else:
+                pulse = 1
+            width = int(brick['width'] * pulse)
+            height = int(brick['height'] * pulse)
+            
+            sprite = self.brick_sprite(brick['color'], width, height,
+                                       powerup_size if brick['powerup'] else None,
+                                       brick['current_hits'] > 0)
+            sprites.append((sprite, (brick['x'], brick['y'])))
+        
+        self.screen.blits(sprites, doreturn=False)
     
     def draw_powerups(self):
         """Dibujar power-ups cayendo modernos"""
@@ -790,14 +797,12 @@ class BreakoutModern:
             
             # Animación de rotación y pulso
             rotation = powerup['animation'] * 6
-            pulse = math.sin(powerup['pulse'] * 0.3) * 0.2 + 0.8
+            pulse = math.sin(powerup['pulse'] * 0.3) * 0.2 + 0.8 if self.quality['pulse_animations'] else 1
             size = int(12 * pulse)
             
             # Sombra
-            shadow_rect = pygame.Rect(powerup['x'] - size + 2, powerup['y'] - size + 2, size * 2, size * 2)
-            shadow_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(shadow_surface, self.colors['shadow'], (size, size), size)
-            self.screen.blit(shadow_surface, (shadow_rect.x, shadow_rect.y))
+            shadow_rect = pygame.Rect(powerup['x'] - size, powerup['y'] - size, size * 2, size * 2)
+            self.draw_shadow_rect(self.screen, shadow_rect, radius=size, shadow_offset=2)
             
             # Power-up principal
             pygame.draw.circle(self.screen, color, (int(powerup['x']), int(powerup['y'])), size)
@@ -811,21 +816,13 @@ class BreakoutModern:
             }
             icon = icon_text.get(powerup['type'], '?')
             
-            text_surface = self.fonts['small'].render(icon, True, self.colors['text_primary'])
+            text_surface = render_text(self.fonts['small'], icon, True, self.colors['text_primary'])
             text_rect = text_surface.get_rect(center=(powerup['x'], powerup['y']))
             self.screen.blit(text_surface, text_rect)
     
     def draw_particles(self):
         """Dibujar partículas modernas"""
-        for particle in self.particles:
-            alpha = particle['life'] / particle['max_life']
-            size = max(0.5, particle['size'] * alpha)
-            
-            if size > 0.5:
-                particle_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                color_with_alpha = (*particle['color'], int(255 * alpha))
-                pygame.draw.circle(particle_surface, color_with_alpha, (size, size), size)
-                self.screen.blit(particle_surface, (particle['x'] - size, particle['y'] - size))
+        self.particles.draw(self.screen)
     
     def draw_hud(self):
         """Dibujar HUD moderno"""
@@ -847,11 +844,11 @@ class BreakoutModern:
             x = 35 + i * 80
             
             # Label
-            label_text = self.fonts['tiny'].render(label, True, self.colors['text_secondary'])
+            label_text = render_text(self.fonts['tiny'], label, True, self.colors['text_secondary'])
             self.screen.blit(label_text, (x, 30))
             
             # Valor
-            value_text = self.fonts['medium'].render(value, True, color)
+            value_text = render_text(self.fonts['medium'], value, True, color)
             self.screen.blit(value_text, (x, 45))
         
         # Power-ups activos
@@ -861,25 +858,25 @@ class BreakoutModern:
             self.draw_rounded_rect(self.screen, self.colors['card_bg'], powerup_card)
             pygame.draw.rect(self.screen, self.colors['border'], powerup_card, 1, border_radius=8)
             
-            title_text = self.fonts['tiny'].render("ACTIVE POWERS", True, self.colors['text_secondary'])
+            title_text = render_text(self.fonts['tiny'], "ACTIVE POWERS", True, self.colors['text_secondary'])
             self.screen.blit(title_text, (30, 130))
             
             powerup_y = 145
             if self.active_powerups['big_paddle'] > 0:
                 time_left = self.active_powerups['big_paddle'] // 60
-                text = self.fonts['tiny'].render(f"Big Paddle ({time_left}s)", True, self.colors['success'])
+                text = render_text(self.fonts['tiny'], f"Big Paddle ({time_left}s)", True, self.colors['success'])
                 self.screen.blit(text, (30, powerup_y))
                 powerup_y += 12
             
             if self.active_powerups['sticky_paddle'] > 0:
                 time_left = self.active_powerups['sticky_paddle'] // 60
-                text = self.fonts['tiny'].render(f"Sticky ({time_left}s)", True, self.colors['warning'])
+                text = render_text(self.fonts['tiny'], f"Sticky ({time_left}s)", True, self.colors['warning'])
                 self.screen.blit(text, (30, powerup_y))
         
         # Combo
         if self.brick_break_combo > 2:
             combo_text = f"COMBO x{self.brick_break_combo}!"
-            text = self.fonts['large'].render(combo_text, True, self.colors['accent'])
+            text = render_text(self.fonts['large'], combo_text, True, self.colors['accent'])
             x = (self.width - text.get_width()) // 2
             
             # Efecto de pulso
@@ -887,31 +884,29 @@ class BreakoutModern:
             text = pygame.transform.scale(text, (int(text.get_width() * pulse), int(text.get_height() * pulse)))
             self.screen.blit(text, (x, 200))
     
-    def draw_menu(self):
-        """Dibujar menú principal moderno"""
-        self.draw_background()
-        
+    def draw_menu(self, surface):
+        """Dibujar card y textos del menú principal (capa estática)"""
         # Card principal del menú
         menu_card = pygame.Rect(self.width // 2 - 300, 150, 600, 400)
-        self.draw_shadow_rect(self.screen, menu_card, shadow_offset=8)
-        self.draw_rounded_rect(self.screen, self.colors['card_bg'], menu_card, 16)
-        pygame.draw.rect(self.screen, self.colors['border'], menu_card, 2, border_radius=16)
+        self.draw_shadow_rect(surface, menu_card, shadow_offset=8)
+        self.draw_rounded_rect(surface, self.colors['card_bg'], menu_card, 16)
+        pygame.draw.rect(surface, self.colors['border'], menu_card, 2, border_radius=16)
         
         # Título
-        title_text = self.fonts['title'].render("BREAKOUT", True, self.colors['text_primary'])
+        title_text = render_text(self.fonts['title'], "BREAKOUT", True, self.colors['text_primary'])
         title_x = menu_card.centerx - title_text.get_width() // 2
-        self.screen.blit(title_text, (title_x, 180))
+        surface.blit(title_text, (title_x, 180))
         
         # Subtítulo
-        subtitle_text = self.fonts['medium'].render("MODERN EDITION", True, self.colors['accent'])
+        subtitle_text = render_text(self.fonts['medium'], "MODERN EDITION", True, self.colors['accent'])
         subtitle_x = menu_card.centerx - subtitle_text.get_width() // 2
-        self.screen.blit(subtitle_text, (subtitle_x, 220))
+        surface.blit(subtitle_text, (subtitle_x, 220))
         
         # Descripción del juego
         description = "Break all the bricks to advance levels!"
-        desc_text = self.fonts['small'].render(description, True, self.colors['text_secondary'])
+        desc_text = render_text(self.fonts['small'], description, True, self.colors['text_secondary'])
         desc_x = menu_card.centerx - desc_text.get_width() // 2
-        self.screen.blit(desc_text, (desc_x, 260))
+        surface.blit(desc_text, (desc_x, 260))
         
         # Controles
         controls_y = 300
@@ -936,31 +931,33 @@ class BreakoutModern:
                 color = self.colors['text_secondary']
                 font = self.fonts['tiny']
             
-            text = font.render(control, True, color)
+            text = render_text(font, control, True, color)
             text_x = menu_card.centerx - text.get_width() // 2
-            self.screen.blit(text, (text_x, controls_y + i * 18))
+            surface.blit(text, (text_x, controls_y + i * 18))
+        
+        # Tema actual
+        theme_text = f"Current theme: {('Dark' if self.dark_mode else 'Light')}"
+        theme_surface = render_text(self.fonts['tiny'], theme_text, True, self.colors['text_secondary'])
+        surface.blit(theme_surface, (20, self.height - 30))
+    
+    def draw_menu_prompt(self):
+        """Dibujar el texto de inicio con pulso (capa dinámica del menú)"""
+        menu_card = pygame.Rect(self.width // 2 - 300, 150, 600, 400)
         
         # Botón de inicio (simulado)
         start_y = 480
-        start_text = self.fonts['medium'].render("PRESS ENTER TO START", True, self.colors['accent'])
+        start_text = render_text(self.fonts['medium'], "PRESS ENTER TO START", True, self.colors['accent'])
         start_x = menu_card.centerx - start_text.get_width() // 2
         
         # Efecto de pulso para el texto de inicio
         pulse = math.sin(self.animation_time * 0.1) * 0.1 + 0.9
         scaled_text = pygame.transform.scale(start_text, (int(start_text.get_width() * pulse), int(start_text.get_height() * pulse)))
         self.screen.blit(scaled_text, (start_x, start_y))
-        
-        # Tema actual
-        theme_text = f"Current theme: {('Dark' if self.dark_mode else 'Light')}"
-        theme_surface = self.fonts['tiny'].render(theme_text, True, self.colors['text_secondary'])
-        self.screen.blit(theme_surface, (20, self.height - 30))
     
     def draw_overlay(self, title, subtitle="", action_text="", overlay_type="info"):
         """Dibujar overlay moderno"""
         # Overlay de fondo
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill(self.colors['overlay'])
-        self.screen.blit(overlay, (0, 0))
+        get_card_renderer().draw_veil(self.screen, self.colors['overlay'])
         
         # Card principal
         card_width = 500
@@ -983,20 +980,20 @@ class BreakoutModern:
         title_color = title_colors.get(overlay_type, self.colors['text_primary'])
         
         # Título
-        title_text = self.fonts['title'].render(title, True, title_color)
+        title_text = render_text(self.fonts['title'], title, True, title_color)
         title_x = card_x + (card_width - title_text.get_width()) // 2
         self.screen.blit(title_text, (title_x, card_y + 50))
         
         # Subtítulo
         if subtitle:
-            subtitle_text = self.fonts['medium'].render(subtitle, True, self.colors['text_secondary'])
+            subtitle_text = render_text(self.fonts['medium'], subtitle, True, self.colors['text_secondary'])
             subtitle_x = card_x + (card_width - subtitle_text.get_width()) // 2
             self.screen.blit(subtitle_text, (subtitle_x, card_y + 100))
         
         # Texto de acción
         if action_text:
             action_font = self.fonts['medium']
-            action_text_render = action_font.render(action_text, True, self.colors['accent'])
+            action_text_render = render_text(action_font, action_text, True, self.colors['accent'])
             action_x = card_x + (card_width - action_text_render.get_width()) // 2
             action_y = card_y + (160 if subtitle else 140)
             
@@ -1007,6 +1004,45 @@ class BreakoutModern:
                                                   int(action_text_render.get_height() * pulse)))
             self.screen.blit(scaled_action, (action_x, action_y))
     
+    def draw_overlays(self):
+        """Dibujar pausa, game over o nivel completado (capa de overlay)"""
+        if self.game_state == "paused":
+            self.draw_overlay("PAUSED", "Game is on hold", "Press SPACE to resume", "info")
+        elif self.game_state == "game_over":
+            high_score_text = f"Final Score: {self.score:,}"
+            if self.score == self.high_score and self.score > 0:
+                self.draw_overlay("GAME OVER", "NEW HIGH SCORE!", "Press SPACE to continue", "success")
+            else:
+                self.draw_overlay("GAME OVER", high_score_text, "Press SPACE to continue", "danger")
+        elif self.game_state == "level_complete":
+            level_text = f"Level {self.level - 1} Complete!"
+            self.draw_overlay("LEVEL COMPLETE", level_text, "Press W to continue", "success")
+    
+    def fixed_update(self):
+        """Un paso de simulación"""
+        # Posiciones de partida del paso (también en pausa: sin ellas el render
+        # seguiría interpolando entre dos posiciones viejas)
+        self.store_previous_positions()
+        
+        if self.game_state == "level_complete":
+            # Auto-continuar después de mostrar nivel completado
+            keys = pygame.key.get_pressed()
+            if keys[pygame.K_w] or keys[pygame.K_RETURN]:
+                self.create_bricks()  # Crear nuevos ladrillos
+                self.game_state = "playing"
+                # Resetear pelota para el nuevo nivel
+                self.balls = [{
+                    'x': self.width // 2,
+                    'y': self.height - 110,
+                    'radius': 10,
+                    'speed_x': 0,
+                    'speed_y': 0,
+                    'stuck_to_paddle': True,
+                    'trail': Trail(self.trail_length)
+                }]
+        else:
+            self.update_game()
+    
     def run(self):
         """Loop principal del juego"""
         running = True
@@ -1015,64 +1051,26 @@ class BreakoutModern:
             # Manejar eventos
             running = self.handle_events()
             
-            # Actualizar juego
-            if self.game_state == "level_complete":
-                # Auto-continuar después de mostrar nivel completado
-                keys = pygame.key.get_pressed()
-                if keys[pygame.K_w] or keys[pygame.K_RETURN]:
-                    self.create_bricks()  # Crear nuevos ladrillos
-                    self.game_state = "playing"
-                    # Resetear pelota para el nuevo nivel
-                    self.balls = [{
-                        'x': self.width // 2,
-                        'y': self.height - 110,
-                        'radius': 10,
-                        'speed_x': 0,
-                        'speed_y': 0,
-                        'stuck_to_paddle': True,
-                        'trail': []
-                    }]
-            else:
-                self.update_game()
+            # Actualizar juego: los pasos fijos que correspondan al tiempo transcurrido
+            for _ in range(self.loop.advance()):
+                self.fixed_update()
             
-            # Dibujar según estado
+            # Dibujar según estado: base cacheada + capas dinámicas
             if self.game_state == "menu":
-                self.draw_menu()
-            elif self.game_state in ["playing", "paused"]:
-                self.draw_background()
-                self.draw_bricks()
-                self.draw_paddle()
-                self.draw_balls()
-                self.draw_powerups()
-                self.draw_particles()
-                self.draw_hud()
-                
-                if self.game_state == "paused":
-                    self.draw_overlay("PAUSED", "Game is on hold", "Press SPACE to resume", "info")
-            elif self.game_state == "game_over":
-                self.draw_background()
-                self.draw_bricks()
-                self.draw_paddle()
-                self.draw_balls()
-                self.draw_powerups()
-                self.draw_particles()
-                self.draw_hud()
-                
-                high_score_text = f"Final Score: {self.score:,}"
-                if self.score == self.high_score and self.score > 0:
-                    self.draw_overlay("GAME OVER", "NEW HIGH SCORE!", "Press SPACE to continue", "success")
-                else:
-                    self.draw_overlay("GAME OVER", high_score_text, "Press SPACE to continue", "danger")
-            elif self.game_state == "level_complete":
-                self.draw_background()
-                self.draw_hud()
-                level_text = f"Level {self.level - 1} Complete!"
-                score_text = f"Score: {self.score:,} (+2000 bonus)"
-                self.draw_overlay("LEVEL COMPLETE", level_text, "Press W to continue", "success")
+                self.menu_layers.render(self.screen)
+            else:
+                self.game_layers.render(self.screen)
             
             pygame.display.flip()
-            self.clock.tick(60)
+            self.loop.wait()
+            
+            # Governor: ajustar los efectos al tiempo de frame real
+            if self.governor.record(self.loop.clock.get_rawtime()):
+                self.menu_layers.invalidate()  # Las capas horneadas llevan sombras
+                self.game_layers.invalidate()
         
+        if self.music:
+            self.music.stop()
         pygame.quit()
         sys.exit()
 
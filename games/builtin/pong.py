@@ -8,11 +8,33 @@ import pygame
 import random
 import math
 import sys
+from pathlib import Path
+
+# Permitir importar los módulos del sistema al ejecutarse como script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.audio_device import init_pygame, load_saved_config
+from core.sound_manager import get_tone_bank, apply_volume_levels, play_song
+from core.compositor import Compositor
+from core.card_renderer import get_card_renderer
+from core.text_cache import render_text
+from core.bitmap_font import get_font
+from core.trails import Trail, TrailRenderer
+from core.game_loop import FixedTimestep, lerp
+from core.quality import get_quality, configured_fps_limit, scaled, QualityGovernor
 
 class PongModern:
     def __init__(self):
-        pygame.init()
-        pygame.mixer.init()
+        # El mixer se abre en segundo plano; el primer sonido lo espera
+        init_pygame()
+        self.tone_bank = get_tone_bank()
+        self.tone_bank.load_sets(["pong"])
+        apply_volume_levels(load_saved_config())
+        # Calidad de efectos según el performance_mode elegido en Settings
+        self.quality = get_quality()
+        self.trail_length = scaled(8, self.quality['trail'])
+        # Música del juego generada por el secuenciador (sin archivos)
+        self.music = play_song("pong")
         
         # Configuración moderna
         self.width = 800
@@ -35,11 +57,11 @@ class PongModern:
         
         # Fuentes
         self.fonts = {
-            'title': pygame.font.Font(None, 72),
-            'large': pygame.font.Font(None, 48),
-            'medium': pygame.font.Font(None, 32),
-            'small': pygame.font.Font(None, 22),
-            'tiny': pygame.font.Font(None, 16)
+            'title': get_font(72),
+            'large': get_font(48),
+            'medium': get_font(32),
+            'small': get_font(22),
+            'tiny': get_font(16)
         }
         
         # Estado del juego
@@ -51,10 +73,24 @@ class PongModern:
         
         self.reset_game()
         
-        # Control
-        self.clock = pygame.time.Clock()
+        # Control: simulación a paso fijo, render al ritmo de la pantalla
+        self.loop = FixedTimestep(render_fps=configured_fps_limit())
+        # Governor: baja efectos si el tiempo de frame supera el presupuesto
+        self.governor = QualityGovernor(self.quality, self.loop.render_fps)
         self.screen_shake = 0
+        self.shake_offset = (0, 0)
         self.animation_time = 0
+        self.trail_renderer = TrailRenderer(max_alpha=0.6, lead=1)
+        
+        # Capas: el menú completo y la pista se hornean una sola vez
+        self.menu_layers = Compositor((self.width, self.height))
+        self.menu_layers.add_layer("background", self.draw_menu, static=True)
+        
+        self.game_layers = Compositor((self.width, self.height))
+        self.game_layers.add_layer("background", self.draw_court, static=True)
+        self.game_layers.add_layer("entities", self.draw_game)
+        self.game_layers.add_layer("hud", self.draw_hud)
+        self.game_layers.add_layer("overlay", self.draw_overlays)
         
     def reset_game(self):
         """Reiniciar juego"""
@@ -86,39 +122,30 @@ class PongModern:
             'speed_x': random.choice([-6, 6]),
             'speed_y': random.choice([-4, 4]),
             'max_speed': 15,
-            'trail': []
+            'trail': Trail(self.trail_length)
         }
         
         self.winning_score = 5
-        
+        self.store_previous_positions()
+        
+    def store_previous_positions(self):
+        """Guardar las posiciones del paso actual para interpolar el render"""
+        self.previous = {
+            'ball': (self.ball['x'], self.ball['y']),
+            'player1': self.player1['y'],
+            'player2': self.player2['y']
+        }
+    
+    def fixed_update(self):
+        """Un paso de simulación"""
+        self.store_previous_positions()
+        self.update_game()
+        self.screen_shake = max(0, self.screen_shake - 1)
+        self.animation_time += 1
+    
     def play_sound(self, sound_type):
         """Sonidos modernos"""
-        try:
-            frequencies = {
-                'paddle_hit': 800,
-                'wall_hit': 600,
-                'score': 1000,
-                'menu': 400,
-                'ai_toggle': 1200
-            }
-            
-            freq = frequencies.get(sound_type, 800)
-            duration = 80 if sound_type != 'score' else 200
-            
-            sample_rate = 22050
-            frames = int(duration * sample_rate / 1000)
-            arr = []
-            
-            for i in range(frames):
-                t = float(i) / sample_rate
-                envelope = math.exp(-t * 6)
-                wave = math.sin(2 * math.pi * freq * t) * envelope * 0.08
-                arr.append([int(32767 * wave)] * 2)
-            
-            sound = pygame.sndarray.make_sound(pygame.array.array('h', arr))
-            sound.play()
-        except:
-            pass
+        self.tone_bank.play_effect("pong", sound_type)
     
     def handle_events(self):
         """Manejar eventos"""
@@ -156,6 +183,7 @@ class PongModern:
                 # TOGGLE AI - CRUCIAL
                 elif event.key == pygame.K_a:
                     self.ai_enabled = not self.ai_enabled
+                    self.menu_layers.invalidate()
                     print(f"AI TOGGLED: {'ON' if self.ai_enabled else 'OFF'}")
                     self.play_sound('ai_toggle')
         
@@ -211,9 +239,7 @@ class PongModern:
     def update_ball(self):
         """Actualizar pelota"""
         # Trail de la pelota
-        self.ball['trail'].append((self.ball['x'], self.ball['y']))
-        if len(self.ball['trail']) > 8:
-            self.ball['trail'].pop(0)
+        self.ball['trail'].push(self.ball['x'], self.ball['y'])
         
         # Mover pelota
         self.ball['x'] += self.ball['speed_x']
@@ -289,31 +315,27 @@ class PongModern:
         while abs(self.ball['speed_y']) < 1.0:
             self.ball['speed_y'] = random.uniform(-4, 4)
         self.ball['trail'].clear()
+        # Teletransporte: no interpolar desde la posición anterior
+        self.previous['ball'] = (self.ball['x'], self.ball['y'])
     
     def draw_modern_card(self, surface, rect, color, radius=12, shadow=True):
         """Dibujar card moderna"""
-        if shadow:
-            shadow_rect = pygame.Rect(rect.x + 4, rect.y + 4, rect.width, rect.height)
-            shadow_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(shadow_surface, self.colors['shadow'], 
-                           (0, 0, rect.width, rect.height), border_radius=radius)
-            surface.blit(shadow_surface, shadow_rect.topleft)
-        
-        pygame.draw.rect(surface, color, rect, border_radius=radius)
+        get_card_renderer().draw_card(surface, rect, color, radius=radius,
+                                      shadow_color=self.colors['shadow'] if shadow and self.quality['shadows'] else None)
     
-    def draw_menu(self):
-        """Dibujar menú moderno"""
-        self.screen.fill(self.colors['bg_primary'])
+    def draw_menu(self, surface):
+        """Dibujar menú moderno (estático hasta cambiar el modo AI)"""
+        surface.fill(self.colors['bg_primary'])
         
         # Título
-        title_text = self.fonts['title'].render("PONG", True, self.colors['text_primary'])
+        title_text = render_text(self.fonts['title'], "PONG", True, self.colors['text_primary'])
         title_x = (self.width - title_text.get_width()) // 2
-        self.screen.blit(title_text, (title_x, 80))
+        surface.blit(title_text, (title_x, 80))
         
         # Subtítulo
-        subtitle = self.fonts['medium'].render("Modern Edition - Fixed", True, self.colors['accent_player1'])
+        subtitle = render_text(self.fonts['medium'], "Modern Edition - Fixed", True, self.colors['accent_player1'])
         sub_x = (self.width - subtitle.get_width()) // 2
-        self.screen.blit(subtitle, (sub_x, 140))
+        surface.blit(subtitle, (sub_x, 140))
         
         # Card principal del menú
         card_width = 500
@@ -322,7 +344,7 @@ class PongModern:
         card_y = self.height // 2 - card_height // 2 + 30
         
         card_rect = pygame.Rect(card_x, card_y, card_width, card_height)
-        self.draw_modern_card(self.screen, card_rect, self.colors['bg_secondary'])
+        self.draw_modern_card(surface, card_rect, self.colors['bg_secondary'])
         
         # Opciones del menú
         options_y = card_y + 40
@@ -338,15 +360,15 @@ class PongModern:
         ]
         
         for i, (option_text, color) in enumerate(options):
-            text_render = self.fonts['medium'].render(option_text, True, color)
+            text_render = render_text(self.fonts['medium'], option_text, True, color)
             text_x = card_x + (card_width - text_render.get_width()) // 2
-            self.screen.blit(text_render, (text_x, options_y + i * 60))
+            surface.blit(text_render, (text_x, options_y + i * 60))
         
         # Controles detallados
         controls_y = card_y + 220
-        controls_title = self.fonts['small'].render("CONTROLS:", True, self.colors['text_primary'])
+        controls_title = render_text(self.fonts['small'], "CONTROLS:", True, self.colors['text_primary'])
         controls_title_x = card_x + (card_width - controls_title.get_width()) // 2
-        self.screen.blit(controls_title, (controls_title_x, controls_y))
+        surface.blit(controls_title, (controls_title_x, controls_y))
         
         controls = [
             "Player 1 (Left): W / S",
@@ -358,57 +380,70 @@ class PongModern:
         for i, control in enumerate(controls):
             if control == "":
                 continue
-            control_text = self.fonts['tiny'].render(control, True, self.colors['text_secondary'])
+            control_text = render_text(self.fonts['tiny'], control, True, self.colors['text_secondary'])
             control_x = card_x + (card_width - control_text.get_width()) // 2
-            self.screen.blit(control_text, (control_x, controls_y + 25 + i * 18))
+            surface.blit(control_text, (control_x, controls_y + 25 + i * 18))
     
-    def draw_game(self):
-        """Dibujar juego"""
-        # Screen shake
-        shake_x = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
-        shake_y = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
-        self.screen_shake = max(0, self.screen_shake - 1)
-        
-        self.screen.fill(self.colors['bg_primary'])
+    def update_shake(self):
+        """Calcular el desplazamiento de screen shake de este frame"""
+        shake = scaled(self.screen_shake, self.quality['screen_shake'])
+        shake_x = random.randint(-shake, shake) if shake > 0 else 0
+        shake_y = random.randint(-shake, shake) if shake > 0 else 0
+        self.shake_offset = (shake_x, shake_y)
+        return self.shake_offset
+    
+    def draw_court(self, surface):
+        """Dibujar fondo y línea central (capa estática)"""
+        surface.fill(self.colors['bg_primary'])
         
         # Línea central
         center_x = self.width // 2
         for y in range(0, self.height, 20):
-            line_rect = pygame.Rect(center_x - 2 + shake_x, y + shake_y, 4, 10)
-            pygame.draw.rect(self.screen, self.colors['grid_line'], line_rect, border_radius=2)
+            line_rect = pygame.Rect(center_x - 2, y, 4, 10)
+            pygame.draw.rect(surface, self.colors['grid_line'], line_rect, border_radius=2)
+    
+    def draw_game(self):
+        """Dibujar paletas y pelota"""
+        shake_x, shake_y = self.shake_offset
+        alpha = self.loop.alpha
         
-        # Paletas
+        # Paletas (interpoladas entre el paso anterior y el actual)
         # Player 1
-        p1_rect = pygame.Rect(self.player1['x'] + shake_x, self.player1['y'] + shake_y, 
+        p1_y = lerp(self.previous['player1'], self.player1['y'], alpha)
+        p1_rect = pygame.Rect(self.player1['x'] + shake_x, p1_y + shake_y, 
                               self.player1['width'], self.player1['height'])
         pygame.draw.rect(self.screen, self.colors['accent_player1'], p1_rect, border_radius=8)
         
         # Player 2
-        p2_rect = pygame.Rect(self.player2['x'] + shake_x, self.player2['y'] + shake_y, 
+        p2_y = lerp(self.previous['player2'], self.player2['y'], alpha)
+        p2_rect = pygame.Rect(self.player2['x'] + shake_x, p2_y + shake_y, 
                               self.player2['width'], self.player2['height'])
         pygame.draw.rect(self.screen, self.colors['accent_player2'], p2_rect, border_radius=8)
         
-        # Trail de la pelota
-        for i, (trail_x, trail_y) in enumerate(self.ball['trail']):
-            alpha = (i + 1) / len(self.ball['trail']) * 0.6
-            size = int(self.ball['size'] * alpha)
-            
-            if size > 0:
-                trail_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-                trail_color = (*self.colors['ball'], int(255 * alpha))
-                pygame.draw.circle(trail_surface, trail_color, (size // 2, size // 2), size // 2)
-                self.screen.blit(trail_surface, (trail_x + shake_x, trail_y + shake_y))
+        # Posición interpolada de la pelota
+        previous_x, previous_y = self.previous['ball']
+        head = (lerp(previous_x, self.ball['x'], alpha), lerp(previous_y, self.ball['y'], alpha))
+        
+        # Trail de la pelota (termina en la posición dibujada)
+        if self.quality['trail']:
+            self.trail_renderer.draw(self.screen, self.ball['trail'], self.colors['ball'],
+                                     self.ball['size'] / 2, offset=(shake_x, shake_y), anchor="topleft",
+                                     head=head)
         
         # Pelota
-        ball_x = int(self.ball['x'] + shake_x)
-        ball_y = int(self.ball['y'] + shake_y)
+        ball_x = int(head[0] + shake_x)
+        ball_y = int(head[1] + shake_y)
         pygame.draw.circle(self.screen, self.colors['ball'], 
                          (ball_x + self.ball['size'] // 2, ball_y + self.ball['size'] // 2), 
                          self.ball['size'] // 2)
+    
+    def draw_hud(self):
+        """Dibujar puntuaciones, modos y controles"""
+        shake_x, shake_y = self.shake_offset
         
         # Puntuaciones
-        score1_text = self.fonts['large'].render(str(self.player1['score']), True, self.colors['accent_player1'])
-        score2_text = self.fonts['large'].render(str(self.player2['score']), True, self.colors['accent_player2'])
+        score1_text = render_text(self.fonts['large'], str(self.player1['score']), True, self.colors['accent_player1'])
+        score2_text = render_text(self.fonts['large'], str(self.player2['score']), True, self.colors['accent_player2'])
         
         self.screen.blit(score1_text, (self.width // 2 - 100 + shake_x, 50 + shake_y))
         self.screen.blit(score2_text, (self.width // 2 + 80 + shake_x, 50 + shake_y))
@@ -417,8 +452,8 @@ class PongModern:
         p1_label = "HUMAN (W/S)"
         p2_label = "AI" if self.ai_enabled else "HUMAN (Flechas)"
         
-        label1 = self.fonts['tiny'].render(p1_label, True, self.colors['text_secondary'])
-        label2 = self.fonts['tiny'].render(p2_label, True, self.colors['text_secondary'])
+        label1 = render_text(self.fonts['tiny'], p1_label, True, self.colors['text_secondary'])
+        label2 = render_text(self.fonts['tiny'], p2_label, True, self.colors['text_secondary'])
         
         self.screen.blit(label1, (self.player1['x'] + shake_x, 15 + shake_y))
         self.screen.blit(label2, (self.player2['x'] - 30 + shake_x, 15 + shake_y))
@@ -429,15 +464,13 @@ class PongModern:
         else:
             controls = "W/S: Player 1 • Flechas: Player 2 • A: Toggle AI • Space: Pause • Esc: Menu"
             
-        controls_text = self.fonts['tiny'].render(controls, True, self.colors['text_secondary'])
+        controls_text = render_text(self.fonts['tiny'], controls, True, self.colors['text_secondary'])
         controls_x = (self.width - controls_text.get_width()) // 2
         self.screen.blit(controls_text, (controls_x + shake_x, self.height - 25 + shake_y))
     
     def draw_overlay(self, title, subtitle="", action_text=""):
         """Overlay modal moderno"""
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
+        get_card_renderer().draw_veil(self.screen, (0, 0, 0, 150))
         
         card_width = 400
         card_height = 200
@@ -448,12 +481,12 @@ class PongModern:
         self.draw_modern_card(self.screen, card_rect, self.colors['bg_secondary'], 
                              radius=16, shadow=True)
         
-        title_text = self.fonts['large'].render(title, True, self.colors['text_primary'])
+        title_text = render_text(self.fonts['large'], title, True, self.colors['text_primary'])
         title_x = card_x + (card_width - title_text.get_width()) // 2
         self.screen.blit(title_text, (title_x, card_y + 40))
         
         if subtitle:
-            subtitle_text = self.fonts['medium'].render(subtitle, True, self.colors['text_secondary'])
+            subtitle_text = render_text(self.fonts['medium'], subtitle, True, self.colors['text_secondary'])
             subtitle_x = card_x + (card_width - subtitle_text.get_width()) // 2
             self.screen.blit(subtitle_text, (subtitle_x, card_y + 85))
             
@@ -462,11 +495,20 @@ class PongModern:
             action_color = tuple(int(c * pulse) for c in self.colors['accent_player1'])
             
             action_font = self.fonts['medium'] if not subtitle else self.fonts['small']
-            action_text_render = action_font.render(action_text, True, action_color)
+            action_text_render = render_text(action_font, action_text, True, action_color)
             action_x = card_x + (card_width - action_text_render.get_width()) // 2
             action_y = card_y + (130 if not subtitle else 150)
             self.screen.blit(action_text_render, (action_x, action_y))
     
+    def draw_overlays(self):
+        """Dibujar pausa o ganador (capa de overlay)"""
+        if self.game_state == "paused":
+            self.draw_overlay("PAUSED", "Game is on hold", "PRESS SPACE TO RESUME")
+        elif self.game_state == "game_over":
+            winner = "PLAYER 1" if self.player1['score'] >= self.winning_score else ("AI" if self.ai_enabled else "PLAYER 2")
+            score_text = f"{self.player1['score']} - {self.player2['score']}"
+            self.draw_overlay(f"{winner} WINS!", score_text, "SPACE: Menu • R: Restart")
+    
     def run(self):
         """Loop principal"""
         running = True
@@ -480,31 +522,29 @@ class PongModern:
         print("   - ESC: Menu/Salir")
         
         while running:
-            # Eventos
+            # Eventos (en cada frame dibujado)
             running = self.handle_events()
             
-            # Lógica
-            self.update_game()
+            # Lógica: los pasos fijos que correspondan al tiempo transcurrido
+            for _ in range(self.loop.advance()):
+                self.fixed_update()
             
-            # Render
+            # Render: base cacheada + capas dinámicas
             if self.game_state == "menu":
-                self.draw_menu()
-            elif self.game_state == "playing":
-                self.draw_game()
-            elif self.game_state == "paused":
-                self.draw_game()
-                self.draw_overlay("PAUSED", "Game is on hold", "PRESS SPACE TO RESUME")
-            elif self.game_state == "game_over":
-                self.draw_game()
-                winner = "PLAYER 1" if self.player1['score'] >= self.winning_score else ("AI" if self.ai_enabled else "PLAYER 2")
-                score_text = f"{self.player1['score']} - {self.player2['score']}"
-                self.draw_overlay(f"{winner} WINS!", score_text, "SPACE: Menu • R: Restart")
+                self.menu_layers.render(self.screen)
+            else:
+                self.game_layers.render(self.screen, self.update_shake())
             
-            # Update
-            self.animation_time += 1
             pygame.display.flip()
-            self.clock.tick(60)
+            self.loop.wait()
+            
+            # Governor: ajustar los efectos al tiempo de frame real
+            if self.governor.record(self.loop.clock.get_rawtime()):
+                self.menu_layers.invalidate()  # Las capas horneadas llevan sombras
+                self.game_layers.invalidate()
         
+        if self.music:
+            self.music.stop()
         pygame.quit()
         sys.exit()
 
@@ -9,11 +9,35 @@ import random
 import sys
 import time
 import math
+from pathlib import Path
+
+# Permitir importar los módulos del sistema al ejecutarse como script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.audio_device import init_pygame, load_saved_config
+from core.sound_manager import get_tone_bank, apply_volume_levels, play_song
+from core.compositor import Compositor
+from core.card_renderer import get_card_renderer
+from core.text_cache import render_text
+from core.bitmap_font import get_font
+from core.game_loop import FixedTimestep, lerp
+from core.quality import get_quality, configured_fps_limit, QualityGovernor
+from core.sprite_cache import SpriteCache
+
+# Niveles de degradado del cuerpo: cada segmento usa el más cercano
+FADE_LEVELS = 8
 
 class SnakeModern:
     def __init__(self):
-        pygame.init()
-        pygame.mixer.init()
+        # El mixer se abre en segundo plano; el primer sonido lo espera
+        init_pygame()
+        self.tone_bank = get_tone_bank()
+        self.tone_bank.load_sets(["snake"])
+        apply_volume_levels(load_saved_config())
+        # Calidad de efectos según el performance_mode elegido en Settings
+        self.quality = get_quality()
+        # Música del juego generada por el secuenciador (sin archivos)
+        self.music = play_song("snake")
         
         # Configuración moderna
         self.cell_size = 25
@@ -70,31 +94,45 @@ class SnakeModern:
         
         # Fuentes modernas
         self.fonts = {
-            'title': pygame.font.Font(None, 36),
-            'large': pygame.font.Font(None, 28),
-            'medium': pygame.font.Font(None, 22),
-            'small': pygame.font.Font(None, 18),
-            'tiny': pygame.font.Font(None, 14)
+            'title': get_font(36),
+            'large': get_font(28),
+            'medium': get_font(22),
+            'small': get_font(18),
+            'tiny': get_font(14)
         }
         
         # Estado del juego
         self.reset_game()
         
-        # Control
-        self.clock = pygame.time.Clock()
+        # Control: la serpiente avanza game_speed pasos por segundo y se
+        # dibuja al ritmo de la pantalla, interpolando entre pasos
         self.game_speed = 8
+        self.loop = FixedTimestep(tick_rate=self.game_speed, render_fps=configured_fps_limit())
+        # Governor: baja efectos si el tiempo de frame supera el presupuesto
+        self.governor = QualityGovernor(self.quality, self.loop.render_fps)
         self.animation_time = 0
         
         # Efectos
         self.food_pulse = 0
         self.score_display = 0
         
+        # Tiles de serpiente y comida pre-renderizados por tema
+        self.sprites = SpriteCache()
+        
+        # Capas: fondo, tablero y marco del HUD se hornean una vez por tema
+        self.compositor = Compositor((self.width, self.height))
+        self.compositor.add_layer("background", self.draw_background, static=True)
+        self.compositor.add_layer("entities", self.draw_entities)
+        self.compositor.add_layer("hud", self.draw_ui)
+        self.compositor.add_layer("overlay", self.draw_overlays)
+        
     def reset_game(self):
         """Reiniciar juego"""
         center_x = self.grid_width // 2
         center_y = self.grid_height // 2
         
         self.snake = [(center_x, center_y), (center_x - 1, center_y)]
+        self.previous_snake = list(self.snake)
         self.direction = (1, 0)
         self.next_direction = (1, 0)
         self.food = self.generate_food()
@@ -133,102 +171,113 @@ class SnakeModern:
     
     def play_sound(self, sound_type):
         """Sonidos modernos"""
-        try:
-            frequencies = {
-                'move': 800,
-                'eat': 1200,
-                'game_over': 300,
-                'pause': 600,
-                'theme': 1000
-            }
-            
-            freq = frequencies.get(sound_type, 800)
-            duration = 80 if sound_type != 'game_over' else 400
-            
-            sample_rate = 22050
-            frames = int(duration * sample_rate / 1000)
-            arr = []
-            
-            for i in range(frames):
-                t = float(i) / sample_rate
-                envelope = math.exp(-t * 6)
-                wave = math.sin(2 * math.pi * freq * t) * envelope * 0.08
-                arr.append([int(32767 * wave)] * 2)
-            
-            sound = pygame.sndarray.make_sound(pygame.array.array('h', arr))
-            sound.play()
-        except:
-            pass
+        self.tone_bank.play_effect("snake", sound_type)
     
     def toggle_theme(self):
         """Cambiar tema"""
         self.dark_mode = not self.dark_mode
         theme_name = 'dark' if self.dark_mode else 'light'
         self.colors = self.themes[theme_name].copy()
+        self.compositor.invalidate()
+        self.sprites.clear()
         self.play_sound('theme')
     
     def draw_modern_card(self, surface, rect, color, radius=12, shadow=True):
         """Dibujar card moderna"""
-        if shadow:
-            # Sombra
-            shadow_rect = pygame.Rect(rect.x + 4, rect.y + 4, rect.width, rect.height)
-            shadow_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(shadow_surface, self.colors['shadow'], 
-                           (0, 0, rect.width, rect.height), border_radius=radius)
-            surface.blit(shadow_surface, shadow_rect.topleft)
-        
-        # Card principal
-        pygame.draw.rect(surface, color, rect, border_radius=radius)
+        get_card_renderer().draw_card(surface, rect, color, radius=radius,
+                                      shadow_color=self.colors['shadow'] if shadow and self.quality['shadows'] else None)
     
-    def draw_background(self):
-        """Dibujar fondo moderno"""
-        self.screen.fill(self.colors['bg_primary'])
+    def draw_background(self, surface):
+        """Dibujar fondo, tablero y marco del HUD (capa estática)"""
+        surface.fill(self.colors['bg_primary'])
         
         # Área de juego
         game_rect = pygame.Rect(self.padding, self.padding, 
                                self.game_width, self.game_height)
         
-        self.draw_modern_card(self.screen, game_rect, self.colors['bg_secondary'])
+        self.draw_modern_card(surface, game_rect, self.colors['bg_secondary'])
         
         # Grid sutil
-        for x in range(0, self.grid_width + 1):
-            start_x = self.padding + x * self.cell_size
-            pygame.draw.line(self.screen, self.colors['grid'],
-                           (start_x, self.padding),
-                           (start_x, self.padding + self.game_height), 1)
-        
-        for y in range(0, self.grid_height + 1):
-            start_y = self.padding + y * self.cell_size
-            pygame.draw.line(self.screen, self.colors['grid'],
-                           (self.padding, start_y),
-                           (self.padding + self.game_width, start_y), 1)
+        if self.quality['background_grid']:
+            for x in range(0, self.grid_width + 1):
+                start_x = self.padding + x * self.cell_size
+                pygame.draw.line(surface, self.colors['grid'],
+                               (start_x, self.padding),
+                               (start_x, self.padding + self.game_height), 1)
+            
+            for y in range(0, self.grid_height + 1):
+                start_y = self.padding + y * self.cell_size
+                pygame.draw.line(surface, self.colors['grid'],
+                               (self.padding, start_y),
+                               (self.padding + self.game_width, start_y), 1)
+        
+        # Card de estadísticas
+        ui_rect = pygame.Rect(self.padding, self.padding + self.game_height + 20, self.game_width, 60)
+        self.draw_modern_card(surface, ui_rect, self.colors['bg_secondary'])
+        
+        # Controles (derecha)
+        controls = [
+            "ARROWS: Move",
+            "SPACE: Pause",
+            f"T: Theme ({'Dark' if self.dark_mode else 'Light'})",
+            "ESC: Exit"
+        ]
+        
+        control_x = ui_rect.right - 200
+        for i, control in enumerate(controls):
+            control_text = render_text(self.fonts['tiny'], control, True, self.colors['text_secondary'])
+            surface.blit(control_text, (control_x, ui_rect.y + 5 + i * 12))
+    
+    def draw_entities(self):
+        """Dibujar serpiente y comida (capa dinámica)"""
+        self.draw_snake()
+        self.draw_food()
+    
+    def head_sprite(self):
+        """Tile de la cabeza con highlight"""
+        theme = 'dark' if self.dark_mode else 'light'
+        cell_size = self.cell_size - 4
+        color = self.colors['snake_head']
+        
+        def paint(surface):
+            pygame.draw.rect(surface, color, (0, 0, cell_size, cell_size), border_radius=8)
+            
+            # Highlight en la cabeza
+            highlight_color = tuple(min(255, c + 40) for c in color)
+            pygame.draw.rect(surface, highlight_color, (2, 2, cell_size - 4, cell_size // 3),
+                             border_radius=6)
+        
+        return self.sprites.get(('head', theme, cell_size), (cell_size, cell_size), paint)
+    
+    def body_sprite(self, level):
+        """Tile de un segmento del cuerpo para un nivel de degradado"""
+        theme = 'dark' if self.dark_mode else 'light'
+        cell_size = self.cell_size - 4
+        fade_factor = 1.0 - (level / FADE_LEVELS) * 0.3
+        faded_color = tuple(int(c * fade_factor) for c in self.colors['snake_body'])
+        
+        return self.sprites.get(('body', level, theme, cell_size), (cell_size, cell_size),
+                                lambda surface: pygame.draw.rect(surface, faded_color,
+                                                                 (0, 0, cell_size, cell_size),
+                                                                 border_radius=6))
     
     def draw_snake(self):
         """Dibujar serpiente moderna"""
+        length = len(self.snake)
+        alpha = self.loop.alpha
+        previous = self.previous_snake
         for i, (x, y) in enumerate(self.snake):
-            cell_x = self.padding + x * self.cell_size + 2
-            cell_y = self.padding + y * self.cell_size + 2
-            cell_size = self.cell_size - 4
-            
-            rect = pygame.Rect(cell_x, cell_y, cell_size, cell_size)
+            # Cada segmento se desliza desde su celda del paso anterior
+            previous_x, previous_y = previous[i] if i < len(previous) else (x, y)
+            cell_x = int(self.padding + lerp(previous_x, x, alpha) * self.cell_size + 2)
+            cell_y = int(self.padding + lerp(previous_y, y, alpha) * self.cell_size + 2)
             
             if i == 0:  # Cabeza
-                color = self.colors['snake_head']
-                pygame.draw.rect(self.screen, color, rect, border_radius=8)
-                
-                # Highlight en la cabeza
-                highlight_rect = pygame.Rect(cell_x + 2, cell_y + 2, 
-                                           cell_size - 4, cell_size // 3)
-                highlight_color = tuple(min(255, c + 40) for c in color)
-                pygame.draw.rect(self.screen, highlight_color, highlight_rect, border_radius=6)
-                
-            else:  # Cuerpo
-                # Efecto de degradado en el cuerpo
-                fade_factor = 1.0 - (i / len(self.snake)) * 0.3
-                color = self.colors['snake_body']
-                faded_color = tuple(int(c * fade_factor) for c in color)
-                
-                pygame.draw.rect(self.screen, faded_color, rect, border_radius=6)
+                sprite = self.head_sprite()
+            else:  # Cuerpo con degradado cuantizado
+                sprite = self.body_sprite(round(i / length * FADE_LEVELS))
+            
+            self.screen.blit(sprite, (cell_x, cell_y))
     
     def draw_food(self):
         """Dibujar comida con efecto pulso"""
@@ -236,87 +285,77 @@ class SnakeModern:
         cell_x = self.padding + x * self.cell_size + 3
         cell_y = self.padding + y * self.cell_size + 3
         
-        # Efecto pulso
-        pulse = 1.0 + 0.2 * math.sin(self.food_pulse * 0.2)
+        # Efecto pulso: solo hay unos pocos tamaños posibles, uno por sprite
+        if self.quality['pulse_animations']:
+            pulse = 1.0 + 0.2 * math.sin((self.food_pulse + self.loop.alpha) * 0.2)
+        else:
+            pulse = 1.0
         size = int((self.cell_size - 6) * pulse)
         
-        food_rect = pygame.Rect(
-            cell_x + (self.cell_size - 6 - size) // 2,
-            cell_y + (self.cell_size - 6 - size) // 2,
-            size, size
-        )
-        
-        # Sombra de la comida
-        shadow_rect = pygame.Rect(food_rect.x + 2, food_rect.y + 2, 
-                                 food_rect.width, food_rect.height)
-        shadow_surface = pygame.Surface((food_rect.width, food_rect.height), pygame.SRCALPHA)
-        pygame.draw.ellipse(shadow_surface, self.colors['shadow'], 
-                          (0, 0, food_rect.width, food_rect.height))
-        self.screen.blit(shadow_surface, shadow_rect.topleft)
-        
-        # Comida principal
-        pygame.draw.ellipse(self.screen, self.colors['food'], food_rect)
-        
-        # Highlight
-        highlight_size = size // 3
-        highlight_rect = pygame.Rect(
-            food_rect.x + size // 4,
-            food_rect.y + size // 4,
-            highlight_size, highlight_size
-        )
-        highlight_color = tuple(min(255, c + 60) for c in self.colors['food'])
-        pygame.draw.ellipse(self.screen, highlight_color, highlight_rect)
+        food_x = cell_x + (self.cell_size - 6 - size) // 2
+        food_y = cell_y + (self.cell_size - 6 - size) // 2
+        self.screen.blit(self.food_sprite(size), (food_x, food_y))
+    
+    def food_sprite(self, size):
+        """Tile de la comida (con sombra y highlight) para un tamaño del pulso"""
+        theme = 'dark' if self.dark_mode else 'light'
+        
+        def paint(surface):
+            # Sombra de la comida
+            if self.quality['shadows']:
+                pygame.draw.ellipse(surface, self.colors['shadow'], (2, 2, size, size))
+            
+            # Comida principal
+            pygame.draw.ellipse(surface, self.colors['food'], (0, 0, size, size))
+            
+            # Highlight
+            highlight_size = size // 3
+            highlight_color = tuple(min(255, c + 60) for c in self.colors['food'])
+            pygame.draw.ellipse(surface, highlight_color,
+                                (size // 4, size // 4, highlight_size, highlight_size))
+        
+        return self.sprites.get(('food', theme, size, self.quality['shadows']), (size + 2, size + 2), paint)
     
     def draw_ui(self):
-        """Dibujar UI moderna"""
+        """Dibujar estadísticas (la card y los controles están en la base)"""
         ui_y = self.padding + self.game_height + 20
-        
-        # Card de estadísticas
         ui_rect = pygame.Rect(self.padding, ui_y, self.game_width, 60)
-        self.draw_modern_card(self.screen, ui_rect, self.colors['bg_secondary'])
-        
-        # Score animado
-        target_score = self.score
-        if self.score_display < target_score:
-            self.score_display = min(target_score, self.score_display + 1)
         
-        # Información del juego
-        score_text = self.fonts['large'].render(f"SCORE: {self.score_display:04d}", 
+        # Información del juego (score_display sube en fixed_update)
+        score_text = render_text(self.fonts['large'], f"SCORE: {self.score_display:04d}", 
                                                True, self.colors['accent'])
         self.screen.blit(score_text, (ui_rect.x + 20, ui_rect.y + 10))
         
-        high_text = self.fonts['medium'].render(f"HIGH: {self.high_score:04d}", 
+        high_text = render_text(self.fonts['medium'], f"HIGH: {self.high_score:04d}", 
                                               True, self.colors['text_secondary'])
         self.screen.blit(high_text, (ui_rect.x + 20, ui_rect.y + 35))
         
         # Estadísticas de juego
-        length_text = self.fonts['medium'].render(f"LENGTH: {len(self.snake)}", 
+        length_text = render_text(self.fonts['medium'], f"LENGTH: {len(self.snake)}", 
                                                 True, self.colors['text_secondary'])
         self.screen.blit(length_text, (ui_rect.x + 200, ui_rect.y + 10))
         
-        speed_text = self.fonts['medium'].render(f"SPEED: {self.game_speed}", 
+        speed_text = render_text(self.fonts['medium'], f"SPEED: {self.game_speed}", 
                                                True, self.colors['text_secondary'])
         self.screen.blit(speed_text, (ui_rect.x + 200, ui_rect.y + 35))
-        
-        # Controles (derecha)
-        controls = [
-            "ARROWS: Move",
-            "SPACE: Pause",
-            f"T: Theme ({'Dark' if self.dark_mode else 'Light'})",
-            "ESC: Exit"
-        ]
-        
-        control_x = ui_rect.right - 200
-        for i, control in enumerate(controls):
-            control_text = self.fonts['tiny'].render(control, True, self.colors['text_secondary'])
-            self.screen.blit(control_text, (control_x, ui_rect.y + 5 + i * 12))
+    
+    def draw_overlays(self):
+        """Dibujar game over o pausa (capa de overlay)"""
+        if self.game_over:
+            if self.score == self.high_score and self.score > 0:
+                self.draw_overlay("GAME OVER", f"NEW HIGH SCORE: {self.score}!", 
+                                "PRESS SPACE TO PLAY AGAIN")
+            else:
+                self.draw_overlay("GAME OVER", f"Final Score: {self.score}", 
+                                "PRESS SPACE TO PLAY AGAIN")
+        elif self.paused:
+            self.draw_overlay("PAUSED", "Game is on hold", 
+                            "PRESS SPACE TO RESUME")
     
     def draw_overlay(self, title, subtitle="", action=""):
         """Overlay modal moderno"""
         # Fondo semi-transparente
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
+        get_card_renderer().draw_veil(self.screen, (0, 0, 0, 150))
         
         # Modal card
         modal_width = 400
@@ -329,12 +368,12 @@ class SnakeModern:
                              radius=16, shadow=True)
         
         # Contenido del modal
-        title_text = self.fonts['title'].render(title, True, self.colors['text_primary'])
+        title_text = render_text(self.fonts['title'], title, True, self.colors['text_primary'])
         title_x = modal_x + (modal_width - title_text.get_width()) // 2
         self.screen.blit(title_text, (title_x, modal_y + 40))
         
         if subtitle:
-            sub_text = self.fonts['medium'].render(subtitle, True, self.colors['text_secondary'])
+            sub_text = render_text(self.fonts['medium'], subtitle, True, self.colors['text_secondary'])
             sub_x = modal_x + (modal_width - sub_text.get_width()) // 2
             self.screen.blit(sub_text, (sub_x, modal_y + 80))
         
@@ -343,7 +382,7 @@ class SnakeModern:
             pulse = 0.8 + 0.2 * math.sin(self.animation_time * 0.1)
             action_color = tuple(int(c * pulse) for c in self.colors['accent'])
             
-            action_text = self.fonts['large'].render(action, True, action_color)
+            action_text = render_text(self.fonts['large'], action, True, action_color)
             action_x = modal_x + (modal_width - action_text.get_width()) // 2
             self.screen.blit(action_text, (action_x, modal_y + 130))
     
@@ -431,6 +470,19 @@ class SnakeModern:
             # Quitar cola si no comió
             self.snake.pop()
     
+    def fixed_update(self):
+        """Un paso de simulación (una celda)"""
+        self.previous_snake = list(self.snake)
+        self.update_game()
+        
+        # Las animaciones avanzan con los pasos, como antes con cada frame
+        self.animation_time += 1
+        self.food_pulse += 1
+        
+        # Score animado: sube de uno en uno hasta el real
+        if self.score_display < self.score:
+            self.score_display = min(self.score, self.score_display + 1)
+    
     def run(self):
         """Loop principal"""
         running = True
@@ -439,34 +491,23 @@ class SnakeModern:
             # Eventos
             running = self.handle_events()
             
-            # Lógica
-            self.update_game()
+            # Lógica: los pasos fijos que correspondan al tiempo transcurrido
+            self.loop.set_tick_rate(self.game_speed)
+            for _ in range(self.loop.advance()):
+                self.fixed_update()
             
-            # Render
-            self.draw_background()
-            self.draw_snake()
-            self.draw_food()
-            self.draw_ui()
-            
-            # Overlays
-            if self.game_over:
-                if self.score == self.high_score and self.score > 0:
-                    self.draw_overlay("GAME OVER", f"NEW HIGH SCORE: {self.score}!", 
-                                    "PRESS SPACE TO PLAY AGAIN")
-                else:
-                    self.draw_overlay("GAME OVER", f"Final Score: {self.score}", 
-                                    "PRESS SPACE TO PLAY AGAIN")
-            elif self.paused:
-                self.draw_overlay("PAUSED", "Game is on hold", 
-                                "PRESS SPACE TO RESUME")
-            
-            # Actualizar animaciones
-            self.animation_time += 1
-            self.food_pulse += 1
+            # Render: base cacheada + capas dinámicas
+            self.compositor.render(self.screen)
             
             pygame.display.flip()
-            self.clock.tick(self.game_speed)
+            self.loop.wait()
+            
+            # Governor: ajustar los efectos al tiempo de frame real
+            if self.governor.record(self.loop.clock.get_rawtime()):
+                self.compositor.invalidate()  # Las capas horneadas llevan sombras
         
+        if self.music:
+            self.music.stop()
         pygame.quit()
         sys.exit()
 
@@ -9,11 +9,32 @@ import random
 import sys
 import time
 import math
+from pathlib import Path
+
+# Permitir importar los módulos del sistema al ejecutarse como script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.audio_device import init_pygame, load_saved_config
+from core.sound_manager import get_tone_bank, apply_volume_levels, play_song
+from core.compositor import Compositor
+from core.card_renderer import get_card_renderer
+from core.text_cache import render_text
+from core.bitmap_font import get_font
+from core.game_loop import FixedTimestep
+from core.quality import get_quality, configured_fps_limit, QualityGovernor
+from core.sprite_cache import SpriteCache
 
 class TetrisModern:
     def __init__(self):
-        pygame.init()
-        pygame.mixer.init()
+        # El mixer se abre en segundo plano; el primer sonido lo espera
+        init_pygame()
+        self.tone_bank = get_tone_bank()
+        self.tone_bank.load_sets(["tetris"])
+        apply_volume_levels(load_saved_config())
+        # Calidad de efectos según el performance_mode elegido en Settings
+        self.quality = get_quality()
+        # Música del juego generada por el secuenciador (sin archivos)
+        self.music = play_song("tetris")
         
         # Configuración moderna
         self.cell_size = 30
@@ -78,11 +99,11 @@ class TetrisModern:
         
         # Fuentes modernas
         self.fonts = {
-            'title': pygame.font.Font(None, 42),
-            'large': pygame.font.Font(None, 32),
-            'medium': pygame.font.Font(None, 24),
-            'small': pygame.font.Font(None, 18),
-            'tiny': pygame.font.Font(None, 14)
+            'title': get_font(42),
+            'large': get_font(32),
+            'medium': get_font(24),
+            'small': get_font(18),
+            'tiny': get_font(14)
         }
         
         # Definir tetrominos
@@ -184,18 +205,32 @@ class TetrisModern:
                    '###..']]
         }
         
-        # Control del juego
-        self.clock = pygame.time.Clock()
-        self.fall_time = 0
+        # Control del juego: simulación a paso fijo, render al ritmo de la pantalla
+        self.loop = FixedTimestep(render_fps=configured_fps_limit())
+        # Governor: baja efectos si el tiempo de frame supera el presupuesto
+        self.governor = QualityGovernor(self.quality, self.loop.render_fps)
+        self.fall_time = 0  # ms simulados desde la última caída
         self.fall_speed = 500
         self.animation_time = 0
         
+        # Tiles de celdas pre-renderizados por pieza y tema
+        self.sprites = SpriteCache()
+        
+        # Capas: fondo y tablero se hornean una vez por tema
+        self.compositor = Compositor((self.width, self.height))
+        self.compositor.add_layer("background", self.draw_background, static=True)
+        self.compositor.add_layer("board", self.draw_board_frame, static=True)
+        self.compositor.add_layer("entities", self.draw_pieces)
+        self.compositor.add_layer("hud", self.draw_sidebar)
+        self.compositor.add_layer("overlay", self.draw_overlays)
+        
         # Estado del juego
         self.reset_game()
         
     def reset_game(self):
         """Reiniciar juego"""
         self.grid = [[None for _ in range(self.grid_width)] for _ in range(self.grid_height)]
+        self.rebuild_board_surface()
         
         self.current_piece = self.get_new_piece()
         self.piece_x = self.grid_width // 2 - 2
@@ -244,51 +279,19 @@ class TetrisModern:
         self.dark_mode = not self.dark_mode
         theme_name = 'dark' if self.dark_mode else 'light'
         self.colors = self.themes[theme_name].copy()
+        self.compositor.invalidate()
+        self.sprites.clear()
+        self.rebuild_board_surface()
         self.play_sound('theme')
     
     def play_sound(self, sound_type):
         """Sonidos modernos"""
-        try:
-            frequencies = {
-                'move': 800,
-                'rotate': 1000,
-                'drop': 600,
-                'line_clear': 1200,
-                'tetris': 1500,
-                'game_over': 300,
-                'theme': 900
-            }
-            
-            freq = frequencies.get(sound_type, 800)
-            duration = 100 if sound_type != 'game_over' else 500
-            
-            sample_rate = 22050
-            frames = int(duration * sample_rate / 1000)
-            arr = []
-            
-            for i in range(frames):
-                t = float(i) / sample_rate
-                envelope = math.exp(-t * 6)
-                wave = math.sin(2 * math.pi * freq * t) * envelope * 0.08
-                arr.append([int(32767 * wave)] * 2)
-            
-            sound = pygame.sndarray.make_sound(pygame.array.array('h', arr))
-            sound.play()
-        except:
-            pass
+        self.tone_bank.play_effect("tetris", sound_type)
     
     def draw_modern_card(self, surface, rect, color, radius=12, shadow=True):
         """Dibujar card moderna"""
-        if shadow:
-            # Sombra
-            shadow_rect = pygame.Rect(rect.x + 4, rect.y + 4, rect.width, rect.height)
-            shadow_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(shadow_surface, self.colors['shadow'], 
-                           (0, 0, rect.width, rect.height), border_radius=radius)
-            surface.blit(shadow_surface, shadow_rect.topleft)
-        
-        # Card principal
-        pygame.draw.rect(surface, color, rect, border_radius=radius)
+        get_card_renderer().draw_card(surface, rect, color, radius=radius,
+                                      shadow_color=self.colors['shadow'] if shadow and self.quality['shadows'] else None)
     
     def is_valid_position(self, piece, x, y, rotation):
         """Verificar si la posición es válida"""
@@ -320,6 +323,7 @@ class TetrisModern:
                     y = self.piece_y + row_i
                     if y >= 0:
                         self.grid[y][x] = self.current_piece
+                        self.paint_board_cell(x, y, self.current_piece)
         
         # Verificar líneas completas
         lines_to_clear = []
@@ -348,9 +352,11 @@ class TetrisModern:
     
     def clear_lines(self, lines):
         """Limpiar líneas completas"""
-        for line in sorted(lines, reverse=True):
+        # De arriba abajo: bajar lo de encima no mueve las líneas pendientes
+        for line in sorted(lines):
             del self.grid[line]
             self.grid.insert(0, [None for _ in range(self.grid_width)])
+            self.shift_board_surface(line)
         
         lines_count = len(lines)
         points = {1: 100, 2: 300, 3: 500, 4: 800}
@@ -419,64 +425,138 @@ class TetrisModern:
         if self.game_over or self.paused:
             return
         
-        current_time = pygame.time.get_ticks()
-        if current_time - self.fall_time > self.fall_speed:
+        # La caída se mide en tiempo simulado, no en tiempo de reloj
+        self.fall_time += self.loop.step * 1000
+        if self.fall_time > self.fall_speed:
             if self.is_valid_position(self.current_piece, self.piece_x, 
                                        self.piece_y + 1, self.piece_rotation):
                 self.piece_y += 1
             else:
                 self.place_piece()
             
-            self.fall_time = current_time
+            self.fall_time = 0
         
         self.animation_time += 1
     
-    def draw_background(self):
-        """Dibujar fondo moderno"""
-        self.screen.fill(self.colors['bg_primary'])
+    def draw_background(self, surface):
+        """Dibujar fondo moderno y marcos de la barra lateral (capa estática)"""
+        surface.fill(self.colors['bg_primary'])
+        sidebar_x = self.game_width + 40
+        
+        # Título
+        title_text = render_text(self.fonts['title'], "TETRIS", True, self.colors['text_primary'])
+        surface.blit(title_text, (sidebar_x, 30))
+        
+        # Next piece card
+        next_card = pygame.Rect(sidebar_x, 80, 200, 120)
+        self.draw_modern_card(surface, next_card, self.colors['bg_secondary'])
+        
+        next_text = render_text(self.fonts['medium'], "NEXT", True, self.colors['text_secondary'])
+        surface.blit(next_text, (sidebar_x + 15, 95))
         
-        # Área de juego
+        # Stats card
+        stats_card = pygame.Rect(sidebar_x, 220, 200, 200)
+        self.draw_modern_card(surface, stats_card, self.colors['bg_secondary'])
+        
+        for i, label in enumerate(("SCORE", "LINES", "LEVEL", "HIGH")):
+            label_text = render_text(self.fonts['tiny'], label, True, self.colors['text_secondary'])
+            surface.blit(label_text, (sidebar_x + 15, 240 + i * 40))
+        
+        # Controls card
+        controls_card = pygame.Rect(sidebar_x, 440, 200, 160)
+        self.draw_modern_card(surface, controls_card, self.colors['bg_secondary'])
+        
+        controls_y = 460
+        controls = [
+            "← → Move",
+            "↓ Soft drop", 
+            "↑ Rotate",
+            "Space Pause",
+            f"T Theme ({'Dark' if self.dark_mode else 'Light'})",
+            "Esc Exit"
+        ]
+        
+        for i, control in enumerate(controls):
+            text = render_text(self.fonts['tiny'], control, True, self.colors['text_secondary'])
+            surface.blit(text, (sidebar_x + 15, controls_y + i * 18))
+    
+    def draw_board_frame(self, surface):
+        """Dibujar card y grid del área de juego (capa estática)"""
         game_rect = pygame.Rect(20, 20, self.grid_width * self.cell_size, 
                                self.grid_height * self.cell_size)
         
-        self.draw_modern_card(self.screen, game_rect, self.colors['bg_secondary'])
+        self.draw_modern_card(surface, game_rect, self.colors['bg_secondary'])
         
         # Grid
-        for x in range(0, self.grid_width + 1):
-            start_x = game_rect.x + x * self.cell_size
-            pygame.draw.line(self.screen, self.colors['grid'],
-                           (start_x, game_rect.y),
-                           (start_x, game_rect.bottom), 1)
-        
-        for y in range(0, self.grid_height + 1):
-            start_y = game_rect.y + y * self.cell_size
-            pygame.draw.line(self.screen, self.colors['grid'],
-                           (game_rect.x, start_y),
-                           (game_rect.right, start_y), 1)
+        if self.quality['background_grid']:
+            for x in range(0, self.grid_width + 1):
+                start_x = game_rect.x + x * self.cell_size
+                pygame.draw.line(surface, self.colors['grid'],
+                               (start_x, game_rect.y),
+                               (start_x, game_rect.bottom), 1)
+            
+            for y in range(0, self.grid_height + 1):
+                start_y = game_rect.y + y * self.cell_size
+                pygame.draw.line(surface, self.colors['grid'],
+                               (game_rect.x, start_y),
+                               (game_rect.right, start_y), 1)
+    
+    def draw_pieces(self):
+        """Dibujar piezas colocadas y pieza actual (capa dinámica)"""
+        self.draw_placed_pieces()
+        self.draw_current_piece()
+    
+    def rebuild_board_surface(self):
+        """Repintar entera la pila asentada (al reiniciar o cambiar de tema)"""
+        size = (self.grid_width * self.cell_size, self.grid_height * self.cell_size)
+        self.board_surface = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        self.board_surface.fill((0, 0, 0, 0))
+        
+        for y, row in enumerate(self.grid):
+            for x, piece in enumerate(row):
+                if piece is not None:
+                    self.paint_board_cell(x, y, piece)
+    
+    def cell_sprite(self, piece, role):
+        """Tile de una celda: 'placed' (asentada), 'falling' o 'mini' (vista previa)"""
+        theme = 'dark' if self.dark_mode else 'light'
+        color = self.colors[piece]
+        
+        if role == 'mini':
+            return self.sprites.get((role, piece, theme, 14), (14, 14),
+                                    lambda surface: pygame.draw.rect(surface, color, (0, 0, 14, 14),
+                                                                     border_radius=3))
+        
+        cell_size = self.cell_size - 4
+        boost = 30 if role == 'placed' else 40
+        
+        def paint(surface):
+            # Celda con bordes redondeados y highlight superior
+            pygame.draw.rect(surface, color, (0, 0, cell_size, cell_size), border_radius=6)
+            highlight_color = tuple(min(255, c + boost) for c in color)
+            pygame.draw.rect(surface, highlight_color, (0, 0, cell_size, cell_size // 3),
+                             border_radius=6)
+        
+        return self.sprites.get((role, piece, theme, cell_size), (cell_size, cell_size), paint)
+    
+    def paint_board_cell(self, x, y, piece):
+        """Pintar una celda asentada en la superficie del tablero"""
+        self.board_surface.blit(self.cell_sprite(piece, 'placed'),
+                                (x * self.cell_size + 2, y * self.cell_size + 2))
+    
+    def shift_board_surface(self, line):
+        """Bajar una fila todo lo que hay encima de una línea eliminada"""
+        width = self.grid_width * self.cell_size
+        
+        # scroll() respeta el clip: solo se desplazan las filas 0..line
+        self.board_surface.set_clip(pygame.Rect(0, 0, width, (line + 1) * self.cell_size))
+        self.board_surface.scroll(0, self.cell_size)
+        self.board_surface.set_clip(None)
+        self.board_surface.fill((0, 0, 0, 0), pygame.Rect(0, 0, width, self.cell_size))
     
     def draw_placed_pieces(self):
-        """Dibujar piezas colocadas"""
-        game_rect = pygame.Rect(20, 20, self.grid_width * self.cell_size, 
-                               self.grid_height * self.cell_size)
-        
-        for y in range(self.grid_height):
-            for x in range(self.grid_width):
-                if self.grid[y][x] is not None:
-                    color = self.colors[self.grid[y][x]]
-                    
-                    cell_x = game_rect.x + x * self.cell_size + 2
-                    cell_y = game_rect.y + y * self.cell_size + 2
-                    cell_size = self.cell_size - 4
-                    
-                    cell_rect = pygame.Rect(cell_x, cell_y, cell_size, cell_size)
-                    
-                    # Celda con bordes redondeados
-                    pygame.draw.rect(self.screen, color, cell_rect, border_radius=6)
-                    
-                    # Highlight superior
-                    highlight_rect = pygame.Rect(cell_x, cell_y, cell_size, cell_size // 3)
-                    highlight_color = tuple(min(255, c + 30) for c in color)
-                    pygame.draw.rect(self.screen, highlight_color, highlight_rect, border_radius=6)
+        """Dibujar piezas colocadas: un único blit de la pila asentada"""
+        self.screen.blit(self.board_surface, (20, 20))
     
     def draw_current_piece(self):
         """Dibujar pieza actual"""
@@ -486,7 +566,7 @@ class TetrisModern:
         game_rect = pygame.Rect(20, 20, self.grid_width * self.cell_size, 
                                self.grid_height * self.cell_size)
         shape = self.get_piece_shape(self.current_piece, self.piece_rotation)
-        color = self.colors[self.current_piece]
+        sprite = self.cell_sprite(self.current_piece, 'falling')
         
         for row_i, row in enumerate(shape):
             for col_i, cell in enumerate(row):
@@ -497,36 +577,15 @@ class TetrisModern:
                     if 0 <= x < self.grid_width and y >= 0:
                         cell_x = game_rect.x + x * self.cell_size + 2
                         cell_y = game_rect.y + y * self.cell_size + 2
-                        cell_size = self.cell_size - 4
-                        
-                        cell_rect = pygame.Rect(cell_x, cell_y, cell_size, cell_size)
-                        
-                        # Celda principal
-                        pygame.draw.rect(self.screen, color, cell_rect, border_radius=6)
-                        
-                        # Highlight
-                        highlight_rect = pygame.Rect(cell_x, cell_y, cell_size, cell_size // 3)
-                        highlight_color = tuple(min(255, c + 40) for c in color)
-                        pygame.draw.rect(self.screen, highlight_color, highlight_rect, border_radius=6)
+                        self.screen.blit(sprite, (cell_x, cell_y))
     
     def draw_sidebar(self):
-        """Dibujar barra lateral moderna"""
+        """Dibujar valores de la barra lateral (los marcos están en la base)"""
         sidebar_x = self.game_width + 40
         
-        # Título
-        title_text = self.fonts['title'].render("TETRIS", True, self.colors['text_primary'])
-        self.screen.blit(title_text, (sidebar_x, 30))
-        
-        # Next piece card
-        next_card = pygame.Rect(sidebar_x, 80, 200, 120)
-        self.draw_modern_card(self.screen, next_card, self.colors['bg_secondary'])
-        
-        next_text = self.fonts['medium'].render("NEXT", True, self.colors['text_secondary'])
-        self.screen.blit(next_text, (sidebar_x + 15, 95))
-        
         # Dibujar next piece
         shape = self.get_piece_shape(self.next_piece, 0)
-        color = self.colors[self.next_piece]
+        sprite = self.cell_sprite(self.next_piece, 'mini')
         
         start_x = sidebar_x + 100 - (len(shape[0]) * 8)
         start_y = 130
@@ -537,52 +596,34 @@ class TetrisModern:
                     x = start_x + col_i * 16
                     y = start_y + row_i * 16
                     
-                    mini_rect = pygame.Rect(x, y, 14, 14)
-                    pygame.draw.rect(self.screen, color, mini_rect, border_radius=3)
-        
-        # Stats card
-        stats_card = pygame.Rect(sidebar_x, 220, 200, 200)
-        self.draw_modern_card(self.screen, stats_card, self.colors['bg_secondary'])
+                    self.screen.blit(sprite, (x, y))
         
         # Estadísticas
         stats_y = 240
         stats = [
-            ("SCORE", f"{self.score:,}", self.colors['accent']),
-            ("LINES", str(self.lines_cleared), self.colors['success']),
-            ("LEVEL", str(self.level), self.colors['warning']),
-            ("HIGH", f"{self.high_score:,}", self.colors['text_primary'])
+            (f"{self.score:,}", self.colors['accent']),
+            (str(self.lines_cleared), self.colors['success']),
+            (str(self.level), self.colors['warning']),
+            (f"{self.high_score:,}", self.colors['text_primary'])
         ]
         
-        for i, (label, value, color) in enumerate(stats):
-            label_text = self.fonts['tiny'].render(label, True, self.colors['text_secondary'])
-            value_text = self.fonts['medium'].render(value, True, color)
-            
-            self.screen.blit(label_text, (sidebar_x + 15, stats_y + i * 40))
+        for i, (value, color) in enumerate(stats):
+            value_text = render_text(self.fonts['medium'], value, True, color)
             self.screen.blit(value_text, (sidebar_x + 15, stats_y + i * 40 + 15))
-        
-        # Controls card
-        controls_card = pygame.Rect(sidebar_x, 440, 200, 160)
-        self.draw_modern_card(self.screen, controls_card, self.colors['bg_secondary'])
-        
-        controls_y = 460
-        controls = [
-            "← → Move",
-            "↓ Soft drop", 
-            "↑ Rotate",
-            "Space Pause",
-            f"T Theme ({'Dark' if self.dark_mode else 'Light'})",
-            "Esc Exit"
-        ]
-        
-        for i, control in enumerate(controls):
-            text = self.fonts['tiny'].render(control, True, self.colors['text_secondary'])
-            self.screen.blit(text, (sidebar_x + 15, controls_y + i * 18))
+    
+    def draw_overlays(self):
+        """Dibujar pausa o game over (capa de overlay)"""
+        if self.paused and not self.game_over:
+            self.draw_overlay("PAUSED", "Game is on hold", "Press SPACE to resume")
+        elif self.game_over:
+            if self.score == self.high_score and self.score > 0:
+                self.draw_overlay("GAME OVER", f"NEW HIGH SCORE: {self.score}!", "Press SPACE to restart")
+            else:
+                self.draw_overlay("GAME OVER", f"Score: {self.score}", "Press SPACE to restart")
     
     def draw_overlay(self, title, subtitle="", action_text=""):
         """Overlay modal moderno"""
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
+        get_card_renderer().draw_veil(self.screen, (0, 0, 0, 150))
         
         # Modal card
         card_width = 400
@@ -595,13 +636,13 @@ class TetrisModern:
                              radius=16, shadow=True)
         
         # Título
-        title_text = self.fonts['title'].render(title, True, self.colors['text_primary'])
+        title_text = render_text(self.fonts['title'], title, True, self.colors['text_primary'])
         title_x = card_x + (card_width - title_text.get_width()) // 2
         self.screen.blit(title_text, (title_x, card_y + 40))
         
         # Subtítulo
         if subtitle:
-            subtitle_text = self.fonts['medium'].render(subtitle, True, self.colors['text_secondary'])
+            subtitle_text = render_text(self.fonts['medium'], subtitle, True, self.colors['text_secondary'])
             subtitle_x = card_x + (card_width - subtitle_text.get_width()) // 2
             self.screen.blit(subtitle_text, (subtitle_x, card_y + 85))
             
@@ -612,7 +653,7 @@ class TetrisModern:
             action_color = tuple(int(c * pulse) for c in self.colors['accent'])
             
             action_font = self.fonts['large'] if not subtitle else self.fonts['medium']
-            action_text_render = action_font.render(action_text, True, action_color)
+            action_text_render = render_text(action_font, action_text, True, action_color)
             action_x = card_x + (card_width - action_text_render.get_width()) // 2
             action_y = card_y + (130 if not subtitle else 150)
             self.screen.blit(action_text_render, (action_x, action_y))
@@ -625,27 +666,22 @@ class TetrisModern:
             # Eventos
             running = self.handle_events()
             
-            # Lógica
-            self.update_game()
+            # Lógica: los pasos fijos que correspondan al tiempo transcurrido
+            for _ in range(self.loop.advance()):
+                self.update_game()
             
-            # Render
-            self.draw_background()
-            self.draw_placed_pieces()
-            self.draw_current_piece()
-            self.draw_sidebar()
-            
-            # Overlays
-            if self.paused and not self.game_over:
-                self.draw_overlay("PAUSED", "Game is on hold", "Press SPACE to resume")
-            elif self.game_over:
-                if self.score == self.high_score and self.score > 0:
-                    self.draw_overlay("GAME OVER", f"NEW HIGH SCORE: {self.score}!", "Press SPACE to restart")
-                else:
-                    self.draw_overlay("GAME OVER", f"Score: {self.score}", "Press SPACE to restart")
+            # Render: base cacheada + capas dinámicas
+            self.compositor.render(self.screen)
 
             pygame.display.flip()
-            self.clock.tick(60)
+            self.loop.wait()
+            
+            # Governor: ajustar los efectos al tiempo de frame real
+            if self.governor.record(self.loop.clock.get_rawtime()):
+                self.compositor.invalidate()  # Las capas horneadas llevan sombras
         
+        if self.music:
+            self.music.stop()
         pygame.quit()
         sys.exit()
 
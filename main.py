@@ -13,6 +13,16 @@ import math
 from pathlib import Path
 
 # Importar módulos del sistema
+from core.audio_device import init_pygame, get_audio_device, buffer_ms
+from core.sound_manager import get_tone_bank, get_music_service, apply_volume_levels
+from core.card_renderer import get_card_renderer
+from core.text_cache import render_text, get_text_cache
+from core.bitmap_font import get_font
+from core.dirty_rects import DirtyRects
+from core.frame_scheduler import FrameScheduler
+from core.quality import game_environment
+from ui.widgets import WidgetTree, Panel, Label, Card
+
 try:
     from ui.game_launcher import GameLauncher
 except ImportError:
@@ -25,9 +35,11 @@ except ImportError:
     SettingsManager = None
     print("⚠️ Advertencia: ui.settings_manager no encontrado. Settings deshabilitado.")
 
-# Inicializar Pygame
-pygame.init()
-pygame.mixer.init()
+# Inicializar Pygame (el audio se abre en segundo plano)
+init_pygame()
+
+# Pantallas con árbol de widgets retenido: solo presentan lo que cambia
+RETAINED_STATES = ("main_menu", "settings", "system_info")
 
 class GamingModernOS:
     """
@@ -49,6 +61,8 @@ class GamingModernOS:
             "check_updates": True,
             "master_volume": 80,
             "music_volume": 60,
+            "effects_volume": 100,
+            "audio_latency": "balanced",
             "fps_limit": 60,
             "games_directory": "./games/",
             "last_played": []
@@ -64,6 +78,7 @@ class GamingModernOS:
         self.main_music_playing = False
         self.main_music_path = "assets/sounds/main/main.mp3"
         self.music_initialized = False
+        self.music = get_music_service()
         
         # Tema moderno - Colores flat y limpios
         self.colors = {
@@ -85,14 +100,14 @@ class GamingModernOS:
         
         # Fuentes modernas (Inter-style)
         self.fonts = {
-            "heading_xl": pygame.font.Font(None, 48),    # Títulos principales
-            "heading_lg": pygame.font.Font(None, 36),    # Títulos sección
-            "heading_md": pygame.font.Font(None, 28),    # Subtítulos
-            "body_lg": pygame.font.Font(None, 22),       # Texto normal grande
-            "body_md": pygame.font.Font(None, 18),       # Texto normal
-            "body_sm": pygame.font.Font(None, 16),       # Texto pequeño
-            "caption": pygame.font.Font(None, 14),       # Captions
-            "tiny": pygame.font.Font(None, 12)           # Texto muy pequeño
+            "heading_xl": get_font(48),    # Títulos principales
+            "heading_lg": get_font(36),    # Títulos sección
+            "heading_md": get_font(28),    # Subtítulos
+            "body_lg": get_font(22),       # Texto normal grande
+            "body_md": get_font(18),       # Texto normal
+            "body_sm": get_font(16),       # Texto pequeño
+            "caption": get_font(14),       # Captions
+            "tiny": get_font(12)           # Texto muy pequeño
         }
         
         # Estados del sistema
@@ -111,6 +126,10 @@ class GamingModernOS:
         
         # Control del juego
         self.clock = pygame.time.Clock()
+        self.dirty = DirtyRects(self.screen)
+        self.scheduler = FrameScheduler(self.clock)
+        self.live_stats = {"window": None, "text_cache": "", "idle_cpu": ""}
+        self.widget_trees = {}
         self.selected_option = 0
         self.animation_time = 0
         
@@ -119,7 +138,7 @@ class GamingModernOS:
         self.settings_manager = None
         
         if GameLauncher:
-            self.game_launcher = GameLauncher(self.screen, self.colors, self.fonts)
+            self.game_launcher = GameLauncher(self.screen, self.colors, self.fonts, self.config)
         else:
             self.games = self.scan_games_simple()
         
@@ -128,9 +147,12 @@ class GamingModernOS:
                 self.screen, self.colors, self.fonts, self.config,
                 save_callback=self.on_settings_saved
             )
+            self.settings_manager.dirty = self.dirty
         
-        # Inicializar música
+        # Inicializar música, efectos horneados y volúmenes
         self.initialize_music()
+        get_tone_bank().load_sets(["shell", "settings"])
+        self.update_music_volume()
         
         print(f"🎮 Gaming Modern OS iniciado")
         print(f"🎯 Game launcher: {'Advanced' if self.game_launcher else 'Simple'}")
@@ -148,6 +170,8 @@ class GamingModernOS:
             music_path = Path(self.main_music_path)
             if music_path.exists():
                 self.music_initialized = True
+                # Decodificar en segundo plano para no bloquear el arranque
+                self.music.preload("main", self.main_music_path)
                 print(f"✓ Música encontrada: {self.main_music_path}")
             else:
                 self.music_initialized = False
@@ -166,12 +190,10 @@ class GamingModernOS:
         try:
             if not self.main_music_playing:
                 # Configurar volumen según configuración
-                music_volume = self.config.get("music_volume", 60) / 100
-                pygame.mixer.music.set_volume(music_volume)
+                apply_volume_levels(self.config)
                 
-                # Cargar y reproducir música en bucle
-                pygame.mixer.music.load(self.main_music_path)
-                pygame.mixer.music.play(-1)  # -1 = bucle infinito
+                # Reanudar desde memoria (sin recargar el archivo)
+                self.music.play("main")
                 self.main_music_playing = True
                 print("🎵 Música principal iniciada")
                 
@@ -180,23 +202,51 @@ class GamingModernOS:
             self.music_initialized = False
     
     def stop_main_music(self):
-        """Detener música principal"""
+        """Pausar música principal conservando la posición"""
         try:
             if self.main_music_playing:
-                pygame.mixer.music.stop()
+                self.music.pause()
                 self.main_music_playing = False
-                print("🎵 Música principal detenida")
+                print("🎵 Música principal pausada")
         except Exception as e:
             print(f"❌ Error deteniendo música: {e}")
     
     def update_music_volume(self):
-        """Actualizar volumen de música según configuración"""
-        if self.main_music_playing:
-            try:
-                music_volume = self.config.get("music_volume", 60) / 100
-                pygame.mixer.music.set_volume(music_volume)
-            except:
-                pass
+        """Actualizar volúmenes de música y efectos según configuración"""
+        try:
+            apply_volume_levels(self.config)
+        except:
+            pass
+    
+    def get_audio_latency_label(self):
+        """Perfil de latencia activo del mixer para System Info"""
+        device = get_audio_device()
+        if not device.ready.is_set():
+            return "Starting..."
+        if not device.available:
+            return "No audio device"
+        return f"{device.profile_name.title()} ({buffer_ms(device.profile):.1f} ms)"
+    
+    def get_live_stats(self):
+        """Estadísticas cambiantes de System Info, fijadas una vez por ventana de CPU"""
+        # Así el widget solo se repinta cuando cambia el valor mostrado
+        if self.live_stats["window"] != self.scheduler.windows:
+            self.live_stats["window"] = self.scheduler.windows
+            self.live_stats["text_cache"] = self.get_text_cache_label()
+            self.live_stats["idle_cpu"] = self.get_idle_cpu_label()
+        return self.live_stats
+    
+    def get_idle_cpu_label(self):
+        """CPU medida con el shell en reposo para System Info"""
+        usage = self.scheduler.cpu_usage["idle"]
+        if usage is None:
+            return "Measuring..."
+        return f"{usage:.1f}%"
+    
+    def get_text_cache_label(self):
+        """Resumen de la cache de texto para System Info"""
+        stats = get_text_cache().stats()
+        return f"{stats['hit_rate']:.0%} hits ({stats['entries']} entries)"
     
     def should_play_main_music(self):
         """Determinar si debe reproducirse la música principal"""
@@ -267,7 +317,7 @@ class GamingModernOS:
         old_resolution = self.config.get("resolution")
         old_fullscreen = self.config.get("fullscreen")
         old_theme = self.config.get("theme")
-        old_music_volume = self.config.get("music_volume")
+        old_volumes = [self.config.get(key) for key in ("master_volume", "music_volume", "effects_volume")]
         old_sound_enabled = self.config.get("sound_enabled")
         
         # Actualizar configuración
@@ -277,15 +327,16 @@ class GamingModernOS:
         new_resolution = self.config.get("resolution")
         new_fullscreen = self.config.get("fullscreen")
         new_theme = self.config.get("theme")
-        new_music_volume = self.config.get("music_volume")
+        new_volumes = [self.config.get(key) for key in ("master_volume", "music_volume", "effects_volume")]
         new_sound_enabled = self.config.get("sound_enabled")
         
         # Cambios de pantalla
         if (old_resolution != new_resolution or old_fullscreen != new_fullscreen):
             self.apply_display_settings()
+            self.dirty.set_screen(self.screen)
             # Reinicializar módulos que dependen de la pantalla
             if self.game_launcher:
-                self.game_launcher = GameLauncher(self.screen, self.colors, self.fonts)
+                self.game_launcher = GameLauncher(self.screen, self.colors, self.fonts, self.config)
             if self.settings_manager:
                 self.settings_manager.screen = self.screen
         
@@ -299,7 +350,7 @@ class GamingModernOS:
                 self.settings_manager.colors = self.colors
         
         # Cambios de audio
-        if old_music_volume != new_music_volume:
+        if old_volumes != new_volumes:
             self.update_music_volume()
         
         if old_sound_enabled != new_sound_enabled:
@@ -366,62 +417,30 @@ class GamingModernOS:
         if not self.config.get("sound_enabled", True):
             return
         
-        try:
-            frequencies = {
-                "click": 1200,
-                "hover": 800,
-                "success": 1600,
-                "error": 400,
-                "navigate": 1000
-            }
-            
-            frequency = frequencies.get(sound_type, 800)
-            duration = 60
-            volume = self.config.get("master_volume", 80) / 100 * 0.1
-            
-            sample_rate = 22050
-            frames = int(duration * sample_rate / 1000)
-            arr = []
-            
-            for i in range(frames):
-                t = float(i) / sample_rate
-                envelope = math.exp(-t * 8)
-                wave = math.sin(2 * math.pi * frequency * t) * envelope * volume
-                arr.append([int(32767 * wave)] * 2)
-            
-            sound = pygame.sndarray.make_sound(pygame.array.array('h', arr))
-            sound.play()
-        except:
-            pass
+        get_tone_bank().play_effect("shell", sound_type)
     
     def draw_modern_card(self, surface, rect, elevation=1):
         """Dibuja una card moderna con sombra"""
-        shadow_offset = elevation * 2
-        shadow_rect = pygame.Rect(rect.x + shadow_offset, rect.y + shadow_offset, 
-                                 rect.width, rect.height)
-        shadow_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(shadow_surface, self.colors["shadow"], 
-                        (0, 0, rect.width, rect.height), border_radius=12)
-        surface.blit(shadow_surface, shadow_rect.topleft)
-        
-        pygame.draw.rect(surface, self.colors["bg_secondary"], rect, border_radius=12)
+        get_card_renderer().draw_card(surface, rect, self.colors["bg_secondary"], radius=12,
+                                      shadow_color=self.colors["shadow"],
+                                      shadow_offset=elevation * 2)
     
     def draw_boot_screen(self):
         """Pantalla de arranque moderna"""
         self.screen.fill(self.colors["bg_primary"])
         
         # Logo moderno centrado
-        logo_text = self.fonts["heading_xl"].render("Gaming OS", True, self.colors["text_primary"])
+        logo_text = render_text(self.fonts["heading_xl"], "Gaming OS", True, self.colors["text_primary"])
         logo_x = (self.screen.get_width() - logo_text.get_width()) // 2
         self.screen.blit(logo_text, (logo_x, 200))
         
         # Subtítulo
-        subtitle = self.fonts["body_lg"].render("Modern Gaming Experience", True, self.colors["text_secondary"])
+        subtitle = render_text(self.fonts["body_lg"], "Modern Gaming Experience", True, self.colors["text_secondary"])
         subtitle_x = (self.screen.get_width() - subtitle.get_width()) // 2
         self.screen.blit(subtitle, (subtitle_x, 250))
         
         # Versión
-        version = self.fonts["caption"].render("v2.1 - With Audio System", True, self.colors["text_secondary"])
+        version = render_text(self.fonts["caption"], "v2.1 - With Audio System", True, self.colors["text_secondary"])
         version_x = (self.screen.get_width() - version.get_width()) // 2
         self.screen.blit(version, (version_x, 280))
         
@@ -433,14 +452,14 @@ class GamingModernOS:
             music_status = "🔇 No Background Music"
             music_color = self.colors["warning"]
         
-        music_text = self.fonts["caption"].render(music_status, True, music_color)
+        music_text = render_text(self.fonts["caption"], music_status, True, music_color)
         music_x = (self.screen.get_width() - music_text.get_width()) // 2
         self.screen.blit(music_text, (music_x, 300))
         
         # Mensaje de estado
         if self.boot_message_index < len(self.boot_messages):
             message = self.boot_messages[self.boot_message_index]
-            message_text = self.fonts["body_md"].render(message, True, self.colors["text_secondary"])
+            message_text = render_text(self.fonts["body_md"], message, True, self.colors["text_secondary"])
             message_x = (self.screen.get_width() - message_text.get_width()) // 2
             self.screen.blit(message_text, (message_x, 350))
         
@@ -460,122 +479,110 @@ class GamingModernOS:
             fill_rect = pygame.Rect(progress_x, progress_y, fill_width, progress_height)
             pygame.draw.rect(self.screen, self.colors["accent"], fill_rect, border_radius=2)
     
-    def draw_main_interface(self):
-        """Interfaz principal moderna"""
-        self.screen.fill(self.colors["bg_primary"])
-        
-        # Header
-        header_rect = pygame.Rect(0, 0, self.screen.get_width(), 80)
-        pygame.draw.rect(self.screen, self.colors["bg_secondary"], header_rect)
-        
-        # Título en header
-        title = self.fonts["heading_lg"].render("Gaming Library", True, self.colors["text_primary"])
-        self.screen.blit(title, (30, 25))
-        
-        # Indicador de música en header
-        if self.main_music_playing:
-            music_indicator = "🎵"
-            music_color = self.colors["success"]
-        else:
-            music_indicator = "🔇"
-            music_color = self.colors["text_secondary"]
-        
-        music_text = self.fonts["body_md"].render(music_indicator, True, music_color)
-        self.screen.blit(music_text, (self.screen.get_width() - 180, 30))
-        
-        # Información de sistema en header
-        theme_info = f"Theme: {self.config.get('theme', 'dark').title()}"
-        theme_text = self.fonts["caption"].render(theme_info, True, self.colors["text_secondary"])
-        theme_x = self.screen.get_width() - theme_text.get_width() - 150
-        self.screen.blit(theme_text, (theme_x, 25))
-        
-        # Hora en header (derecha)
-        current_time = time.strftime("%H:%M")
-        time_text = self.fonts["body_md"].render(current_time, True, self.colors["text_secondary"])
-        time_x = self.screen.get_width() - time_text.get_width() - 30
-        self.screen.blit(time_text, (time_x, 30))
-        
-        # Opciones principales como cards modernas
+    def get_menu_options(self):
+        """Opciones del menú principal según los módulos disponibles"""
         if self.game_launcher and self.settings_manager:
-            options = [
+            return [
                 {"title": "Game Library", "subtitle": "Browse and play games", "icon": "🎮"},
                 {"title": "Settings", "subtitle": "System preferences", "icon": "⚙️"},
                 {"title": "System Info", "subtitle": "View system status", "icon": "📊"},
                 {"title": "Exit", "subtitle": "Close Gaming OS", "icon": "🚪"}
             ]
         elif self.game_launcher:
-            options = [
+            return [
                 {"title": "Game Library", "subtitle": "Browse and play games", "icon": "🎮"},
                 {"title": "Settings", "subtitle": "System preferences (Limited)", "icon": "⚙️"},
                 {"title": "Exit", "subtitle": "Close Gaming OS", "icon": "🚪"}
             ]
-        else:
-            options = [
-                {"title": "Snake Modern", "subtitle": "Classic snake with modern UI", "icon": "🐍"},
-                {"title": "Tetris Modern", "subtitle": "Block puzzle game", "icon": "🧩"},
-                {"title": "Pong Modern", "subtitle": "Two-player classic", "icon": "🏓"},
-                {"title": "Breakout Modern", "subtitle": "Break all the bricks", "icon": "🧱"},
-                {"title": "Exit", "subtitle": "Close Gaming OS", "icon": "🚪"}
-            ]
+        return [
+            {"title": "Snake Modern", "subtitle": "Classic snake with modern UI", "icon": "🐍"},
+            {"title": "Tetris Modern", "subtitle": "Block puzzle game", "icon": "🧩"},
+            {"title": "Pong Modern", "subtitle": "Two-player classic", "icon": "🏓"},
+            {"title": "Breakout Modern", "subtitle": "Break all the bricks", "icon": "🧱"},
+            {"title": "Exit", "subtitle": "Close Gaming OS", "icon": "🚪"}
+        ]
+    
+    def get_widget_tree(self, name, builder):
+        """Árbol retenido de una pantalla; se reconstruye si cambia tamaño o tema"""
+        theme = tuple((color_name, tuple(color)) for color_name, color in sorted(self.colors.items()))
+        key = (self.screen.get_size(), theme)
+        entry = self.widget_trees.get(name)
+        if entry is None or entry[0] != key:
+            entry = (key, builder())
+            self.widget_trees[name] = entry
+        elif self.dirty.full:
+            # Se presentará la pantalla completa: recomponerla entera
+            entry[1].invalidate_all()
+        return entry[1]
+    
+    def render_widget_tree(self, tree):
+        """Recomponer lo que cambió y marcarlo para presentar"""
+        for region in tree.render(self.screen):
+            self.dirty.mark(region)
+    
+    def build_main_tree(self):
+        """Árbol de widgets del menú principal"""
+        width, height = self.screen.get_size()
+        root = Panel((0, 0, width, height), self.colors["bg_primary"])
+        
+        # Header: título, música, tema y hora
+        header = root.add(Panel((0, 0, width, 80), self.colors["bg_secondary"]))
+        header.add(Label((30, 25), self.fonts["heading_lg"], "Gaming Library", self.colors["text_primary"]))
+        self.menu_music = header.add(Label((width - 180, 30), self.fonts["body_md"], "",
+                                           self.colors["text_secondary"]))
+        self.menu_theme = header.add(Label((width - 150, 25), self.fonts["caption"], "",
+                                           self.colors["text_secondary"], align="right"))
+        self.menu_clock = header.add(Label((width - 30, 30), self.fonts["body_md"], "",
+                                           self.colors["text_secondary"], align="right"))
         
-        # Dibujar cards de opciones
+        # Opciones principales como cards modernas
         start_y = 120
         card_height = 80
         card_margin = 20
-        
-        for i, option in enumerate(options):
-            is_selected = i == self.selected_option
-            
-            # Posición de la card
-            card_rect = pygame.Rect(50, start_y + i * (card_height + card_margin), 
-                                   self.screen.get_width() - 100, card_height)
-            
-            # Efecto hover/selección
-            if is_selected:
-                pulse = 0.95 + 0.05 * math.sin(self.animation_time * 0.1)
-                card_color = tuple(int(c * pulse) for c in self.colors["bg_surface"])
-            else:
-                card_color = self.colors["bg_secondary"]
-            
-            # Dibujar card
-            self.draw_modern_card(self.screen, card_rect, elevation=2 if is_selected else 1)
-            if is_selected:
-                pygame.draw.rect(self.screen, card_color, card_rect, border_radius=12)
-                pygame.draw.rect(self.screen, self.colors["accent"], card_rect, width=2, border_radius=12)
-            else:
-                pygame.draw.rect(self.screen, card_color, card_rect, border_radius=12)
-            
-            # Contenido de la card
-            icon_text = self.fonts["heading_md"].render(option["icon"], True, self.colors["text_primary"])
-            self.screen.blit(icon_text, (card_rect.x + 20, card_rect.y + 15))
-            
-            title_text = self.fonts["body_lg"].render(option["title"], True, self.colors["text_primary"])
-            self.screen.blit(title_text, (card_rect.x + 70, card_rect.y + 15))
-            
-            subtitle_text = self.fonts["body_sm"].render(option["subtitle"], True, self.colors["text_secondary"])
-            self.screen.blit(subtitle_text, (card_rect.x + 70, card_rect.y + 40))
+        self.menu_cards = []
+        for i, option in enumerate(self.get_menu_options()):
+            card_rect = pygame.Rect(50, start_y + i * (card_height + card_margin), width - 100, card_height)
+            card = root.add(Card(card_rect, self.colors["bg_secondary"], radius=12,
+                                 shadow_color=self.colors["shadow"], shadow_offset=2, pad=4))
+            card.add(Label((card_rect.x + 20, card_rect.y + 15), self.fonts["heading_md"],
+                           option["icon"], self.colors["text_primary"]))
+            card.add(Label((card_rect.x + 70, card_rect.y + 15), self.fonts["body_lg"],
+                           option["title"], self.colors["text_primary"]))
+            card.add(Label((card_rect.x + 70, card_rect.y + 40), self.fonts["body_sm"],
+                           option["subtitle"], self.colors["text_secondary"]))
+            self.menu_cards.append(card)
         
         # Footer con controles
-        footer_y = self.screen.get_height() - 50
-        controls = "↑↓ Navigate • Enter Select • Esc Exit"
-        controls_text = self.fonts["caption"].render(controls, True, self.colors["text_secondary"])
-        controls_x = (self.screen.get_width() - controls_text.get_width()) // 2
-        self.screen.blit(controls_text, (controls_x, footer_y))
+        root.add(Label((0, height - 50), self.fonts["caption"], "↑↓ Navigate • Enter Select • Esc Exit",
+                       self.colors["text_secondary"], align="center", width=width))
+        return WidgetTree(root)
     
-    def draw_system_info(self):
-        """Dibujar información del sistema"""
-        self.screen.fill(self.colors["bg_primary"])
-        
-        # Header
-        header_rect = pygame.Rect(0, 0, self.screen.get_width(), 70)
-        pygame.draw.rect(self.screen, self.colors["bg_secondary"], header_rect)
+    def draw_main_interface(self):
+        """Interfaz principal: solo se repinta lo que cambia (hora, música, selección)"""
+        tree = self.get_widget_tree("main_menu", self.build_main_tree)
         
-        title = self.fonts["heading_lg"].render("System Information", True, self.colors["text_primary"])
-        self.screen.blit(title, (30, 20))
+        if self.main_music_playing:
+            self.menu_music.set(text="🎵", color=self.colors["success"])
+        else:
+            self.menu_music.set(text="🔇", color=self.colors["text_secondary"])
+        self.menu_theme.set(text=f"Theme: {self.config.get('theme', 'dark').title()}")
+        self.menu_clock.set(text=time.strftime("%H:%M"))
+        
+        for i, card in enumerate(self.menu_cards):
+            if i == self.selected_option:
+                # La card seleccionada pulsa
+                pulse = 0.95 + 0.05 * math.sin(self.animation_time * 6)
+                card.set(color=tuple(int(c * pulse) for c in self.colors["bg_surface"]),
+                         shadow_offset=4, border_color=self.colors["accent"])
+            else:
+                card.set(color=self.colors["bg_secondary"], shadow_offset=2, border_color=None)
         
-        # Información del sistema
-        info_y = 100
-        info_items = [
+        self.render_widget_tree(tree)
+    
+    def get_system_info_items(self):
+        """Pares (etiqueta, valor) de la pantalla System Info"""
+        live = self.get_live_stats()
+        return [
             ("Gaming OS Version", "2.1"),
             ("Python Version", f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"),
             ("Pygame Version", pygame.version.ver),
@@ -585,39 +592,50 @@ class GamingModernOS:
             ("Sound Enabled", "Yes" if self.config.get('sound_enabled') else "No"),
             ("Master Volume", f"{self.config.get('master_volume', 80)}%"),
             ("Music Volume", f"{self.config.get('music_volume', 60)}%"),
+            ("Effects Volume", f"{self.config.get('effects_volume', 100)}%"),
+            ("Audio Latency", self.get_audio_latency_label()),
             ("Background Music", "Playing" if self.main_music_playing else "Stopped"),
+            ("Text Cache", live["text_cache"]),
+            ("Idle CPU", live["idle_cpu"]),
             ("Performance Mode", self.config.get('performance_mode', 'balanced').title()),
             ("Games Directory", self.config.get('games_directory', './games/')),
             ("Auto Scan Games", "Yes" if self.config.get('auto_scan_games') else "No")
         ]
+    
+    def build_system_info_tree(self):
+        """Árbol de widgets de System Info"""
+        width, height = self.screen.get_size()
+        root = Panel((0, 0, width, height), self.colors["bg_primary"])
         
-        # Dividir en dos columnas
-        col1_items = info_items[:len(info_items)//2 + 1]
-        col2_items = info_items[len(info_items)//2 + 1:]
+        # Header
+        header = root.add(Panel((0, 0, width, 70), self.colors["bg_secondary"]))
+        header.add(Label((30, 20), self.fonts["heading_lg"], "System Information", self.colors["text_primary"]))
         
-        # Columna 1
-        for i, (label, value) in enumerate(col1_items):
-            label_text = self.fonts["body_sm"].render(f"{label}:", True, self.colors["text_secondary"])
-            value_text = self.fonts["body_sm"].render(value, True, self.colors["text_primary"])
-            
-            self.screen.blit(label_text, (50, info_y + i * 30))
-            self.screen.blit(value_text, (250, info_y + i * 30))
-        
-        # Columna 2
-        col2_x = self.screen.get_width() // 2 + 50
-        for i, (label, value) in enumerate(col2_items):
-            label_text = self.fonts["body_sm"].render(f"{label}:", True, self.colors["text_secondary"])
-            value_text = self.fonts["body_sm"].render(value, True, self.colors["text_primary"])
-            
-            self.screen.blit(label_text, (col2_x, info_y + i * 30))
-            self.screen.blit(value_text, (col2_x + 200, info_y + i * 30))
+        # Dos columnas de etiqueta y valor
+        info_y = 100
+        labels = [label for label, _value in self.get_system_info_items()]
+        split = len(labels) // 2 + 1
+        columns = [(labels[:split], 50, 250), (labels[split:], width // 2 + 50, width // 2 + 250)]
+        
+        self.info_values = {}
+        for column_labels, label_x, value_x in columns:
+            for i, label in enumerate(column_labels):
+                y = info_y + i * 30
+                root.add(Label((label_x, y), self.fonts["body_sm"], f"{label}:", self.colors["text_secondary"]))
+                self.info_values[label] = root.add(Label((value_x, y), self.fonts["body_sm"], "",
+                                                         self.colors["text_primary"]))
         
         # Footer
-        footer_y = self.screen.get_height() - 50
-        footer_text = "Press ESC to go back"
-        footer_render = self.fonts["caption"].render(footer_text, True, self.colors["text_secondary"])
-        footer_x = (self.screen.get_width() - footer_render.get_width()) // 2
-        self.screen.blit(footer_render, (footer_x, footer_y))
+        root.add(Label((0, height - 50), self.fonts["caption"], "Press ESC to go back",
+                       self.colors["text_secondary"], align="center", width=width))
+        return WidgetTree(root)
+    
+    def draw_system_info(self):
+        """Dibujar información del sistema (solo se repintan los valores que cambian)"""
+        tree = self.get_widget_tree("system_info", self.build_system_info_tree)
+        for label, value in self.get_system_info_items():
+            self.info_values[label].set(text=value)
+        self.render_widget_tree(tree)
     
     def update_boot_sequence(self):
         """Actualiza secuencia de arranque"""
@@ -653,11 +671,9 @@ class GamingModernOS:
             self.stop_main_music()
             
             # Efecto visual de lanzamiento
-            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-            overlay.fill(self.colors["overlay"])
-            self.screen.blit(overlay, (0, 0))
+            get_card_renderer().draw_veil(self.screen, self.colors["overlay"])
             
-            launching_text = self.fonts["heading_md"].render("Launching game...", True, self.colors["text_primary"])
+            launching_text = render_text(self.fonts["heading_md"], "Launching game...", True, self.colors["text_primary"])
             text_x = (self.screen.get_width() - launching_text.get_width()) // 2
             text_y = (self.screen.get_height() - launching_text.get_height()) // 2
             self.screen.blit(launching_text, (text_x, text_y))
@@ -665,7 +681,8 @@ class GamingModernOS:
             
             time.sleep(0.5)
             
-            result = subprocess.run([sys.executable, game_path], capture_output=True, text=True)
+            result = subprocess.run([sys.executable, game_path], capture_output=True, text=True,
+                                    env=game_environment(self.config))
             
             if result.returncode == 0:
                 print(f"✓ Game '{game_path}' executed successfully.")
@@ -680,6 +697,8 @@ class GamingModernOS:
             if self.should_play_main_music():
                 self.play_main_music()
             
+            self.dirty.mark_all()
+            self.scheduler.wake()
             return True
         except Exception as e:
             print(f"❌ Failed to launch game '{game_path}': {e}")
@@ -691,7 +710,13 @@ class GamingModernOS:
     
     def handle_events(self):
         """Maneja eventos del sistema"""
-        for event in pygame.event.get():
+        for event in self.scheduler.get_events():
+            # Las pantallas sin árbol retenido se presentan enteras tras cualquier
+            # entrada (salvo mover el ratón); las retenidas informan de lo que cambia
+            if event.type != pygame.MOUSEMOTION and self.current_state not in RETAINED_STATES:
+                self.dirty.mark_all()
+            self.scheduler.handle_event(event)
+            
             if event.type == pygame.QUIT:
                 return False
             
@@ -700,6 +725,9 @@ class GamingModernOS:
                     if self.current_state == "main_menu":
                         return False
                     elif self.current_state in ["game_launcher", "settings", "system_info"]:
+                        if self.current_state == "settings":
+                            # Descartar la vista previa de volumen no guardada
+                            self.update_music_volume()
                         self.current_state = "main_menu"
                         self.selected_option = 0
                         self.play_ui_sound("click")
@@ -781,6 +809,7 @@ class GamingModernOS:
                     if result == "back":
                         self.current_state = "main_menu"
                         self.selected_option = 1  # Volver a Settings
+                        self.update_music_volume()
                         self.play_ui_sound("click")
                         # Asegurar música al volver de settings
                         if self.should_play_main_music():
@@ -796,6 +825,11 @@ class GamingModernOS:
     
     def update_music_state(self):
         """Actualizar estado de la música según la pantalla actual"""
+        if self.music.has_failed("main"):
+            self.music_initialized = False
+            self.main_music_playing = False
+        self.music.update()
+        
         should_play = self.should_play_main_music()
         
         if should_play and not self.main_music_playing:
@@ -827,8 +861,11 @@ class GamingModernOS:
             # Actualizar estado de música
             self.update_music_state()
             
-            # Render
+            # Render (un cambio de pantalla invalida todo; el boot está siempre animado)
+            if self.dirty.track("state", self.current_state, self.screen.get_rect()):
+                self.dirty.mark_all()
             if self.current_state == "boot":
+                self.dirty.mark_all()
                 self.draw_boot_screen()
             elif self.current_state == "main_menu":
                 self.draw_main_interface()
@@ -840,20 +877,20 @@ class GamingModernOS:
             elif self.current_state == "system_info":
                 self.draw_system_info()
             
-            # Update
-            self.animation_time += 1
+            # Update (en segundos: el pulso no se ralentiza cuando el bucle va en reposo)
+            self.animation_time += self.clock.get_time() / 1000
             
-            # Aplicar límite de FPS
-            fps_limit = self.config.get("fps_limit", 60)
-            if fps_limit > 0:
-                self.clock.tick(fps_limit)
-            else:
-                self.clock.tick()  # Sin límite
+            # Presentar solo las zonas modificadas (nada si no cambió nada)
+            self.dirty.present()
             
-            pygame.display.flip()
+            # Límite de FPS en uso activo; en reposo o sin foco el bucle se
+            # bloquea esperando entrada (el boot sigue animado)
+            self.scheduler.tick(self.config.get("fps_limit", 60),
+                                animating=self.current_state == "boot")
         
         # Detener música al salir
         self.stop_main_music()
+        self.music.stop()
         
         # Guardar configuración al salir
         self.save_config()
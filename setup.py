@@ -278,7 +278,7 @@ Sistema operativo retro gaming creado en Python con Pygame.
 
 1. Instalar dependencias:
 ```bash
-pip install pygame
+pip install pygame numpy
 ```
 
 2. Ejecutar el setup (opcional):
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Configuración común de los tests: pygame sin ventana ni audio real
+"""
+
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Permitir "import core..." al ejecutar pytest desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
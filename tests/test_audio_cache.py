@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests de la caché de efectos horneados (manifiesto por hash de parámetros)
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from core import audio_cache
+
+RATE = 22050
+CHANNELS = 1
+
+
+@pytest.fixture
+def bake_dir(tmp_path, monkeypatch):
+    """Caché en un directorio temporal"""
+    monkeypatch.setattr(audio_cache, "BAKE_DIR", tmp_path)
+    monkeypatch.setattr(audio_cache, "MANIFEST_PATH", tmp_path / "manifest.json")
+    return tmp_path
+
+
+def tone(frequency=440, volume=0.1):
+    return audio_cache.tone_params({"frequency": frequency, "duration": 50, "waveform": "square",
+                                    "decay": 4, "volume": volume, "adsr": None})
+
+
+def pcm_path(bake_dir):
+    return bake_dir / manifest(bake_dir)["pcm"]
+
+
+def manifest(bake_dir):
+    with open(bake_dir / "manifest.json") as f:
+        return json.load(f)
+
+
+def test_bakes_missing_tones_and_reuses_them(bake_dir):
+    first = audio_cache.load_tones([tone()], RATE, CHANNELS)
+    entries = manifest(bake_dir)["entries"]
+    assert list(entries) == [audio_cache.tone_hash(tone(), RATE, CHANNELS)]
+
+    # Segunda carga: sale del memory-map sin reescribir nada
+    mtime = pcm_path(bake_dir).stat().st_mtime_ns
+    second = audio_cache.load_tones([tone()], RATE, CHANNELS)
+    assert isinstance(second[0], np.memmap)
+    assert np.array_equal(first[0], second[0])
+    assert pcm_path(bake_dir).stat().st_mtime_ns == mtime
+
+
+def test_volume_is_part_of_the_hash(bake_dir):
+    quiet, loud = audio_cache.load_tones([tone(volume=0.025), tone(volume=0.1)], RATE, CHANNELS)
+    assert len(manifest(bake_dir)["entries"]) == 2
+    assert np.abs(quiet).max() < np.abs(loud).max()
+
+
+def test_new_format_adds_entries(bake_dir):
+    audio_cache.load_tones([tone()], RATE, CHANNELS)
+    audio_cache.load_tones([tone()], RATE * 2, CHANNELS)
+    assert len(manifest(bake_dir)["entries"]) == 2
+
+
+def test_version_change_rebuilds(bake_dir):
+    audio_cache.load_tones([tone()], RATE, CHANNELS)
+    data = manifest(bake_dir)
+    data["version"] = audio_cache.SYNTH_VERSION - 1
+    (bake_dir / "manifest.json").write_text(json.dumps(data))
+
+    samples = audio_cache.load_tones([tone()], RATE, CHANNELS)
+    assert not isinstance(samples[0], np.memmap)
+    assert manifest(bake_dir)["version"] == audio_cache.SYNTH_VERSION
+
+
+def test_truncated_pcm_rebuilds_entry(bake_dir):
+    expected = audio_cache.load_tones([tone()], RATE, CHANNELS)[0]
+    pcm = pcm_path(bake_dir)
+    pcm.write_bytes(pcm.read_bytes()[:100])
+
+    samples = audio_cache.load_tones([tone()], RATE, CHANNELS)
+    assert np.array_equal(samples[0], expected)
+    assert pcm_path(bake_dir).stat().st_size == expected.nbytes
+
+
+def test_manifest_names_its_pcm(bake_dir):
+    audio_cache.load_tones([tone(440)], RATE, CHANNELS)
+    old = pcm_path(bake_dir)
+    entries, _data = audio_cache.read_cache()
+
+    # Un nuevo horneado publica otro PCM: el manifiesto viejo nunca apunta al nuevo
+    audio_cache.load_tones([tone(440), tone(880)], RATE, CHANNELS)
+    new = pcm_path(bake_dir)
+    assert new != old
+    assert not old.exists()
+    assert list(bake_dir.glob("*.pcm")) == [new]
+    assert len(audio_cache.read_cache()[0]) == len(entries) + 1
+
+
+def test_prune_drops_stale_entries(bake_dir):
+    audio_cache.load_tones([tone(440), tone(880)], RATE, CHANNELS)
+    audio_cache.load_tones([tone(440)], RATE, CHANNELS, prune=True)
+    assert list(manifest(bake_dir)["entries"]) == [audio_cache.tone_hash(tone(440), RATE, CHANNELS)]
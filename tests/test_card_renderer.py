@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests de la cache LRU de sombras de CardRenderer
+"""
+
+import pygame
+
+from core.card_renderer import CardRenderer
+
+SHADOW = (0, 0, 0, 60)
+
+
+def test_shadow_is_reused():
+    renderer = CardRenderer()
+    first = renderer.shadow((40, 20), 8, SHADOW)
+    assert renderer.shadow((40, 20), 8, SHADOW) is first
+    assert (renderer.hits, renderer.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used():
+    renderer = CardRenderer(max_entries=2)
+    a = renderer.shadow((10, 10), 4, SHADOW)
+    renderer.shadow((20, 10), 4, SHADOW)
+    renderer.shadow((10, 10), 4, SHADOW)  # a pasa a ser la más reciente
+    renderer.shadow((30, 10), 4, SHADOW)  # expulsa (20, 10)
+
+    assert len(renderer.shadows) == 2
+    assert renderer.shadow((10, 10), 4, SHADOW) is a
+    misses = renderer.misses
+    renderer.shadow((20, 10), 4, SHADOW)
+    assert renderer.misses == misses + 1
+
+
+def test_draw_shadow_blits_with_offset():
+    renderer = CardRenderer()
+    surface = pygame.Surface((50, 50))
+    surface.fill((255, 255, 255))
+    renderer.draw_shadow(surface, pygame.Rect(10, 10, 20, 20), 0, (0, 0, 0, 255), 4)
+
+    assert surface.get_at((14, 14))[:3] == (0, 0, 0)
+    assert surface.get_at((12, 12))[:3] == (255, 255, 255)
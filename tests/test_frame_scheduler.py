@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests del FrameScheduler (orden de eventos tras una espera en reposo)
+"""
+
+import pygame
+import pytest
+
+from core import frame_scheduler
+from core.frame_scheduler import FrameScheduler
+
+
+@pytest.fixture
+def scheduler():
+    pygame.display.init()
+    pygame.display.set_mode((10, 10))
+    pygame.event.clear()
+    yield FrameScheduler(pygame.time.Clock())
+    pygame.display.quit()
+
+
+def test_waking_event_comes_first(scheduler, monkeypatch):
+    first = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a)
+    later = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_b)
+    monkeypatch.setattr(frame_scheduler.pygame.event, "wait", lambda timeout: first)
+    monkeypatch.setattr(scheduler, "current_mode", lambda animating: "idle")
+
+    scheduler.tick(60)
+    pygame.event.post(later)
+
+    keys = [event.key for event in scheduler.get_events() if event.type == pygame.KEYDOWN]
+    assert keys == [pygame.K_a, pygame.K_b]
+    assert not any(event.type == pygame.KEYDOWN for event in scheduler.get_events())
+
+
+def test_input_returns_to_full_rate(scheduler):
+    scheduler.last_input = 0.0
+    assert scheduler.current_mode(False) == "idle"
+    assert scheduler.current_mode(True) == "active"
+    scheduler.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+    assert scheduler.current_mode(False) == "active"
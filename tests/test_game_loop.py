@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests del bucle de paso fijo (pasos por frame y alpha de interpolación)
+"""
+
+import pytest
+
+from core import game_loop
+from core.game_loop import FixedTimestep, lerp, MAX_FRAME_TIME
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj manual para time.perf_counter del bucle"""
+    now = [100.0]
+    monkeypatch.setattr(game_loop.time, "perf_counter", lambda: now[0])
+    return now
+
+
+def test_first_frame_runs_one_step(clock):
+    loop = FixedTimestep(tick_rate=60, render_fps=60)
+    assert loop.advance() == 1
+    assert loop.alpha == pytest.approx(0.0)
+
+
+def test_steps_and_alpha(clock):
+    loop = FixedTimestep(tick_rate=10, render_fps=60)
+    loop.advance()
+
+    clock[0] += 0.25
+    assert loop.advance() == 2
+    assert loop.alpha == pytest.approx(0.5)
+
+    # Render más rápido que la simulación: frames sin pasos, alpha creciente
+    clock[0] += 0.03
+    assert loop.advance() == 0
+    assert loop.alpha == pytest.approx(0.8)
+
+    clock[0] += 0.03
+    assert loop.advance() == 1
+    assert loop.alpha == pytest.approx(0.1)
+
+
+def test_slow_frame_is_clamped(clock):
+    loop = FixedTimestep(tick_rate=60, render_fps=60)
+    loop.advance()
+    clock[0] += 5.0
+    assert loop.advance() == int(MAX_FRAME_TIME * 60)
+
+
+def test_reset_and_tick_rate_change(clock):
+    loop = FixedTimestep(tick_rate=10, render_fps=60)
+    loop.advance()
+    clock[0] += 0.15
+    loop.advance()
+    loop.reset()
+    assert loop.alpha == 0.0
+    assert loop.advance() == 1
+
+    loop.set_tick_rate(20)
+    clock[0] += 0.11
+    assert loop.advance() == 2
+
+
+def test_lerp():
+    assert lerp(10, 20, 0.0) == 10
+    assert lerp(10, 20, 0.25) == 12.5
+    assert lerp(10, 20, 1.0) == 20
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests del sistema de partículas en arrays de NumPy
+"""
+
+import numpy as np
+import pygame
+
+from core.particles import ParticleSystem
+
+
+def test_emit_respects_capacity():
+    particles = ParticleSystem(capacity=10)
+    assert particles.emit(0, 0, 8, (255, 0, 0)) == 8
+    assert particles.emit(0, 0, 8, (255, 0, 0)) == 2
+    assert particles.emit(0, 0, 8, (255, 0, 0)) == 0
+    assert len(particles) == 10
+
+
+def test_update_compacts_dead_particles_in_order():
+    particles = ParticleSystem(capacity=16, gravity=0.0, shrink=1.0)
+    particles.emit(0, 0, 3, (255, 0, 0), speed=0, life=1)
+    particles.emit(50, 50, 4, (0, 255, 0), speed=0, life=5)
+    particles.emit(0, 0, 2, (0, 0, 255), speed=0, life=1)
+
+    particles.update()
+    assert len(particles) == 4
+    assert np.all(particles.position[:4] == (50, 50))
+    assert np.all(particles.color[:4] == particles.color_id((0, 255, 0)))
+
+    # El hueco liberado se puede volver a llenar
+    assert particles.emit(0, 0, 12, (255, 0, 0)) == 12
+
+
+def test_particles_die_when_too_small():
+    particles = ParticleSystem(capacity=4, shrink=0.1, min_size=0.5)
+    particles.emit(0, 0, 4, (255, 255, 255), life=100, size=(2.0, 2.0))
+    particles.update()
+    assert len(particles) == 0
+
+
+def test_draw_reuses_sprites():
+    particles = ParticleSystem(capacity=64)
+    particles.emit(20, 20, 64, (255, 255, 0), size=(4.0, 4.0))
+    surface = pygame.Surface((40, 40), pygame.SRCALPHA)
+
+    particles.draw(surface)
+    # Un sprite por (color, radio, alfa), no por partícula
+    assert 0 < len(particles.sprites) < 64
+    assert surface.get_at((20, 20)).a > 0
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests del QualityGovernor (bajada, histéresis y pasos sin efecto)
+"""
+
+import pytest
+
+from core import quality
+from core.quality import (QualityGovernor, get_quality, GOVERNOR_WINDOW, GOVERNOR_STEPS,
+                          GOVERNOR_STABLE_SECONDS, GOVERNOR_MAX_STABLE_SECONDS)
+
+SLOW = 30.0  # ms, por encima del presupuesto de 60 FPS
+FAST = 1.0   # ms, por debajo de GOVERNOR_RAISE_RATIO
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj manual para time.monotonic del governor"""
+    now = [0.0]
+    monkeypatch.setattr(quality.time, "monotonic", lambda: now[0])
+    return now
+
+
+def fill(governor, frame_ms):
+    """Registrar frames hasta una ventana completa o un cambio de nivel"""
+    for _ in range(GOVERNOR_WINDOW):
+        if governor.record(frame_ms):
+            return True
+    return False
+
+
+def test_needs_full_window(clock):
+    governor = QualityGovernor(get_quality("balanced"), 60)
+    for _ in range(GOVERNOR_WINDOW - 1):
+        assert not governor.record(SLOW)
+    assert governor.record(SLOW)
+    assert governor.level == 1
+
+
+def test_steps_down_in_order_in_place(clock):
+    settings = get_quality("balanced")
+    governor = QualityGovernor(settings, 60)
+
+    fill(governor, SLOW)
+    assert settings["trail"] == 0.0 and settings["particles"] == 1.0
+    fill(governor, SLOW)
+    assert settings["particles"] == 0.25 and settings["shadows"]
+    fill(governor, SLOW)
+    fill(governor, SLOW)
+    assert governor.level == len(GOVERNOR_STEPS)
+    assert not settings["shadows"] and not settings["pulse_animations"]
+
+    # Sin más pasos: el nivel no cambia
+    assert not fill(governor, SLOW)
+
+
+def test_skips_steps_that_change_nothing(clock):
+    # En "low" estelas, sombras y pulsos ya están apagados y las partículas al mínimo
+    governor = QualityGovernor(get_quality("low"), 60)
+    assert not fill(governor, SLOW)
+    assert governor.level == 0
+
+
+def test_raises_only_after_stable_period(clock):
+    settings = get_quality("balanced")
+    governor = QualityGovernor(settings, 60)
+    fill(governor, SLOW)
+
+    clock[0] = 1.0
+    assert not fill(governor, FAST)
+    clock[0] = 1.0 + GOVERNOR_STABLE_SECONDS - 0.1
+    assert not fill(governor, FAST)
+    clock[0] = 1.0 + GOVERNOR_STABLE_SECONDS
+    assert fill(governor, FAST)
+    assert governor.level == 0
+    assert settings == get_quality("balanced")
+
+
+def test_failed_raise_doubles_wait_then_resets(clock):
+    governor = QualityGovernor(get_quality("balanced"), 60)
+    fill(governor, SLOW)
+    clock[0] = 1.0
+    fill(governor, FAST)
+    clock[0] = 10.0
+    fill(governor, FAST)
+    assert governor.level == 0
+
+    # Bajar justo después de subir duplica la espera, una sola vez
+    clock[0] = 11.0
+    fill(governor, SLOW)
+    fill(governor, SLOW)
+    assert governor.level == 2
+    assert governor.stable_seconds == GOVERNOR_STABLE_SECONDS * 2
+
+    # Una subida que aguanta toda la espera la restablece
+    clock[0] = 12.0
+    fill(governor, FAST)
+    clock[0] = 22.0
+    fill(governor, FAST)
+    assert governor.level == 1
+    clock[0] = 40.0
+    fill(governor, 14.0)  # dentro del presupuesto, sin llegar a subir
+    assert governor.level == 1
+    assert governor.stable_seconds == GOVERNOR_STABLE_SECONDS
+
+
+def test_wait_is_capped(clock):
+    governor = QualityGovernor(get_quality("balanced"), 60)
+    for i in range(10):
+        fill(governor, SLOW)
+        governor.set_level(0)
+    assert governor.stable_seconds == GOVERNOR_MAX_STABLE_SECONDS
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests de la cache LRU de textos renderizados
+"""
+
+import pygame
+import pytest
+
+from core.text_cache import TextCache
+
+
+@pytest.fixture(scope="module")
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 20)
+
+
+def test_render_is_cached(font):
+    cache = TextCache()
+    first = cache.render(font, "Score", True, (255, 255, 255))
+    assert cache.render(font, "Score", True, (255, 255, 255)) is first
+    assert cache.render(font, "Score", True, (255, 0, 0)) is not first
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+
+def test_memory_budget_evicts_oldest(font):
+    probe = TextCache().render(font, "A", True, (255, 255, 255))
+    cache = TextCache(max_bytes=TextCache.surface_bytes(probe) * 2)
+    cache.render(font, "A", True, (255, 255, 255))
+    cache.render(font, "B", True, (255, 255, 255))
+    cache.render(font, "A", True, (255, 255, 255))  # A pasa a ser la más reciente
+    cache.render(font, "C", True, (255, 255, 255))
+
+    keys = [key[1] for key in cache.entries]
+    assert "B" not in keys and "A" in keys
+    assert cache.bytes <= cache.max_bytes
+    assert cache.bytes == sum(TextCache.surface_bytes(s) for s in cache.entries.values())
+
+
+def test_oversized_entry_is_kept(font):
+    cache = TextCache(max_bytes=1)
+    surface = cache.render(font, "Too big", True, (255, 255, 255))
+    assert cache.render(font, "Too big", True, (255, 255, 255)) is surface
+    assert len(cache.entries) == 1
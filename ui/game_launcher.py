@@ -9,22 +9,32 @@ import json
 import subprocess
 import sys
 import math
+from collections import OrderedDict
 from pathlib import Path
 
+from core.card_renderer import get_card_renderer
+from core.text_cache import render_text
+from core.bitmap_font import get_font
+from core.quality import game_environment
+
+# Margen de la Surface de cada card para su sombra (máximo desplazamiento)
+CARD_SHADOW = 6
+
 class GameLauncher:
-    def __init__(self, screen, colors, fonts):
+    def __init__(self, screen, colors, fonts, config=None):
         self.screen = screen
         self.colors = colors
         self.fonts = fonts
+        self.config = config  # Configuración viva del shell (None = la guardada)
         
         # Mapeo de fuentes para compatibilidad
         self.font_map = {
-            'title': fonts.get('heading_xl', fonts.get('heading_lg', pygame.font.Font(None, 36))),
-            'large': fonts.get('heading_lg', pygame.font.Font(None, 32)),
-            'medium': fonts.get('body_lg', pygame.font.Font(None, 22)),
-            'small': fonts.get('body_md', pygame.font.Font(None, 18)),
-            'tiny': fonts.get('body_sm', pygame.font.Font(None, 16)),
-            'caption': fonts.get('caption', pygame.font.Font(None, 14))
+            'title': fonts.get('heading_xl', fonts.get('heading_lg', get_font(36))),
+            'large': fonts.get('heading_lg', get_font(32)),
+            'medium': fonts.get('body_lg', get_font(22)),
+            'small': fonts.get('body_md', get_font(18)),
+            'tiny': fonts.get('body_sm', get_font(16)),
+            'caption': fonts.get('caption', get_font(14))
         }
         
         # Estado del launcher
@@ -37,6 +47,12 @@ class GameLauncher:
         self.animation_time = 0
         self.card_hover_scale = {}
         
+        # Cards pre-renderizadas de las filas visibles y lista filtrada actual
+        self.card_cache = OrderedDict()
+        self.max_cached_cards = 18
+        self.filtered_games = None
+        self.filter_key = None
+        
         # Cargar juegos
         self.games = []
         self.categories = ["ALL", "ARCADE", "PUZZLE", "ACTION", "CLASSIC"]
@@ -137,33 +153,139 @@ class GameLauncher:
             if game["builtin"]:
                 game_path = games_dir / game["filename"]
                 game["playable"] = game_path.exists()
+        
+        self.filtered_games = None
     
     def get_filtered_games(self):
-        """Obtener juegos filtrados por categoría"""
-        if self.current_category == "ALL":
-            return [g for g in self.games if g["playable"]]
-        return [g for g in self.games if g["category"] == self.current_category and g["playable"]]
+        """Obtener juegos filtrados por categoría (recalculado solo si cambia)"""
+        key = (self.current_category, len(self.games))
+        if self.filtered_games is None or key != self.filter_key:
+            if self.current_category == "ALL":
+                self.filtered_games = [g for g in self.games if g["playable"]]
+            else:
+                self.filtered_games = [g for g in self.games
+                                       if g["category"] == self.current_category and g["playable"]]
+            self.filter_key = key
+        return self.filtered_games
+    
+    def card_theme(self):
+        """Colores que afectan a las cards (cambian con el tema)"""
+        return tuple(tuple(self.colors[name]) for name in
+                     ("bg_surface", "bg_secondary", "accent", "text_primary",
+                      "text_secondary", "warning", "success", "danger"))
     
     def draw_modern_card(self, surface, rect, elevation=1, selected=False):
         """Dibuja una card moderna con sombra y efectos"""
-        # Sombra
-        shadow_offset = elevation * 3
-        shadow_rect = pygame.Rect(rect.x + shadow_offset, rect.y + shadow_offset, 
-                                 rect.width, rect.height)
-        shadow_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
+        # Sombra (cacheada), card base y borde de selección
         shadow_alpha = 80 if selected else 40
-        pygame.draw.rect(shadow_surface, (0, 0, 0, shadow_alpha), 
-                        (0, 0, rect.width, rect.height), border_radius=16)
-        surface.blit(shadow_surface, shadow_rect.topleft)
-        
-        # Card base
         card_color = self.colors["bg_surface"] if selected else self.colors["bg_secondary"]
-        pygame.draw.rect(surface, card_color, rect, border_radius=16)
-        
-        # Borde de selección
-        if selected:
-            pygame.draw.rect(surface, self.colors["accent"], rect, width=2, border_radius=16)
+        get_card_renderer().draw_card(surface, rect, card_color, radius=16,
+                                      shadow_color=(0, 0, 0, shadow_alpha),
+                                      shadow_offset=elevation * 3,
+                                      border_color=self.colors["accent"] if selected else None)
+    
+    def get_card_surface(self, game, selected, size, theme):
+        """Card de un juego desde la cache, renderizándola si falta"""
+        key = (game["filename"], game["title"], game["playable"], selected, size, theme)
+        card = self.card_cache.get(key)
+        if card is not None:
+            self.card_cache.move_to_end(key)
+            return card
+        
+        card = self.render_card(game, selected, size)
+        self.card_cache[key] = card
+        # Solo se conservan las filas visibles (y la que acaba de salir)
+        while len(self.card_cache) > self.max_cached_cards:
+            self.card_cache.popitem(last=False)
+        return card
     
+    def render_card(self, game, is_selected, size):
+        """Pintar una card completa (sombra incluida) en su propia Surface"""
+        card_width, card_height = size
+        surface = pygame.Surface((card_width + CARD_SHADOW, card_height + CARD_SHADOW), pygame.SRCALPHA)
+        card_rect = pygame.Rect(0, 0, card_width, card_height)
+        
+        # Efecto hover más sutil
+        if is_selected:
+            # Sombra más pronunciada y borde de acento para selección
+            get_card_renderer().draw_card(surface, card_rect, self.colors["bg_surface"],
+                                          radius=12, shadow_color=(0, 0, 0, 100),
+                                          shadow_offset=6, border_color=self.colors["accent"])
+        else:
+            # Sombra sutil
+            get_card_renderer().draw_card(surface, card_rect, self.colors["bg_secondary"],
+                                          radius=12, shadow_color=(0, 0, 0, 40),
+                                          shadow_offset=3)
+        
+        # Contenido de la card más compacto
+        content_padding = 15
+        
+        # Icono del juego más pequeño
+        icon_text = render_text(self.fonts["heading_md"], game.get("icon", "🎮"), True, self.colors["text_primary"])
+        icon_x = card_rect.x + (card_rect.width - icon_text.get_width()) // 2
+        surface.blit(icon_text, (icon_x, card_rect.y + content_padding))
+        
+        # Título del juego
+        title_text = render_text(self.fonts["body_lg"], game["title"], True, self.colors["text_primary"])
+        # Truncar título si es muy largo
+        max_title_width = card_width - content_padding * 2
+        if title_text.get_width() > max_title_width:
+            # Truncar y agregar "..."
+            truncated_title = game["title"]
+            while self.fonts["body_lg"].size(truncated_title + "...")[0] > max_title_width and len(truncated_title) > 3:
+                truncated_title = truncated_title[:-1]
+            title_text = render_text(self.fonts["body_lg"], truncated_title + "...", True, self.colors["text_primary"])
+        
+        title_x = card_rect.x + (card_rect.width - title_text.get_width()) // 2
+        surface.blit(title_text, (title_x, card_rect.y + content_padding + 50))
+        
+        # Descripción más corta
+        desc_lines = self.wrap_text(game["description"], card_width - content_padding * 2, self.fonts["body_sm"])
+        desc_y = card_rect.y + content_padding + 80
+        
+        for line in desc_lines[:2]:  # Máximo 2 líneas
+            line_text = render_text(self.fonts["body_sm"], line, True, self.colors["text_secondary"])
+            line_x = card_rect.x + content_padding
+            surface.blit(line_text, (line_x, desc_y))
+            desc_y += 14
+        
+        # Rating más compacto
+        rating = game.get("rating", 0)
+        if rating > 0:
+            self.draw_rating_stars(surface, card_rect.x + content_padding, 
+                                 card_rect.y + card_rect.height - 60, rating)
+        
+        # Categoría y estado
+        category_text = render_text(self.fonts["caption"], game["category"], True, self.colors["accent"])
+        cat_x = card_rect.x + content_padding
+        cat_y = card_rect.y + card_rect.height - 35
+        surface.blit(category_text, (cat_x, cat_y))
+        
+        # Indicador de estado playable
+        if game["playable"]:
+            status_color = self.colors["success"]
+            status_text = "●"
+        else:
+            status_color = self.colors["danger"]
+            status_text = "●"
+        
+        status_render = render_text(self.fonts["caption"], status_text, True, status_color)
+        status_x = card_rect.right - content_padding - status_render.get_width()
+        surface.blit(status_render, (status_x, cat_y))
+        
+        # Overlay de no disponible más sutil
+        if not game["playable"]:
+            get_card_renderer().draw_veil(surface, (0, 0, 0, 80), card_rect)
+        
+            na_text = render_text(self.fonts["caption"], "Not Available", True, self.colors["danger"])
+            na_x = card_rect.x + (card_rect.width - na_text.get_width()) // 2
+            na_y = card_rect.y + (card_rect.height - na_text.get_height()) // 2
+            surface.blit(na_text, (na_x, na_y))
+        
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha()
+        return surface
+        
     def draw_rating_stars(self, surface, x, y, rating):
         """Dibuja estrellas de rating"""
         star_size = 12
@@ -181,7 +303,7 @@ class GameLauncher:
                 # Estrella vacía
                 star_color = self.colors["text_secondary"]
             
-            star_text = self.fonts["caption"].render("★", True, star_color)
+            star_text = render_text(self.fonts["caption"], "★", True, star_color)
             surface.blit(star_text, (star_x, y))
     
     def draw(self):
@@ -191,7 +313,7 @@ class GameLauncher:
         pygame.draw.rect(self.screen, self.colors["bg_secondary"], header_rect)
         
         # Título
-        title = self.fonts["heading_lg"].render("Game Library", True, self.colors["text_primary"])
+        title = render_text(self.fonts["heading_lg"], "Game Library", True, self.colors["text_primary"])
         self.screen.blit(title, (30, 20))
         
         # Filtros de categoría como pills modernas
@@ -211,7 +333,7 @@ class GameLauncher:
                 pygame.draw.rect(self.screen, self.colors["bg_surface"], pill_rect, border_radius=15)
                 text_color = self.colors["text_secondary"]
             
-            cat_text = self.fonts["caption"].render(category, True, text_color)
+            cat_text = render_text(self.fonts["caption"], category, True, text_color)
             text_x = pill_rect.x + (pill_width - cat_text.get_width()) // 2
             text_y = pill_rect.y + (pill_height - cat_text.get_height()) // 2
             self.screen.blit(cat_text, (text_x, text_y))
@@ -221,11 +343,11 @@ class GameLauncher:
         
         if not filtered_games:
             # No hay juegos
-            no_games_text = self.fonts["body_lg"].render("No games found", True, self.colors["text_secondary"])
+            no_games_text = render_text(self.fonts["body_lg"], "No games found", True, self.colors["text_secondary"])
             text_x = (self.screen.get_width() - no_games_text.get_width()) // 2
             self.screen.blit(no_games_text, (text_x, 300))
             
-            help_text = self.fonts["body_md"].render("Make sure game files are in games/builtin/", True, self.colors["text_secondary"])
+            help_text = render_text(self.fonts["body_md"], "Make sure game files are in games/builtin/", True, self.colors["text_secondary"])
             help_x = (self.screen.get_width() - help_text.get_width()) // 2
             self.screen.blit(help_text, (help_x, 330))
             return
@@ -265,6 +387,10 @@ class GameLauncher:
         
         games_to_show = min(total_games - self.scroll_offset, max_visible_games)
         
+        # Filas visibles y la siguiente: el scroll reutiliza las ya renderizadas
+        self.max_cached_cards = 2 * self.games_per_row * (max_visible_rows + 1)
+        theme = self.card_theme()
+        
         for i in range(games_to_show):
             game_index = i + self.scroll_offset
             if game_index >= len(filtered_games):
@@ -281,95 +407,9 @@ class GameLauncher:
             card_y = grid_start_y + row * (card_height + margin_y)
             card_rect = pygame.Rect(card_x, card_y, card_width, card_height)
             
-            # Efecto hover más sutil
-            if is_selected:
-                # Sombra más pronunciada para selección
-                shadow_rect = pygame.Rect(card_x + 6, card_y + 6, card_width, card_height)
-                shadow_surface = pygame.Surface((card_width, card_height), pygame.SRCALPHA)
-                pygame.draw.rect(shadow_surface, (0, 0, 0, 100), 
-                               (0, 0, card_width, card_height), border_radius=12)
-                self.screen.blit(shadow_surface, shadow_rect.topleft)
-                
-                # Card con borde de acento
-                pygame.draw.rect(self.screen, self.colors["bg_surface"], card_rect, border_radius=12)
-                pygame.draw.rect(self.screen, self.colors["accent"], card_rect, width=2, border_radius=12)
-            else:
-                # Sombra sutil
-                shadow_rect = pygame.Rect(card_x + 3, card_y + 3, card_width, card_height)
-                shadow_surface = pygame.Surface((card_width, card_height), pygame.SRCALPHA)
-                pygame.draw.rect(shadow_surface, (0, 0, 0, 40), 
-                               (0, 0, card_width, card_height), border_radius=12)
-                self.screen.blit(shadow_surface, shadow_rect.topleft)
-                
-                pygame.draw.rect(self.screen, self.colors["bg_secondary"], card_rect, border_radius=12)
-            
-            # Contenido de la card más compacto
-            content_padding = 15
-            
-            # Icono del juego más pequeño
-            icon_size = 36  # Reducido
-            icon_text = self.fonts["heading_md"].render(game.get("icon", "🎮"), True, self.colors["text_primary"])
-            icon_x = card_rect.x + (card_rect.width - icon_text.get_width()) // 2
-            self.screen.blit(icon_text, (icon_x, card_rect.y + content_padding))
-            
-            # Título del juego
-            title_text = self.fonts["body_lg"].render(game["title"], True, self.colors["text_primary"])
-            # Truncar título si es muy largo
-            max_title_width = card_width - content_padding * 2
-            if title_text.get_width() > max_title_width:
-                # Truncar y agregar "..."
-                truncated_title = game["title"]
-                while self.fonts["body_lg"].size(truncated_title + "...")[0] > max_title_width and len(truncated_title) > 3:
-                    truncated_title = truncated_title[:-1]
-                title_text = self.fonts["body_lg"].render(truncated_title + "...", True, self.colors["text_primary"])
-            
-            title_x = card_rect.x + (card_rect.width - title_text.get_width()) // 2
-            self.screen.blit(title_text, (title_x, card_rect.y + content_padding + 50))
-            
-            # Descripción más corta
-            desc_lines = self.wrap_text(game["description"], card_width - content_padding * 2, self.fonts["body_sm"])
-            desc_y = card_rect.y + content_padding + 80
-            
-            for line in desc_lines[:2]:  # Máximo 2 líneas
-                line_text = self.fonts["body_sm"].render(line, True, self.colors["text_secondary"])
-                line_x = card_rect.x + content_padding
-                self.screen.blit(line_text, (line_x, desc_y))
-                desc_y += 14
-            
-            # Rating más compacto
-            rating = game.get("rating", 0)
-            if rating > 0:
-                self.draw_rating_stars(self.screen, card_rect.x + content_padding, 
-                                     card_rect.y + card_rect.height - 60, rating)
-            
-            # Categoría y estado
-            category_text = self.fonts["caption"].render(game["category"], True, self.colors["accent"])
-            cat_x = card_rect.x + content_padding
-            cat_y = card_rect.y + card_rect.height - 35
-            self.screen.blit(category_text, (cat_x, cat_y))
-            
-            # Indicador de estado playable
-            if game["playable"]:
-                status_color = self.colors["success"]
-                status_text = "●"
-            else:
-                status_color = self.colors["danger"]
-                status_text = "●"
-                
-            status_render = self.fonts["caption"].render(status_text, True, status_color)
-            status_x = card_rect.right - content_padding - status_render.get_width()
-            self.screen.blit(status_render, (status_x, cat_y))
-            
-            # Overlay de no disponible más sutil
-            if not game["playable"]:
-                overlay = pygame.Surface((card_rect.width, card_rect.height), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 80))
-                self.screen.blit(overlay, card_rect.topleft)
-                
-                na_text = self.fonts["caption"].render("Not Available", True, self.colors["danger"])
-                na_x = card_rect.x + (card_rect.width - na_text.get_width()) // 2
-                na_y = card_rect.y + (card_rect.height - na_text.get_height()) // 2
-                self.screen.blit(na_text, (na_x, na_y))
+            # Card pre-renderizada (solo se pinta al entrar en pantalla)
+            card = self.get_card_surface(game, is_selected, (card_width, card_height), theme)
+            self.screen.blit(card, card_rect.topleft)
         
         # Footer más limpio y compacto
         self.draw_footer()
@@ -388,7 +428,7 @@ class GameLauncher:
             else:
                 star_color = self.colors["text_secondary"]
             
-            star_text = self.fonts["caption"].render("★", True, star_color)
+            star_text = render_text(self.fonts["caption"], "★", True, star_color)
             surface.blit(star_text, (star_x, y))
     
     def draw_footer(self):
@@ -399,7 +439,7 @@ class GameLauncher:
         
         # Controles actualizados con scroll
         controls_text = "↑↓←→ Navigate  •  PgUp/PgDn Scroll  •  Enter Play  •  Tab Category  •  Esc Back"
-        control_render = self.fonts["body_sm"].render(controls_text, True, self.colors["text_secondary"])
+        control_render = render_text(self.fonts["body_sm"], controls_text, True, self.colors["text_secondary"])
         
         control_x = (self.screen.get_width() - control_render.get_width()) // 2
         self.screen.blit(control_render, (control_x, footer_rect.y + 18))
@@ -447,16 +487,16 @@ class GameLauncher:
                 key_part, action_part = parts
                 
                 # Dibujar tecla
-                key_text = self.fonts["body_sm"].render(key_part, True, self.colors["accent"])
+                key_text = render_text(self.fonts["body_sm"], key_part, True, self.colors["accent"])
                 self.screen.blit(key_text, (control_x, footer_rect.y + 15))
                 
                 # Dibujar acción
-                action_text = self.fonts["body_sm"].render(action_part, True, self.colors["text_secondary"])
+                action_text = render_text(self.fonts["body_sm"], action_part, True, self.colors["text_secondary"])
                 self.screen.blit(action_text, (control_x + key_text.get_width() + 5, footer_rect.y + 15))
                 
                 control_x += key_text.get_width() + action_text.get_width() + 40
             else:
-                control_text = self.fonts["body_sm"].render(control, True, self.colors["text_secondary"])
+                control_text = render_text(self.fonts["body_sm"], control, True, self.colors["text_secondary"])
                 self.screen.blit(control_text, (control_x, footer_rect.y + 15))
                 control_x += control_text.get_width() + 40
     
@@ -561,7 +601,8 @@ class GameLauncher:
                 try:
                     print(f"Launching game: {game['title']}")
                     result = subprocess.run([sys.executable, str(game_path)], 
-                                          capture_output=True, text=True)
+                                          capture_output=True, text=True,
+                                          env=game_environment(self.config))
                     
                     if result.returncode == 0:
                         print(f"Game '{game['title']}' executed successfully.")
@@ -7,9 +7,16 @@ VERSIÓN CORREGIDA - Arregla el error TypeError en draw_modern_card
 import pygame
 import json
 import sys
-import math
+import time
 from pathlib import Path
 
+from core.sound_manager import get_tone_bank, apply_volume_levels
+from core.bitmap_font import get_font
+from ui.widgets import WidgetTree, Panel, Label, Card, Toggle, Slider, Dropdown
+
+# Segundos que se muestra "Settings saved!"
+SAVE_CONFIRMATION_SECONDS = 3.0
+
 class SettingsManager:
     def __init__(self, screen, colors, fonts, config, save_callback=None):
         self.screen = screen
@@ -21,12 +28,12 @@ class SettingsManager:
         
         # Mapeo de fuentes para compatibilidad
         self.font_map = {
-            'title': fonts.get('heading_xl', fonts.get('heading_lg', pygame.font.Font(None, 36))),
-            'large': fonts.get('heading_lg', pygame.font.Font(None, 32)),
-            'medium': fonts.get('body_lg', pygame.font.Font(None, 22)),
-            'small': fonts.get('body_md', pygame.font.Font(None, 18)),
-            'tiny': fonts.get('body_sm', pygame.font.Font(None, 16)),
-            'caption': fonts.get('caption', pygame.font.Font(None, 14))
+            'title': fonts.get('heading_xl', fonts.get('heading_lg', get_font(36))),
+            'large': fonts.get('heading_lg', get_font(32)),
+            'medium': fonts.get('body_lg', get_font(22)),
+            'small': fonts.get('body_md', get_font(18)),
+            'tiny': fonts.get('body_sm', get_font(16)),
+            'caption': fonts.get('caption', get_font(14))
         }
         
         # Estado de la interfaz
@@ -34,7 +41,15 @@ class SettingsManager:
         self.current_setting = 0
         self.animation_time = 0
         self.show_save_confirmation = False
-        self.save_confirmation_timer = 0
+        self.save_confirmation_until = 0.0
+        self.last_update = time.monotonic()
+        
+        # Seguimiento de zonas modificadas (lo asigna el shell si lo usa)
+        self.dirty = None
+        
+        # Árbol de widgets retenido (se reconstruye al cambiar el layout)
+        self.tree = None
+        self.tree_key = None
         
         # Categorías y configuraciones
         self.categories = [
@@ -93,6 +108,23 @@ class SettingsManager:
                         "max": 100,
                         "default": 60,
                         "description": "Background music volume"
+                    },
+                    {
+                        "key": "effects_volume",
+                        "name": "Effects Volume",
+                        "type": "slider",
+                        "min": 0,
+                        "max": 100,
+                        "default": 100,
+                        "description": "Sound effects volume"
+                    },
+                    {
+                        "key": "audio_latency",
+                        "name": "Audio Latency",
+                        "type": "list",
+                        "options": ["low", "balanced", "safe"],
+                        "display_options": ["Low", "Balanced", "Safe"],
+                        "description": "Mixer buffer size (applies on restart and game launch)"
                     }
                 ]
             },
@@ -165,6 +197,8 @@ class SettingsManager:
         defaults = {
             "master_volume": 80,
             "music_volume": 60,
+            "effects_volume": 100,
+            "audio_latency": "balanced",
             "fps_limit": 60,
             "auto_save_settings": True,
             "check_updates": True
@@ -178,264 +212,105 @@ class SettingsManager:
         """Reproducir sonidos de interfaz"""
         if not self.config.get("sound_enabled", True):
             return
-            
-        try:
-            frequencies = {
-                "click": 1000,
-                "select": 1200,
-                "toggle": 800,
-                "save": 1500,
-                "error": 400,
-                "navigate": 600
-            }
-            
-            frequency = frequencies.get(sound_type, 800)
-            duration = 60
-            
-            sample_rate = 22050
-            frames = int(duration * sample_rate / 1000)
-            arr = []
-            
-            for i in range(frames):
-                t = float(i) / sample_rate
-                envelope = math.exp(-t * 8)
-                wave = math.sin(2 * math.pi * frequency * t) * envelope * 0.08
-                arr.append([int(32767 * wave)] * 2)
-            
-            sound = pygame.sndarray.make_sound(pygame.array.array('h', arr))
-            sound.play()
-        except:
-            pass
-    
-    def draw_modern_card(self, surface, rect, color=None, elevation=1, selected=False):
-        """Dibuja una card moderna con sombra - FUNCIÓN CORREGIDA"""
-        # Si no se proporciona color, usar color por defecto
-        if color is None:
-            card_color = self.colors["bg_surface"] if selected else self.colors["bg_secondary"]
-        else:
-            card_color = color
         
-        # Sombra
-        shadow_offset = elevation * 3
-        shadow_rect = pygame.Rect(rect.x + shadow_offset, rect.y + shadow_offset, 
-                                 rect.width, rect.height)
-        shadow_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        shadow_alpha = 80 if selected else 40
-        pygame.draw.rect(shadow_surface, (0, 0, 0, shadow_alpha), 
-                        (0, 0, rect.width, rect.height), border_radius=12)
-        surface.blit(shadow_surface, shadow_rect.topleft)
-        
-        # Card principal
-        pygame.draw.rect(surface, card_color, rect, border_radius=12)
-        
-        # Borde de selección
-        if selected:
-            pygame.draw.rect(surface, self.colors["accent"], rect, width=2, border_radius=12)
+        get_tone_bank().play_effect("settings", sound_type)
     
-    def draw_slider(self, surface, x, y, width, height, value, min_val, max_val, selected=False):
-        """Dibuja un slider moderno"""
-        # Track del slider
-        track_rect = pygame.Rect(x, y + height // 2 - 2, width, 4)
-        pygame.draw.rect(surface, self.colors["bg_surface"], track_rect, border_radius=2)
-        
-        # Progreso
-        progress = (value - min_val) / (max_val - min_val)
-        progress_width = int(width * progress)
-        if progress_width > 0:
-            progress_rect = pygame.Rect(x, y + height // 2 - 2, progress_width, 4)
-            pygame.draw.rect(surface, self.colors["accent"], progress_rect, border_radius=2)
-        
-        # Handle del slider
-        handle_x = x + progress_width - 8
-        handle_y = y + height // 2 - 8
-        handle_rect = pygame.Rect(handle_x, handle_y, 16, 16)
-        
-        handle_color = self.colors["accent"] if selected else self.colors["text_primary"]
-        pygame.draw.circle(surface, handle_color, handle_rect.center, 8)
-        
-        # Borde del handle
-        pygame.draw.circle(surface, self.colors["text_primary"], handle_rect.center, 8, 2)
-        
-        return handle_rect
+    def card_style(self, selected):
+        """Estado de una card de configuración (normal o seleccionada)"""
+        return {
+            "color": self.colors["bg_surface"] if selected else self.colors["bg_secondary"],
+            "shadow_color": (0, 0, 0, 80 if selected else 40),
+            "shadow_offset": 6 if selected else 3,
+            "border_color": self.colors["accent"] if selected else None
+        }
     
-    def draw_toggle(self, surface, x, y, width, height, value, selected=False):
-        """Dibuja un toggle switch moderno"""
-        # Background del toggle
-        bg_color = self.colors["accent"] if value else self.colors["bg_surface"]
-        toggle_rect = pygame.Rect(x, y, width, height)
-        pygame.draw.rect(surface, bg_color, toggle_rect, border_radius=height // 2)
-        
-        # Handle del toggle
-        handle_size = height - 4
-        handle_x = x + (width - handle_size - 2) if value else x + 2
-        handle_y = y + 2
-        handle_rect = pygame.Rect(handle_x, handle_y, handle_size, handle_size)
-        
-        handle_color = self.colors["text_primary"]
-        pygame.draw.ellipse(surface, handle_color, handle_rect)
-        
-        # Borde si está seleccionado
-        if selected:
-            pygame.draw.rect(surface, self.colors["text_primary"], toggle_rect, width=2, border_radius=height // 2)
-        
-        return toggle_rect
+    def layout_key(self):
+        """Lo que obliga a reconstruir el árbol: tamaño, categoría y tema"""
+        theme = tuple((name, tuple(color)) for name, color in sorted(self.colors.items()))
+        return (self.screen.get_size(), self.current_category, theme)
     
-    def draw_dropdown(self, surface, x, y, width, height, options, selected_index, selected=False):
-        """Dibuja un dropdown moderno"""
-        # Background
-        bg_color = self.colors["bg_surface"] if selected else self.colors["bg_secondary"]
-        dropdown_rect = pygame.Rect(x, y, width, height)
-        pygame.draw.rect(surface, bg_color, dropdown_rect, border_radius=8)
-        
-        # Borde
-        border_color = self.colors["accent"] if selected else self.colors["text_secondary"]
-        pygame.draw.rect(surface, border_color, dropdown_rect, width=2, border_radius=8)
-        
-        # Texto seleccionado
-        if 0 <= selected_index < len(options):
-            text = str(options[selected_index])
-            text_surface = self.font_map["small"].render(text, True, self.colors["text_primary"])
-            text_x = x + 12
-            text_y = y + (height - text_surface.get_height()) // 2
-            surface.blit(text_surface, (text_x, text_y))
-        
-        # Flecha
-        arrow_x = x + width - 20
-        arrow_y = y + height // 2
-        arrow_points = [
-            (arrow_x, arrow_y - 4),
-            (arrow_x + 8, arrow_y + 4),
-            (arrow_x - 8, arrow_y + 4)
-        ]
-        pygame.draw.polygon(surface, self.colors["text_secondary"], arrow_points)
-        
-        return dropdown_rect
+    def build_tree(self):
+        """Construir el árbol de widgets de la pantalla (layout cacheado)"""
+        width, height = self.screen.get_size()
+        root = Panel((0, 0, width, height), self.colors["bg_primary"])
+        self.build_sidebar(root, height)
+        self.build_settings_panel(root, width)
+        self.build_footer(root, width, height)
+        self.tree = WidgetTree(root)
     
-    def draw_categories_sidebar(self):
-        """Dibuja la barra lateral con categorías"""
+    def build_sidebar(self, root, height):
+        """Barra lateral con las categorías"""
         sidebar_width = 200
-        sidebar_rect = pygame.Rect(0, 0, sidebar_width, self.screen.get_height())
-        pygame.draw.rect(self.screen, self.colors["bg_secondary"], sidebar_rect)
-        
-        # Título de la sidebar
-        title_text = self.font_map["medium"].render("Settings", True, self.colors["text_primary"])
-        self.screen.blit(title_text, (20, 25))
+        sidebar = root.add(Panel((0, 0, sidebar_width, height), self.colors["bg_secondary"]))
+        sidebar.add(Label((20, 25), self.font_map["medium"], "Settings", self.colors["text_primary"]))
         
         # Categorías
         start_y = 80
         category_height = 50
-        
+        self.category_widgets = []
         for i, category in enumerate(self.categories):
-            is_selected = i == self.current_category
-            
-            # Card de categoría
             cat_y = start_y + i * (category_height + 10)
-            cat_rect = pygame.Rect(15, cat_y, sidebar_width - 30, category_height)
-            
-            if is_selected:
-                pygame.draw.rect(self.screen, self.colors["accent"], cat_rect, border_radius=8)
-                text_color = self.colors["text_primary"]
-                icon_color = self.colors["text_primary"]
-            else:
-                pygame.draw.rect(self.screen, self.colors["bg_surface"], cat_rect, border_radius=8)
-                text_color = self.colors["text_secondary"]
-                icon_color = self.colors["text_secondary"]
-            
-            # Ícono
-            icon_text = self.font_map["medium"].render(category["icon"], True, icon_color)
-            self.screen.blit(icon_text, (cat_rect.x + 15, cat_rect.y + 12))
-            
-            # Nombre
-            name_text = self.font_map["small"].render(category["name"], True, text_color)
-            self.screen.blit(name_text, (cat_rect.x + 50, cat_rect.y + 15))
+            item = sidebar.add(Panel((15, cat_y, sidebar_width - 30, category_height),
+                                     self.colors["bg_surface"], radius=8))
+            icon = item.add(Label((30, cat_y + 12), self.font_map["medium"], category["icon"],
+                                  self.colors["text_secondary"]))
+            name = item.add(Label((65, cat_y + 15), self.font_map["small"], category["name"],
+                                  self.colors["text_secondary"]))
+            self.category_widgets.append((item, icon, name))
     
-    def draw_settings_panel(self):
-        """Dibuja el panel principal de configuraciones - FUNCIÓN CORREGIDA"""
+    def build_settings_panel(self, root, width):
+        """Panel con las configuraciones de la categoría actual"""
         panel_x = 220
-        panel_width = self.screen.get_width() - panel_x - 20
+        panel_width = width - panel_x - 20
         
         # Header del panel
-        header_rect = pygame.Rect(panel_x, 20, panel_width, 60)
-        # CORRECCIÓN: Pasar solo el rectángulo y usar color por defecto
-        self.draw_modern_card(self.screen, header_rect)
-        
-        # Título de la categoría actual
+        header = root.add(Card((panel_x, 20, panel_width, 60), pad=6, **self.card_style(False)))
         category = self.categories[self.current_category]
-        cat_title = f"{category['icon']} {category['name']}"
-        title_text = self.font_map["large"].render(cat_title, True, self.colors["text_primary"])
-        self.screen.blit(title_text, (header_rect.x + 20, header_rect.y + 15))
+        header.add(Label((panel_x + 20, 35), self.font_map["large"],
+                         f"{category['icon']} {category['name']}", self.colors["text_primary"]))
         
         # Configuraciones
         settings_start_y = 100
         setting_height = 80
-        settings = category["settings"]
-        
-        for i, setting in enumerate(settings):
-            is_selected = i == self.current_setting
-            
-            # Card de configuración
+        self.setting_widgets = []
+        for i, setting in enumerate(category["settings"]):
             setting_y = settings_start_y + i * (setting_height + 15)
-            setting_rect = pygame.Rect(panel_x, setting_y, panel_width, setting_height)
-            
-            # CORRECCIÓN: Usar la función corregida
-            self.draw_modern_card(self.screen, setting_rect, 
-                                 elevation=2 if is_selected else 1, selected=is_selected)
-            
-            # Contenido de la configuración
-            content_x = setting_rect.x + 20
-            content_y = setting_rect.y + 15
+            card = root.add(Card((panel_x, setting_y, panel_width, setting_height),
+                                 pad=6, **self.card_style(False)))
             
             # Nombre y descripción
-            name_text = self.font_map["small"].render(setting["name"], True, self.colors["text_primary"])
-            self.screen.blit(name_text, (content_x, content_y))
-            
-            desc_text = self.font_map["tiny"].render(setting["description"], True, self.colors["text_secondary"])
-            self.screen.blit(desc_text, (content_x, content_y + 20))
+            content_x = panel_x + 20
+            content_y = setting_y + 15
+            card.add(Label((content_x, content_y), self.font_map["small"], setting["name"],
+                           self.colors["text_primary"]))
+            card.add(Label((content_x, content_y + 20), self.font_map["tiny"], setting["description"],
+                           self.colors["text_secondary"]))
             
             # Control según el tipo
-            control_x = setting_rect.x + setting_rect.width - 250
+            control_x = panel_x + panel_width - 250
             control_y = content_y + 5
-            
-            current_value = self.config.get(setting["key"])
-            
+            value_label = None
             if setting["type"] == "boolean":
-                self.draw_toggle(self.screen, control_x, control_y, 50, 25, 
-                               current_value, is_selected)
-            
+                control = card.add(Toggle((control_x, control_y, 50, 25), self.colors))
             elif setting["type"] == "list":
                 options = setting.get("display_options", setting["options"])
-                try:
-                    if setting["key"] == "resolution":
-                        current_index = setting["options"].index(current_value)
-                    else:
-                        current_index = setting["options"].index(current_value)
-                except (ValueError, TypeError):
-                    current_index = 0
-                
-                self.draw_dropdown(self.screen, control_x, control_y, 200, 30, 
-                                 options, current_index, is_selected)
-            
+                control = card.add(Dropdown((control_x, control_y, 200, 30), self.colors,
+                                            self.font_map["small"], options))
             elif setting["type"] == "slider":
-                min_val = setting.get("min", 0)
-                max_val = setting.get("max", 100)
-                if current_value is None:
-                    current_value = setting.get("default", min_val)
-                    self.config[setting["key"]] = current_value
-                
-                self.draw_slider(self.screen, control_x, control_y, 180, 30, 
-                               current_value, min_val, max_val, is_selected)
-                
-                # Mostrar valor
-                value_text = f"{current_value}%"
-                value_surface = self.font_map["tiny"].render(value_text, True, self.colors["text_secondary"])
-                self.screen.blit(value_surface, (control_x + 190, control_y + 8))
+                control = card.add(Slider((control_x, control_y, 180, 30), self.colors,
+                                          min_value=setting.get("min", 0),
+                                          max_value=setting.get("max", 100)))
+                value_label = card.add(Label((control_x + 190, control_y + 8), self.font_map["tiny"],
+                                             "", self.colors["text_secondary"]))
+            else:
+                control = None
+            self.setting_widgets.append((setting, card, control, value_label))
     
-    def draw_footer(self):
-        """Dibuja el footer con controles"""
+    def build_footer(self, root, width, height):
+        """Footer con controles e indicadores de estado"""
         footer_height = 60
-        footer_rect = pygame.Rect(0, self.screen.get_height() - footer_height, 
-                                 self.screen.get_width(), footer_height)
-        pygame.draw.rect(self.screen, self.colors["bg_secondary"], footer_rect)
+        footer_y = height - footer_height
+        footer = root.add(Panel((0, footer_y, width, footer_height), self.colors["bg_secondary"]))
         
         # Controles
         controls = [
@@ -450,33 +325,53 @@ class SettingsManager:
         
         control_x = 30
         for control in controls:
-            parts = control.split(' ', 1)
-            if len(parts) == 2:
-                key_part, action_part = parts
-                
-                # Tecla
-                key_text = self.font_map["tiny"].render(key_part, True, self.colors["accent"])
-                self.screen.blit(key_text, (control_x, footer_rect.y + 15))
-                
-                # Acción
-                action_text = self.font_map["tiny"].render(action_part, True, self.colors["text_secondary"])
-                self.screen.blit(action_text, (control_x + key_text.get_width() + 5, footer_rect.y + 15))
-                
-                control_x += key_text.get_width() + action_text.get_width() + 25
+            key_part, action_part = control.split(' ', 1)
+            key_label = footer.add(Label((control_x, footer_y + 15), self.font_map["tiny"],
+                                         key_part, self.colors["accent"]))
+            action_label = footer.add(Label((key_label.rect.right + 5, footer_y + 15),
+                                            self.font_map["tiny"], action_part,
+                                            self.colors["text_secondary"]))
+            control_x += key_label.rect.width + action_label.rect.width + 25
+        
+        # Indicador de cambios y confirmación de guardado (vacíos si no aplican)
+        self.changes_label = footer.add(Label((width - 20, footer_y + 25), self.font_map["tiny"],
+                                              "", self.colors["warning"], align="right"))
+        self.saved_label = footer.add(Label((width - 20, footer_y + 10), self.font_map["tiny"],
+                                            "", self.colors["success"], align="right"))
+    
+    def sync_tree(self):
+        """Volcar el estado actual en los widgets (solo repintan los que cambian)"""
+        for i, (item, icon, name) in enumerate(self.category_widgets):
+            is_selected = i == self.current_category
+            item.set(color=self.colors["accent"] if is_selected else self.colors["bg_surface"])
+            text_color = self.colors["text_primary"] if is_selected else self.colors["text_secondary"]
+            icon.set(color=text_color)
+            name.set(color=text_color)
         
-        # Indicador de cambios
-        if self.has_unsaved_changes():
-            changes_text = "● Unsaved changes"
-            changes_surface = self.font_map["tiny"].render(changes_text, True, self.colors["warning"])
-            changes_x = self.screen.get_width() - changes_surface.get_width() - 20
-            self.screen.blit(changes_surface, (changes_x, footer_rect.y + 25))
+        for i, (setting, card, control, value_label) in enumerate(self.setting_widgets):
+            is_selected = i == self.current_setting
+            card.set(**self.card_style(is_selected))
+            current_value = self.config.get(setting["key"])
+            
+            if setting["type"] == "boolean":
+                control.set(value=current_value, selected=is_selected)
+            
+            elif setting["type"] == "list":
+                try:
+                    current_index = setting["options"].index(current_value)
+                except (ValueError, TypeError):
+                    current_index = 0
+                control.set(index=current_index, selected=is_selected)
+            
+            elif setting["type"] == "slider":
+                if current_value is None:
+                    current_value = setting.get("default", setting.get("min", 0))
+                    self.config[setting["key"]] = current_value
+                control.set(value=current_value, selected=is_selected)
+                value_label.set(text=f"{current_value}%")
         
-        # Confirmación de guardado
-        if self.show_save_confirmation:
-            save_text = "✓ Settings saved!"
-            save_surface = self.font_map["tiny"].render(save_text, True, self.colors["success"])
-            save_x = self.screen.get_width() - save_surface.get_width() - 20
-            self.screen.blit(save_surface, (save_x, footer_rect.y + 10))
+        self.changes_label.set(text="● Unsaved changes" if self.has_unsaved_changes() else "")
+        self.saved_label.set(text="✓ Settings saved!" if self.show_save_confirmation else "")
     
     def has_unsaved_changes(self):
         """Verificar si hay cambios sin guardar"""
@@ -493,7 +388,7 @@ class SettingsManager:
             
             self.original_config = self.config.copy()
             self.show_save_confirmation = True
-            self.save_confirmation_timer = 180
+            self.save_confirmation_until = time.monotonic() + SAVE_CONFIRMATION_SECONDS
             
             if self.save_callback:
                 self.save_callback(self.config)
@@ -520,10 +415,13 @@ class SettingsManager:
             "check_updates": True,
             "master_volume": 80,
             "music_volume": 60,
+            "effects_volume": 100,
+            "audio_latency": "balanced",
             "fps_limit": 60
         }
         
         self.config.update(defaults)
+        apply_volume_levels(self.config)
         self.play_sound("toggle")
     
     def handle_input(self, event):
@@ -616,6 +514,11 @@ class SettingsManager:
                 new_value = max(min_val, current_value - step)
             
             self.config[key] = new_value
+            
+            # Vista previa en vivo: solo cambia la ganancia de los canales
+            if key.endswith("_volume"):
+                apply_volume_levels(self.config)
+            
             self.play_sound("select")
             return "select"
         
@@ -638,20 +541,28 @@ class SettingsManager:
         return None
     
     def update(self):
-        """Actualizar animaciones y timers"""
-        self.animation_time += 1
+        """Actualizar animaciones y timers (en segundos, a cualquier ritmo de frames)"""
+        now = time.monotonic()
+        self.animation_time += now - self.last_update
+        self.last_update = now
         
-        if self.show_save_confirmation:
-            self.save_confirmation_timer -= 1
-            if self.save_confirmation_timer <= 0:
-                self.show_save_confirmation = False
+        if self.show_save_confirmation and now >= self.save_confirmation_until:
+            self.show_save_confirmation = False
     
     def draw(self):
-        """Dibujar la interfaz completa"""
-        self.screen.fill(self.colors["bg_primary"])
-        self.draw_categories_sidebar()
-        self.draw_settings_panel()
-        self.draw_footer()
+        """Dibujar la interfaz: solo se repintan los widgets que cambiaron"""
+        key = self.layout_key()
+        if self.tree is None or key != self.tree_key:
+            self.build_tree()
+            self.tree_key = key
+        elif not self.dirty or self.dirty.full:
+            # La pantalla se presentará entera (o no sabemos qué contiene)
+            self.tree.invalidate_all()
+        
+        self.sync_tree()
+        for region in self.tree.render(self.screen):
+            if self.dirty:
+                self.dirty.mark(region)
     
     def get_config(self):
         """Obtener configuración actual"""
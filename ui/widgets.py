@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Widgets - Toolkit de interfaz en modo retenido
+Cada pantalla construye una vez su árbol de widgets (layout cacheado);
+cada frame solo actualiza el estado de los widgets y únicamente los que
+cambiaron se vuelven a pintar. El árbol recompone las zonas dañadas a
+partir de las Surfaces cacheadas de cada widget y devuelve esas zonas
+para presentarlas con dirty rects. También sirve para hit-testing.
+"""
+
+import pygame
+
+from core.card_renderer import get_card_renderer
+from core.text_cache import render_text
+
+_MISSING = object()
+
+
+class Widget:
+    """Nodo del árbol: rectángulo fijo, estado y Surface cacheada
+
+    pad amplía la zona pintada alrededor del rect (sombras, handles que
+    sobresalen). Las subclases implementan draw(surface, rect) en
+    coordenadas locales.
+    """
+
+    def __init__(self, rect, pad=0, **state):
+        self.rect = pygame.Rect(rect)
+        self.pad = pad
+        self.state = state
+        self.children = []
+        self.surface = None
+        self.tree = None
+
+    @property
+    def bounds(self):
+        """Zona de pantalla que ocupa la Surface del widget"""
+        return self.rect.inflate(self.pad * 2, self.pad * 2)
+
+    def add(self, child):
+        """Añadir un hijo (se pinta encima del padre)"""
+        self.children.append(child)
+        if self.tree:
+            child.attach(self.tree)
+        return child
+
+    def attach(self, tree):
+        """Asociar el widget y sus hijos a un árbol"""
+        for widget in self.walk():
+            widget.tree = tree
+
+    def walk(self):
+        """Recorrer el subárbol en orden de pintado"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def set(self, **state):
+        """Actualizar el estado; repinta solo si algo cambió"""
+        if all(self.state.get(key, _MISSING) == value for key, value in state.items()):
+            return False
+        self.state.update(state)
+        self.invalidate()
+        return True
+
+    def invalidate(self):
+        """Descartar la Surface cacheada y dañar su zona"""
+        self.surface = None
+        if self.tree:
+            self.tree.damage(self.bounds)
+
+    def get_surface(self):
+        """Surface del widget, pintándola si hace falta"""
+        if self.surface is None:
+            bounds = self.bounds
+            surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+            self.draw(surface, pygame.Rect((self.pad, self.pad), self.rect.size))
+            if pygame.display.get_surface():
+                surface = surface.convert_alpha()
+            self.surface = surface
+        return self.surface
+
+    def draw(self, surface, rect):
+        """Pintar el widget en surface dentro de rect"""
+
+    def hit_test(self, pos):
+        """Widget más profundo bajo pos (o None)"""
+        for child in reversed(self.children):
+            hit = child.hit_test(pos)
+            if hit:
+                return hit
+        return self if self.rect.collidepoint(pos) else None
+
+
+class Panel(Widget):
+    """Rectángulo de color sólido (fondos, barras, sidebars)"""
+
+    def __init__(self, rect, color, radius=0):
+        super().__init__(rect, color=color, radius=radius)
+
+    def draw(self, surface, rect):
+        pygame.draw.rect(surface, self.state["color"], rect, border_radius=self.state["radius"])
+
+
+class Label(Widget):
+    """Texto de una línea; su tamaño sigue al texto
+
+    align: "left" (pos es la esquina), "right" (pos.x es el borde derecho)
+    o "center" (centrado en el tramo que empieza en pos.x y mide width).
+    """
+
+    def __init__(self, pos, font, text, color, align="left", width=0):
+        self.pos = pos
+        self.font = font
+        self.align = align
+        self.width = width
+        super().__init__((pos, (0, 0)), text=text, color=color)
+        self.layout()
+
+    def layout(self):
+        """Recalcular el rect a partir del texto actual"""
+        text_surface = render_text(self.font, self.state["text"], True, self.state["color"])
+        width, height = text_surface.get_size()
+        x, y = self.pos
+        if self.align == "right":
+            x -= width
+        elif self.align == "center":
+            x += (self.width - width) // 2
+        self.rect = pygame.Rect(x, y, width, height)
+
+    def set(self, **state):
+        if all(self.state.get(key, _MISSING) == value for key, value in state.items()):
+            return False
+        # Dañar la zona anterior y la nueva (el ancho puede cambiar)
+        self.invalidate()
+        self.state.update(state)
+        self.layout()
+        self.invalidate()
+        return True
+
+    def get_surface(self):
+        # El texto ya está cacheado: no hace falta otra Surface
+        return render_text(self.font, self.state["text"], True, self.state["color"])
+
+
+class Card(Widget):
+    """Card con sombra cacheada, color y borde opcional"""
+
+    def __init__(self, rect, color, radius=12, shadow_color=None, shadow_offset=4,
+                 border_color=None, pad=None):
+        # pad debe cubrir el mayor desplazamiento de sombra que vaya a usar
+        pad = shadow_offset if pad is None else pad
+        super().__init__(rect, pad=pad, color=color, radius=radius,
+                         shadow_color=shadow_color, shadow_offset=shadow_offset,
+                         border_color=border_color)
+
+    def draw(self, surface, rect):
+        state = self.state
+        get_card_renderer().draw_card(surface, rect, state["color"], radius=state["radius"],
+                                      shadow_color=state["shadow_color"],
+                                      shadow_offset=state["shadow_offset"],
+                                      border_color=state["border_color"])
+
+
+class Toggle(Widget):
+    """Interruptor on/off"""
+
+    def __init__(self, rect, colors, value=False, selected=False):
+        self.colors = colors
+        super().__init__(rect, value=value, selected=selected)
+
+    def draw(self, surface, rect):
+        x, y, width, height = rect
+        value = self.state["value"]
+
+        # Background del toggle
+        bg_color = self.colors["accent"] if value else self.colors["bg_surface"]
+        pygame.draw.rect(surface, bg_color, rect, border_radius=height // 2)
+
+        # Handle del toggle
+        handle_size = height - 4
+        handle_x = x + (width - handle_size - 2) if value else x + 2
+        handle_rect = pygame.Rect(handle_x, y + 2, handle_size, handle_size)
+        pygame.draw.ellipse(surface, self.colors["text_primary"], handle_rect)
+
+        # Borde si está seleccionado
+        if self.state["selected"]:
+            pygame.draw.rect(surface, self.colors["text_primary"], rect, width=2,
+                             border_radius=height // 2)
+
+
+class Slider(Widget):
+    """Slider horizontal con handle circular"""
+
+    HANDLE_RADIUS = 8
+
+    def __init__(self, rect, colors, value=0, min_value=0, max_value=100, selected=False):
+        self.colors = colors
+        self.min_value = min_value
+        self.max_value = max_value
+        super().__init__(rect, pad=self.HANDLE_RADIUS, value=value, selected=selected)
+
+    def draw(self, surface, rect):
+        x, y, width, height = rect
+
+        # Track del slider
+        track_rect = pygame.Rect(x, y + height // 2 - 2, width, 4)
+        pygame.draw.rect(surface, self.colors["bg_surface"], track_rect, border_radius=2)
+
+        # Progreso
+        progress = (self.state["value"] - self.min_value) / (self.max_value - self.min_value)
+        progress_width = int(width * progress)
+        if progress_width > 0:
+            progress_rect = pygame.Rect(x, y + height // 2 - 2, progress_width, 4)
+            pygame.draw.rect(surface, self.colors["accent"], progress_rect, border_radius=2)
+
+        # Handle del slider y su borde
+        center = (x + progress_width, y + height // 2)
+        handle_color = self.colors["accent"] if self.state["selected"] else self.colors["text_primary"]
+        pygame.draw.circle(surface, handle_color, center, self.HANDLE_RADIUS)
+        pygame.draw.circle(surface, self.colors["text_primary"], center, self.HANDLE_RADIUS, 2)
+
+
+class Dropdown(Widget):
+    """Selector que muestra la opción actual"""
+
+    def __init__(self, rect, colors, font, options, index=0, selected=False):
+        self.colors = colors
+        self.font = font
+        self.options = options
+        super().__init__(rect, index=index, selected=selected)
+
+    def draw(self, surface, rect):
+        x, y, width, height = rect
+        selected = self.state["selected"]
+
+        # Background y borde
+        bg_color = self.colors["bg_surface"] if selected else self.colors["bg_secondary"]
+        pygame.draw.rect(surface, bg_color, rect, border_radius=8)
+        border_color = self.colors["accent"] if selected else self.colors["text_secondary"]
+        pygame.draw.rect(surface, border_color, rect, width=2, border_radius=8)
+
+        # Texto seleccionado
+        index = self.state["index"]
+        if 0 <= index < len(self.options):
+            text_surface = render_text(self.font, str(self.options[index]), True,
+                                       self.colors["text_primary"])
+            surface.blit(text_surface, (x + 12, y + (height - text_surface.get_height()) // 2))
+
+        # Flecha
+        arrow_x = x + width - 20
+        arrow_y = y + height // 2
+        arrow_points = [
+            (arrow_x, arrow_y - 4),
+            (arrow_x + 8, arrow_y + 4),
+            (arrow_x - 8, arrow_y + 4)
+        ]
+        pygame.draw.polygon(surface, self.colors["text_secondary"], arrow_points)
+
+
+class WidgetTree:
+    """Raíz de una pantalla retenida: acumula daños y recompone solo esas zonas"""
+
+    def __init__(self, root):
+        self.root = root
+        self.damaged = []
+        root.attach(self)
+        self.damage(root.bounds)
+
+    def damage(self, rect):
+        """Marcar una zona de pantalla para recomponer"""
+        self.damaged.append(pygame.Rect(rect))
+
+    def invalidate_all(self):
+        """Recomponer la pantalla completa en el próximo render"""
+        self.damaged = [self.root.bounds]
+
+    def render(self, screen):
+        """Recomponer las zonas dañadas; devuelve la lista de zonas"""
+        if not self.damaged:
+            return []
+
+        bounds = screen.get_rect()
+        regions = []
+        for rect in self.damaged:
+            rect = rect.clip(bounds)
+            if not rect.width or not rect.height:
+                continue
+            index = rect.collidelist(regions)
+            while index != -1:
+                rect.union_ip(regions.pop(index))
+                index = rect.collidelist(regions)
+            regions.append(rect)
+        self.damaged = []
+
+        widgets = list(self.root.walk())
+        for region in regions:
+            screen.set_clip(region)
+            for widget in widgets:
+                widget_bounds = widget.bounds
+                if widget_bounds.colliderect(region):
+                    screen.blit(widget.get_surface(), widget_bounds.topleft)
+            screen.set_clip(None)
+        return regions
+
+    def hit_test(self, pos):
+        """Widget bajo pos (para entrada con ratón)"""
+        return self.root.hit_test(pos)